@@ -5,7 +5,6 @@ Add sample verified properties for immediate website demonstration.
 
 from app import create_app, db
 from app.models import Property, User
-import json
 
 def add_sample_properties():
     """Add sample properties for immediate sale demonstration."""
@@ -33,7 +32,7 @@ def add_sample_properties():
                 'lot_size': '0.5 acres',
                 'year_built': 2021,
                 'status': 'available',
-                'features': json.dumps([
+                'features': [
                     'Swimming Pool',
                     'Landscaped Gardens',
                     '24/7 Security',
@@ -42,7 +41,7 @@ def add_sample_properties():
                     'Parking for 3 cars',
                     'Backup Generator',
                     'Fiber Internet Ready'
-                ]),
+                ],
                 'is_verified': True,
                 'admin_id': admin.id
             },
@@ -58,7 +57,7 @@ def add_sample_properties():
                 'square_feet': 1800,
                 'year_built': 2020,
                 'status': 'available',
-                'features': json.dumps([
+                'features': [
                     'City Views',
                     'Modern Kitchen',
                     'Open Plan Living',
@@ -67,7 +66,7 @@ def add_sample_properties():
                     'Elevator Access',
                     'Gym Facility',
                     'Rooftop Garden'
-                ]),
+                ],
                 'is_verified': True,
                 'admin_id': admin.id
             },
@@ -84,7 +83,7 @@ def add_sample_properties():
                 'lot_size': '0.1 acres',
                 'year_built': 2019,
                 'status': 'available',
-                'features': json.dumps([
+                'features': [
                     'Gated Community',
                     'Private Garden',
                     'Modern Finishes',
@@ -93,7 +92,7 @@ def add_sample_properties():
                     'Children\'s Play Area',
                     'Clubhouse',
                     'Borehole Water'
-                ]),
+                ],
                 'is_verified': True,
                 'admin_id': admin.id
             },
@@ -109,7 +108,7 @@ def add_sample_properties():
                 'square_feet': 8500,
                 'year_built': 2018,
                 'status': 'available',
-                'features': json.dumps([
+                'features': [
                     'Prime Location',
                     'Multiple Office Units',
                     'Retail Spaces',
@@ -118,7 +117,7 @@ def add_sample_properties():
                     'Parking for 50 cars',
                     'High Speed Internet',
                     'Modern HVAC System'
-                ]),
+                ],
                 'is_verified': True,
                 'admin_id': admin.id
             },
@@ -134,7 +133,7 @@ def add_sample_properties():
                 'square_feet': 4200,
                 'year_built': 2022,
                 'status': 'available',
-                'features': json.dumps([
+                'features': [
                     'Private Terrace',
                     'Jacuzzi',
                     'Smart Home Technology',
@@ -143,7 +142,7 @@ def add_sample_properties():
                     'Private Elevator',
                     'Concierge Service',
                     'Premium Finishes'
-                ]),
+                ],
                 'is_verified': True,
                 'admin_id': admin.id
             },
@@ -160,7 +159,7 @@ def add_sample_properties():
                 'lot_size': '0.75 acres',
                 'year_built': 2017,
                 'status': 'available',
-                'features': json.dumps([
+                'features': [
                     'Swimming Pool',
                     'Mature Gardens',
                     'Guest Wing',
@@ -169,7 +168,7 @@ def add_sample_properties():
                     'Security System',
                     'Backup Generator',
                     'Borehole'
-                ]),
+                ],
                 'is_verified': True,
                 'admin_id': admin.id
             }
@@ -48,6 +48,14 @@ def create_app(config_name=None):
     # Enable CORS
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
+    # Configure response cache
+    from app.cache import init_cache
+    init_cache(app)
+    
+    # Compress responses (gzip/Brotli)
+    from app.compression import init_compression
+    init_compression(app)
+    
     # Register blueprints
     from app.routes import register_routes
     register_routes(app)
@@ -62,5 +70,23 @@ def create_app(config_name=None):
     # Create database tables
     with app.app_context():
         db.create_all()
+        
+        from app.fulltext import ensure_fulltext_index
+        ensure_fulltext_index()
+        
+        from app.trigram import ensure_trigram_index
+        ensure_trigram_index()
+    
+    from app.search_engine import init_search_engine
+    init_search_engine(app)
+    
+    from app.percolator import init_percolator
+    init_percolator(app)
+    
+    from app.similarity import SimilarityIndex
+    SimilarityIndex.init_app(app)
+    
+    from app.trigram import TrigramIndex
+    TrigramIndex.init_app(app)
     
     return app
\ No newline at end of file
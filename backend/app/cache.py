@@ -0,0 +1,278 @@
+"""
+In-process caches for API responses and derived query results.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.compression import accepted_encoding, compress, is_compressible, set_encoded_body
+from app.serializers import response_format
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a per-entry time to live."""
+    
+    def __init__(self, max_entries=512, ttl=60):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries (int): Maximum number of entries before evicting the oldest
+            ttl (int): Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def configure(self, max_entries=None, ttl=None):
+        """Change the size limit and TTL, dropping all current entries."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl is not None:
+                self.ttl = ttl
+            self._entries.clear()
+    
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl=None):
+        """Store value under key, evicting least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+# Cache of serialized anonymous listing/search responses
+response_cache = LRUCache()
+
+# Cache of COUNT(*) results for paginated queries
+count_cache = LRUCache(max_entries=1024)
+
+# Cache of facet counts per normalized search filter set
+facet_cache = LRUCache(max_entries=256)
+
+# Cache of map clusters per zoom precision, snapped viewport and filters
+cluster_cache = LRUCache(max_entries=512)
+
+# Cache of price statistics per normalized search filter set and bin count
+stats_cache = LRUCache(max_entries=128)
+
+# Cache of listing ETag/Last-Modified aggregates per query and table version
+validator_cache = LRUCache(max_entries=1024)
+
+# Bumped on every property write; part of every response cache key so that a
+# response computed before a write can never be stored as current.
+_catalog_version = 0
+_catalog_lock = threading.Lock()
+
+# Bumped on every commit that wrote rows to any table, and per table written
+_data_version = 0
+_table_versions = {}
+_data_lock = threading.Lock()
+
+# Callables run with the property id after every committed property write
+_catalog_listeners = []
+
+
+def init_cache(app):
+    """
+    Configure the response cache from application settings.
+    
+    Args:
+        app: Flask application instance
+    """
+    response_cache.configure(
+        max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 512),
+        ttl=app.config.get('RESPONSE_CACHE_TTL', 60)
+    )
+    count_cache.configure(
+        max_entries=app.config.get('PAGINATION_COUNT_CACHE_MAX_ENTRIES', 1024),
+        ttl=app.config.get('PAGINATION_COUNT_CACHE_TTL', 60)
+    )
+    facet_cache.configure(
+        max_entries=app.config.get('FACET_CACHE_MAX_ENTRIES', 256),
+        ttl=app.config.get('FACET_CACHE_TTL', 60)
+    )
+    cluster_cache.configure(
+        max_entries=app.config.get('CLUSTER_CACHE_MAX_ENTRIES', 512),
+        ttl=app.config.get('CLUSTER_CACHE_TTL', 300)
+    )
+    stats_cache.configure(
+        max_entries=app.config.get('STATS_CACHE_MAX_ENTRIES', 128),
+        ttl=app.config.get('STATS_CACHE_TTL', 300)
+    )
+    validator_cache.configure(
+        max_entries=app.config.get('VALIDATOR_CACHE_MAX_ENTRIES', 1024),
+        ttl=app.config.get('VALIDATOR_CACHE_TTL', 60)
+    )
+    
+    # Track writes on every session so cached counts are invalidated on commit
+    if not event.contains(Session, 'after_commit', _after_commit):
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'do_orm_execute', _after_orm_execute)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def _after_flush(session, flush_context):
+    """Remember which tables the transaction wrote ORM objects to."""
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        session.info.setdefault('tables_changed', set()).add(instance.__table__.name)
+
+
+def _after_orm_execute(orm_execute_state):
+    """Remember that the transaction ran an INSERT/UPDATE/DELETE statement."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        session_info = orm_execute_state.session.info
+        session_info.setdefault('tables_changed', set()).add(getattr(table, 'name', None))
+
+
+def _after_commit(session):
+    """Bump the data and table versions once a writing transaction commits."""
+    global _data_version
+    tables = session.info.pop('tables_changed', None)
+    if tables:
+        with _data_lock:
+            _data_version += 1
+            for table in tables:
+                _table_versions[table] = _table_versions.get(table, 0) + 1
+
+
+def _after_rollback(session):
+    """Forget writes that were rolled back."""
+    session.info.pop('tables_changed', None)
+
+
+def data_version():
+    """Return a counter that changes whenever any committed write happens."""
+    return _data_version
+
+
+def table_version(name):
+    """Return a counter that changes whenever a committed write touches a table."""
+    return _table_versions.get(name, 0)
+
+
+def catalog_version():
+    """Return the current property catalog version."""
+    return _catalog_version
+
+
+def on_catalog_change(listener):
+    """
+    Register a callable to run after every committed property write.
+    
+    Args:
+        listener: Callable taking the property id (None when unknown)
+    
+    Returns:
+        The listener, so this can be used as a decorator
+    """
+    if listener not in _catalog_listeners:
+        _catalog_listeners.append(listener)
+    return listener
+
+
+def catalog_changed(property_id=None):
+    """
+    Invalidate cached catalog data after a property write has been committed.
+    
+    Args:
+        property_id (int): ID of the created, updated or deleted property
+    """
+    global _catalog_version
+    with _catalog_lock:
+        _catalog_version += 1
+    response_cache.clear()
+    
+    for listener in _catalog_listeners:
+        listener(property_id)
+
+
+def _request_cache_key():
+    """Build a cache key from the path, normalized query parameters and response format."""
+    args = tuple(sorted(request.args.items(multi=True)))
+    return (request.path, catalog_version(), args, response_format())
+
+
+def cached_response(f):
+    """
+    Decorator to serve anonymous GET requests from the response cache.
+    
+    Requests carrying an Authorization header always reach the view, since
+    admins can see unverified properties. Compressed variants of a cached
+    body are cached alongside it, one per Content-Encoding.
+    
+    Args:
+        f: Function to decorate
+    
+    Returns:
+        Decorated function
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if (not current_app.config.get('RESPONSE_CACHE_ENABLED', True)
+                or request.headers.get('Authorization')):
+            return f(*args, **kwargs)
+        
+        key = _request_cache_key()
+        cached = response_cache.get(key)
+        if cached is None:
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            cached = (response.get_data(), list(response.headers.items()))
+            response_cache.set(key, cached)
+        
+        body, headers = cached
+        response = current_app.response_class(body, status=200, headers=headers)
+        
+        # Cache the compressed variants too, so hits are not recompressed
+        if is_compressible(response):
+            response.vary.add('Accept-Encoding')
+            encoding = accepted_encoding()
+            if encoding:
+                variant_key = key + (encoding,)
+                compressed = response_cache.get(variant_key)
+                if compressed is None:
+                    compressed = compress(body, encoding)
+                    response_cache.set(variant_key, compressed)
+                set_encoded_body(response, compressed, encoding)
+        
+        # Answer If-None-Match/If-Modified-Since from the cached validators
+        return response.make_conditional(request)
+    
+    return decorated_function
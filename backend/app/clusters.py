@@ -0,0 +1,86 @@
+"""
+Map marker clusters for the public property catalog.
+
+Properties inside the requested viewport are grouped by a geohash prefix whose
+length follows the map zoom, giving per-cell counts, centroids and price
+ranges in one GROUP BY instead of shipping every pin to the client.
+"""
+
+from app import db
+from app.cache import cluster_cache, table_version
+from app.facets import normalize_facet_filters
+from app.geo import precision_for_zoom, snap_bbox
+from app.models import Property
+from app.utils import InvalidQueryParameterError, create_property_search_query, parse_bbox
+
+MAX_ZOOM = 22
+
+
+def property_clusters(params):
+    """
+    Cluster the verified properties inside a bounding box.
+    
+    Args:
+        params (dict): Query parameters; bbox and zoom are required, and the
+            other /search filters narrow the clustered properties
+    
+    Returns:
+        dict: zoom, geohash precision, the snapped bbox and the clusters
+    
+    Raises:
+        InvalidQueryParameterError: If bbox or zoom is missing or malformed
+    """
+    if not params.get('bbox') or not params.get('zoom'):
+        raise InvalidQueryParameterError('bbox and zoom are required')
+    try:
+        zoom = int(params['zoom'])
+    except ValueError:
+        raise InvalidQueryParameterError('zoom must be an integer')
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise InvalidQueryParameterError(f'zoom must be between 0 and {MAX_ZOOM}')
+    
+    precision = precision_for_zoom(zoom)
+    min_lat, min_lng, max_lat, max_lng = snap_bbox(*parse_bbox(params['bbox']), precision)
+    bbox = f'{min_lng!r},{min_lat!r},{max_lng!r},{max_lat!r}'
+    
+    filters = dict(normalize_facet_filters(params))
+    filters['bbox'] = bbox
+    
+    key = (table_version(Property.__tablename__), precision, tuple(sorted(filters.items())))
+    cached = cluster_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    cell = db.func.substr(Property.geohash, 1, precision)
+    query = create_property_search_query(filters).filter_by(is_verified=True)
+    rows = query.order_by(None).with_entities(
+        cell,
+        db.func.count(),
+        db.func.avg(Property.latitude),
+        db.func.avg(Property.longitude),
+        db.func.min(Property.price),
+        db.func.max(Property.price),
+        db.func.min(Property.id)
+    ).group_by(cell).all()
+    
+    clusters = {
+        'zoom': zoom,
+        'precision': precision,
+        'bbox': [min_lng, min_lat, max_lng, max_lat],
+        'clusters': [
+            {
+                'geohash': geohash,
+                'count': count,
+                'latitude': latitude,
+                'longitude': longitude,
+                'min_price': f'{min_price:.2f}',
+                'max_price': f'{max_price:.2f}',
+                # Single-property cells can be drawn as a normal marker
+                'property_id': property_id if count == 1 else None
+            }
+            for geohash, count, latitude, longitude, min_price, max_price, property_id in rows
+        ]
+    }
+    
+    cluster_cache.set(key, clusters)
+    return clusters
@@ -0,0 +1,108 @@
+"""
+gzip and Brotli compression of API responses.
+
+Responses are compressed after the view has run when the client accepts a
+supported Content-Encoding, the body is at least COMPRESSION_MIN_SIZE bytes
+and the content type is text-like (JSON, MessagePack, CSV, ...). Streamed
+responses (the property export) and file downloads are sent as they are.
+cached_response() stores the compressed variants next to the cached body,
+so hot pages are compressed once per encoding rather than on every hit.
+"""
+
+import gzip
+import brotli
+from flask import current_app, request
+
+# Preferred first when the client accepts both equally
+ENCODINGS = ('br', 'gzip')
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/msgpack', 'application/x-ndjson',
+    'application/javascript', 'application/xml', 'image/svg+xml'
+}
+
+
+def is_compressible(response):
+    """
+    Check whether a response's body may be compressed.
+    
+    Args:
+        response: Flask response
+    
+    Returns:
+        bool: True for complete, uncompressed, text-like bodies of at least
+            COMPRESSION_MIN_SIZE bytes
+    """
+    if not current_app.config.get('COMPRESSION_ENABLED', True):
+        return False
+    if not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+        return False
+    if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+        return False
+    if not (response.mimetype in COMPRESSIBLE_MIMETYPES or response.mimetype.startswith('text/')):
+        return False
+    return (response.content_length or 0) >= current_app.config.get('COMPRESSION_MIN_SIZE', 1024)
+
+
+def accepted_encoding():
+    """Return the best encoding from ENCODINGS the request accepts, or None."""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding):
+    """
+    Compress a body with the configured level.
+    
+    Args:
+        body (bytes): Uncompressed body
+        encoding (str): 'br' or 'gzip'
+    
+    Returns:
+        bytes: Compressed body
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=current_app.config.get('COMPRESSION_BROTLI_QUALITY', 5))
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=current_app.config.get('COMPRESSION_GZIP_LEVEL', 6), mtime=0)
+
+
+def set_encoded_body(response, body, encoding):
+    """
+    Replace a response's body with its compressed form.
+    
+    A strong ETag is made weak, since it identified the uncompressed bytes.
+    Views that answer 304 themselves use weak ETags from the start, so the
+    200 and 304 responses carry the same one.
+    
+    Args:
+        response: Flask response
+        body (bytes): Body compressed with encoding
+        encoding (str): Content-Encoding of body
+    """
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def init_compression(app):
+    """
+    Compress eligible responses of the application.
+    
+    Args:
+        app: Flask application instance
+    """
+    @app.after_request
+    def compress_response(response):
+        """Compress the response if the client accepts an encoding."""
+        if not is_compressible(response):
+            return response
+        
+        # The body depends on Accept-Encoding even when sent uncompressed
+        response.vary.add('Accept-Encoding')
+        encoding = accepted_encoding()
+        if encoding:
+            set_encoded_body(response, compress(response.get_data(), encoding), encoding)
+        return response
@@ -0,0 +1,145 @@
+"""
+Facet counts for the property search sidebar.
+
+All facets come from one GROUP BY over (property_type, bedrooms, price bucket,
+status). Type, bedrooms and status are disjunctive: each facet's counts apply
+every filter except its own, so the sidebar can show what picking another
+value would return. The combinations are filtered in Python, which keeps it
+to a single query per filter set.
+"""
+
+from sqlalchemy import case
+from app import db
+from app.cache import facet_cache, table_version
+from app.models import Property
+from app.utils import InvalidQueryParameterError, create_property_search_query
+
+# Upper bounds of the price buckets (KSh), matching the PropertyFilters ranges
+PRICE_BUCKET_EDGES = (5_000_000, 10_000_000, 20_000_000, 30_000_000)
+
+# Search parameters that change facet counts; the rest (paging, fields) do not
+FACET_FILTER_PARAMS = (
+    'q', 'location', 'property_type', 'min_price', 'max_price', 'bedrooms',
+    'min_square_feet', 'max_square_feet', 'bbox', 'lat', 'lng', 'radius_km', 'status',
+    'features', 'features_match', 'fuzzy'
+)
+
+# Filters applied to the grouped rows instead of in SQL
+DISJUNCTIVE_PARAMS = ('property_type', 'bedrooms', 'status')
+
+
+def normalize_facet_filters(params):
+    """
+    Reduce search parameters to the ones that affect facet counts.
+    
+    Args:
+        params (dict): Search query parameters
+    
+    Returns:
+        tuple: Sorted (name, value) pairs, usable as a cache key
+    """
+    filters = {}
+    for name in FACET_FILTER_PARAMS:
+        value = (params.get(name) or '').strip()
+        if value:
+            filters[name] = value.lower() if name in ('q', 'location', 'features', 'features_match', 'fuzzy') else value
+    return tuple(sorted(filters.items()))
+
+
+def _price_buckets():
+    """Return the (min, max) bounds of each price bucket; max is None for the last."""
+    lower = (0,) + PRICE_BUCKET_EDGES
+    upper = PRICE_BUCKET_EDGES + (None,)
+    return list(zip(lower, upper))
+
+
+def _grouped_counts(filters):
+    """Count verified properties per (type, bedrooms, price bucket, status)."""
+    sql_filters = {name: value for name, value in filters.items() if name not in DISJUNCTIVE_PARAMS}
+    query = create_property_search_query(sql_filters, default_status=None).filter_by(is_verified=True)
+    
+    bucket = case(
+        *[(Property.price < edge, index) for index, edge in enumerate(PRICE_BUCKET_EDGES)],
+        else_=len(PRICE_BUCKET_EDGES)
+    )
+    return query.order_by(None).with_entities(
+        Property.property_type, Property.bedrooms, bucket, Property.status, db.func.count()
+    ).group_by(Property.property_type, Property.bedrooms, bucket, Property.status).all()
+
+
+def _matches(row, filters, skip):
+    """Return True if a grouped row passes the disjunctive filters other than skip."""
+    property_type, bedrooms, _, status, _ = row
+    
+    if skip != 'property_type' and filters.get('property_type') and property_type != filters['property_type']:
+        return False
+    if skip != 'bedrooms' and 'bedrooms' in filters and (bedrooms is None or bedrooms < filters['bedrooms']):
+        return False
+    if skip != 'status' and status != filters.get('status', 'available'):
+        return False
+    return True
+
+
+def property_facets(params):
+    """
+    Compute facet counts for a property search.
+    
+    Args:
+        params (dict): Search query parameters, as for /api/properties/search
+    
+    Returns:
+        dict: total plus counts per property_type, bedrooms, price bucket and status
+    
+    Raises:
+        InvalidQueryParameterError: If bedrooms is not an integer
+    """
+    key = (table_version(Property.__tablename__), normalize_facet_filters(params))
+    cached = facet_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    filters = dict(key[1])
+    if 'bedrooms' in filters:
+        try:
+            filters['bedrooms'] = int(filters['bedrooms'])
+        except ValueError:
+            raise InvalidQueryParameterError('bedrooms must be an integer')
+    
+    rows = _grouped_counts(filters)
+    
+    counts = {name: {} for name in ('property_type', 'bedrooms', 'price', 'status')}
+    for row in rows:
+        property_type, bedrooms, bucket, status, count = row
+        if _matches(row, filters, 'property_type'):
+            counts['property_type'][property_type] = counts['property_type'].get(property_type, 0) + count
+        if _matches(row, filters, 'bedrooms'):
+            counts['bedrooms'][bedrooms] = counts['bedrooms'].get(bedrooms, 0) + count
+        if _matches(row, filters, 'status'):
+            counts['status'][status] = counts['status'].get(status, 0) + count
+        if _matches(row, filters, None):
+            counts['price'][bucket] = counts['price'].get(bucket, 0) + count
+    
+    facets = {
+        'total': sum(counts['price'].values()),
+        'facets': {
+            'property_type': [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts['property_type'].items(), key=lambda item: (-item[1], item[0]))
+            ],
+            'bedrooms': [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts['bedrooms'].items(), key=lambda item: (item[0] is None, item[0] or 0))
+            ],
+            'price': [
+                {'min': low, 'max': high, 'count': counts['price'].get(index, 0)}
+                for index, (low, high) in enumerate(_price_buckets())
+            ],
+            'status': [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts['status'].items(), key=lambda item: (-item[1], item[0]))
+            ]
+        }
+    }
+    
+    facet_cache.set(key, facets)
+    return facets
@@ -0,0 +1,84 @@
+"""
+Normalized property features.
+
+Property.features keeps the feature names as entered, for display. Each name
+is also linked through `property_features` to a row of the `features`
+dictionary, keyed by its lowercase form, so searches for properties with
+given features are index lookups instead of scans over the JSON column.
+The links are written in the same flush as the property.
+"""
+
+from sqlalchemy import select
+from app import db
+from app.models import Feature, Property, property_features
+
+FEATURE_MATCH_MODES = ('all', 'any')
+
+
+def feature_key(name):
+    """Return the dictionary key for a feature name: lowercase, single-spaced."""
+    return ' '.join(str(name or '').lower().split())
+
+
+def parse_feature_keys(value):
+    """
+    Parse a comma-separated features parameter into dictionary keys.
+    
+    Args:
+        value (str): Raw query parameter
+    
+    Returns:
+        list: Distinct non-empty keys, in the order given
+    """
+    keys = []
+    for name in (value or '').split(','):
+        key = feature_key(name)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def sync_property_features(connection, property_id, names):
+    """
+    Replace a property's feature links, adding dictionary entries as needed.
+    
+    Args:
+        connection: Connection to write with (the flush's, inside listeners)
+        property_id (int): Property ID
+        names (list): Feature names from Property.features
+    """
+    features = {}
+    for name in names or []:
+        key = feature_key(name)
+        if key:
+            features.setdefault(key, ' '.join(str(name).split()))
+    
+    connection.execute(property_features.delete().where(property_features.c.property_id == property_id))
+    if not features:
+        return
+    
+    table = Feature.__table__
+    lookup = select(table.c.key, table.c.id).where(table.c.key.in_(list(features)))
+    ids = dict(connection.execute(lookup).all())
+    missing = [{'key': key, 'name': name} for key, name in features.items() if key not in ids]
+    if missing:
+        connection.execute(table.insert(), missing)
+        ids = dict(connection.execute(lookup).all())
+    
+    connection.execute(property_features.insert(), [
+        {'property_id': property_id, 'feature_id': ids[key]} for key in features
+    ])
+
+
+@db.event.listens_for(Property, 'after_insert')
+@db.event.listens_for(Property, 'after_update')
+def _sync_features_on_write(mapper, connection, target):
+    """Relink a property's features when its features list was assigned."""
+    if db.inspect(target).attrs.features.history.has_changes():
+        sync_property_features(connection, target.id, target.features)
+
+
+@db.event.listens_for(Property, 'before_delete')
+def _unlink_features_on_delete(mapper, connection, target):
+    """Remove a deleted property's links (SQLite does not enforce ON DELETE CASCADE)."""
+    connection.execute(property_features.delete().where(property_features.c.property_id == target.id))
@@ -0,0 +1,147 @@
+"""
+Full-text search over property titles, descriptions and locations.
+
+SQLite uses an FTS5 external-content table kept in sync with `properties`
+by triggers and ranked with bm25(). PostgreSQL uses a GIN index over a
+tsvector expression and ranks with ts_rank_cd(). Other databases fall back
+to ILIKE matching without ranking.
+"""
+
+import re
+from sqlalchemy import Float, Integer, and_, literal_column, or_, text
+from app import db
+from app.models import Property
+
+FTS_TABLE = 'properties_fts'
+
+SQLITE_TRIGGERS = {
+    'properties_fts_ai': """
+        CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+            INSERT INTO properties_fts(rowid, title, description, location)
+            VALUES (new.id, new.title, new.description, new.location);
+        END
+    """,
+    'properties_fts_ad': """
+        CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+            INSERT INTO properties_fts(properties_fts, rowid, title, description, location)
+            VALUES ('delete', old.id, old.title, old.description, old.location);
+        END
+    """,
+    'properties_fts_au': """
+        CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF title, description, location ON properties BEGIN
+            INSERT INTO properties_fts(properties_fts, rowid, title, description, location)
+            VALUES ('delete', old.id, old.title, old.description, old.location);
+            INSERT INTO properties_fts(rowid, title, description, location)
+            VALUES (new.id, new.title, new.description, new.location);
+        END
+    """
+}
+
+SQLITE_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, location,
+        content='properties', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+# Column weights for bm25(): title, description, location
+SQLITE_BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Must match the indexed expression exactly for PostgreSQL to use the index
+POSTGRES_DOCUMENT = (
+    "to_tsvector('english', coalesce(properties.title, '') || ' ' || "
+    "coalesce(properties.description, '') || ' ' || coalesce(properties.location, ''))"
+)
+
+POSTGRES_INDEX = (
+    "CREATE INDEX IF NOT EXISTS ix_properties_fulltext ON properties USING GIN ("
+    "to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(location, '')))"
+)
+
+
+def search_terms(search_text):
+    """Split free text into lowercase word tokens."""
+    return re.findall(r'\w+', (search_text or '').lower())
+
+
+def ensure_fulltext_index():
+    """
+    Create the full-text index if it is missing.
+    
+    On SQLite the FTS table is rebuilt from `properties` whenever the table
+    or any of its triggers had to be created, e.g. after db.drop_all().
+    """
+    dialect = db.engine.dialect.name
+    
+    if dialect == 'postgresql':
+        db.session.execute(text(POSTGRES_INDEX))
+        db.session.commit()
+        return
+    
+    if dialect != 'sqlite':
+        return
+    
+    existing = {
+        row[0] for row in db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE name = :table OR name LIKE 'properties_fts_a_'"
+        ), {'table': FTS_TABLE})
+    }
+    if FTS_TABLE in existing and set(SQLITE_TRIGGERS) <= existing:
+        return
+    
+    db.session.execute(text(SQLITE_TABLE))
+    for ddl in SQLITE_TRIGGERS.values():
+        db.session.execute(text(ddl))
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    db.session.commit()
+
+
+def apply_fulltext_search(query, search_text):
+    """
+    Filter a Property query to full-text matches and order by relevance.
+    
+    Every term must match; on SQLite the last characters of each term may be
+    incomplete (prefix match), so results update while the user types.
+    
+    Args:
+        query: Property query object
+        search_text (str): Free text from the q parameter
+    
+    Returns:
+        SQLAlchemy query object ordered best match first
+    """
+    terms = search_terms(search_text)
+    if not terms:
+        return query
+    
+    dialect = db.engine.dialect.name
+    
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        matches = text(
+            f"SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        ).bindparams(match=match).columns(id=Integer, rank=Float).subquery('fulltext_matches')
+        
+        # A WHERE clause rather than a join keeps filter_by() aimed at Property;
+        # bm25() is lower for better matches
+        return query.filter(Property.id == matches.c.id).order_by(matches.c.rank.asc())
+    
+    if dialect == 'postgresql':
+        document = literal_column(POSTGRES_DOCUMENT)
+        ts_query = db.func.plainto_tsquery('english', ' '.join(terms))
+        return query.filter(document.op('@@')(ts_query)).order_by(
+            db.func.ts_rank_cd(document, ts_query).desc()
+        )
+    
+    return query.filter(and_(*[
+        or_(
+            Property.title.ilike(f'%{term}%'),
+            Property.description.ilike(f'%{term}%'),
+            Property.location.ilike(f'%{term}%')
+        )
+        for term in terms
+    ]))
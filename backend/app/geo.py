@@ -0,0 +1,162 @@
+"""
+Geohash encoding and distance helpers for map searches.
+
+Properties store a geohash next to their coordinates. A bounding box is
+covered by a handful of geohash cells, and each cell becomes a range
+condition on the indexed geohash column, so viewport and radius searches
+read only nearby rows before the exact coordinate check.
+"""
+
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Characters stored per property (about 5 m x 5 m cells)
+GEOHASH_PRECISION = 9
+
+# Most cells a bounding box may be split into before using a coarser precision
+MAX_COVER_CELLS = 16
+
+KM_PER_DEGREE = 111.32
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encode a coordinate as a geohash string.
+    
+    Args:
+        latitude (float): Latitude in degrees
+        longitude (float): Longitude in degrees
+        precision (int): Number of characters
+    
+    Returns:
+        str: Geohash
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (latitude, longitude) size in degrees of a geohash cell."""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def cover_bbox(min_lat, min_lng, max_lat, max_lng):
+    """
+    Return geohash prefixes whose cells together cover a bounding box.
+    
+    Uses the finest precision that needs at most MAX_COVER_CELLS cells.
+    
+    Args:
+        min_lat (float): South edge
+        min_lng (float): West edge
+        max_lat (float): North edge
+        max_lng (float): East edge
+    
+    Returns:
+        list: Sorted geohash prefixes (empty when the box spans the whole world)
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = cell_size(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        cols = math.floor(max_lng / lng_step) - math.floor(min_lng / lng_step) + 1
+        if rows * cols > MAX_COVER_CELLS:
+            continue
+        
+        prefixes = set()
+        for row in range(rows):
+            latitude = min(min_lat + row * lat_step, max_lat)
+            for col in range(cols):
+                longitude = min(min_lng + col * lng_step, max_lng)
+                prefixes.add(encode_geohash(latitude, longitude, precision))
+        # Corners can fall in a cell the stepping skipped over
+        for latitude in (min_lat, max_lat):
+            for longitude in (min_lng, max_lng):
+                prefixes.add(encode_geohash(latitude, longitude, precision))
+        return sorted(prefixes)
+    
+    return []
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """
+    Return the bounding box (min_lat, min_lng, max_lat, max_lng) around a circle.
+    
+    Args:
+        latitude (float): Center latitude
+        longitude (float): Center longitude
+        radius_km (float): Radius in kilometres
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+    return (
+        max(latitude - lat_delta, -90.0), max(longitude - lng_delta, -180.0),
+        min(latitude + lat_delta, 90.0), min(longitude + lng_delta, 180.0)
+    )
+
+
+def precision_for_zoom(zoom, max_precision=8):
+    """
+    Pick the geohash precision for clustering at a web map zoom level.
+    
+    Chooses the finest cells that are still at least an eighth of a map
+    tile wide, so a tile shows a handful of clusters rather than every pin.
+    
+    Args:
+        zoom (int): Web map zoom level (0 shows the whole world in one tile)
+        max_precision (int): Finest precision to return
+    
+    Returns:
+        int: Geohash precision
+    """
+    min_width = 360.0 / (1 << zoom) / 8
+    precision = 1
+    for candidate in range(1, max_precision + 1):
+        if cell_size(candidate)[1] >= min_width:
+            precision = candidate
+    return precision
+
+
+def snap_bbox(min_lat, min_lng, max_lat, max_lng, precision):
+    """
+    Grow a bounding box outwards to whole geohash cells of a precision.
+    
+    Cells at the edge of the view are then aggregated completely, and nearby
+    views snap to the same box, which makes the result cacheable.
+    
+    Returns:
+        tuple: (min_lat, min_lng, max_lat, max_lng)
+    """
+    lat_step, lng_step = cell_size(precision)
+    return (
+        max(math.floor((min_lat + 90) / lat_step) * lat_step - 90, -90.0),
+        max(math.floor((min_lng + 180) / lng_step) * lng_step - 180, -180.0),
+        min(math.ceil((max_lat + 90) / lat_step) * lat_step - 90, 90.0),
+        min(math.ceil((max_lng + 180) / lng_step) * lng_step - 180, 180.0)
+    )
@@ -4,8 +4,17 @@ Database models for the Flask application.
 
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.ext.hybrid import hybrid_property
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
+from app.geo import encode_geohash
+from app.schemas import contact_message_schema, property_schema, user_schema
+from app.serializers import serialize
+
+# Literal stand-ins for a missing square_feet in sort expressions (literals,
+# not bound parameters, so queries match the expression indexes)
+SQUARE_FEET_MISSING_HIGH = 2147483647
+SQUARE_FEET_MISSING_LOW = -1
 
 # Many-to-many relationship table for user favorites
 user_favorites = db.Table('user_favorites',
@@ -13,6 +22,14 @@ user_favorites = db.Table('user_favorites',
     db.Column('property_id', db.Integer, db.ForeignKey('properties.id'), primary_key=True)
 )
 
+# Many-to-many relationship table for property features; the primary key
+# serves lookups by property, ix_property_features_feature lookups by feature
+property_features = db.Table('property_features',
+    db.Column('property_id', db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('feature_id', db.Integer, db.ForeignKey('features.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_property_features_feature', 'feature_id', 'property_id')
+)
+
 
 class User(db.Model):
     """User model for admin authentication and management."""
@@ -67,19 +84,8 @@ class User(db.Model):
         return self.is_main_admin
     
     def to_dict(self):
-        """Convert user instance to dictionary."""
-        return {
-            'id': self.id,
-            'username': self.username,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'role': self.role,
-            'is_main_admin': self.is_main_admin,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        """Convert user instance to dictionary, as the API serializes it plus is_main_admin."""
+        return dict(serialize(user_schema, self), is_main_admin=self.is_main_admin)
     
     def __repr__(self):
         """String representation of User."""
@@ -91,6 +97,14 @@ class Property(db.Model):
     """Property model for real estate listings."""
     
     __tablename__ = 'properties'
+    __table_args__ = (
+        # Public listing: status + verified filter, newest first (id breaks ties for keyset paging)
+        db.Index('ix_properties_public_created', 'status', 'is_verified', 'created_at', 'id'),
+        # Search filtered by property type, same ordering
+        db.Index('ix_properties_public_type_created', 'status', 'is_verified', 'property_type', 'created_at', 'id'),
+        # Search with min_price/max_price range, and sort=price_asc/price_desc
+        db.Index('ix_properties_public_price', 'status', 'is_verified', 'price', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -98,6 +112,9 @@ class Property(db.Model):
     property_type = db.Column(db.String(50), nullable=False)  # house, apartment, condo, etc.
     location = db.Column(db.String(200), nullable=False)
     address = db.Column(db.String(300), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True, index=True)  # Derived from latitude/longitude for map searches
     price = db.Column(db.Numeric(12, 2), nullable=False)
     bedrooms = db.Column(db.Integer, nullable=True)
     bathrooms = db.Column(db.Integer, nullable=True)
@@ -105,9 +122,9 @@ class Property(db.Model):
     lot_size = db.Column(db.String(50), nullable=True)
     year_built = db.Column(db.Integer, nullable=True)
     status = db.Column(db.String(20), default='available', nullable=False)  # available, sold, pending
-    features = db.Column(db.Text, nullable=True)  # JSON string of features
-    images = db.Column(db.Text, nullable=True)  # JSON string of image URLs
-    admin_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Changed from agent_id
+    features = db.Column(db.JSON, nullable=True)  # List of feature names
+    images = db.Column(db.JSON, nullable=True)  # List of image URLs
+    admin_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)  # Changed from agent_id
     is_verified = db.Column(db.Boolean, default=False, nullable=False)  # Property accuracy verification
     verification_notes = db.Column(db.Text, nullable=True)  # Notes about property verification
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -116,40 +133,116 @@ class Property(db.Model):
     # Relationships
     admin = db.relationship('User', backref=db.backref('properties', lazy=True))
     
+    @hybrid_property
+    def square_feet_sort_asc(self):
+        """square_feet for ascending sorts, with missing sizes sorting last."""
+        return self.square_feet if self.square_feet is not None else SQUARE_FEET_MISSING_HIGH
+    
+    @square_feet_sort_asc.expression
+    def square_feet_sort_asc(cls):
+        return db.func.coalesce(cls.square_feet, db.literal_column(str(SQUARE_FEET_MISSING_HIGH)))
+    
+    @hybrid_property
+    def square_feet_sort_desc(self):
+        """square_feet for descending sorts, with missing sizes sorting last."""
+        return self.square_feet if self.square_feet is not None else SQUARE_FEET_MISSING_LOW
+    
+    @square_feet_sort_desc.expression
+    def square_feet_sort_desc(cls):
+        return db.func.coalesce(cls.square_feet, db.literal_column(str(SQUARE_FEET_MISSING_LOW)))
+    
+    def to_dict(self):
+        """Convert property instance to dictionary, as the API serializes it."""
+        return serialize(property_schema, self)
+    
+    def __repr__(self):
+        """String representation of Property."""
+        return f'<Property {self.title}>'
+
+
+# sort=square_feet_asc / square_feet_desc, with missing sizes last in both directions
+db.Index('ix_properties_public_square_feet_asc', Property.status, Property.is_verified,
+         Property.square_feet_sort_asc, Property.id)
+db.Index('ix_properties_public_square_feet_desc', Property.status, Property.is_verified,
+         Property.square_feet_sort_desc, Property.id)
+
+
+@db.event.listens_for(Property, 'before_insert')
+@db.event.listens_for(Property, 'before_update')
+def _set_property_geohash(mapper, connection, target):
+    """Keep the geohash in step with the property's coordinates."""
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = encode_geohash(target.latitude, target.longitude)
+    else:
+        target.geohash = None
+
+
+class Feature(db.Model):
+    """Feature dictionary entry (e.g. "Swimming Pool") shared by properties."""
+    
+    __tablename__ = 'features'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)  # Spelling first seen
+    key = db.Column(db.String(100), unique=True, nullable=False)  # Lowercase, single-spaced name
+    
     def to_dict(self):
-        """Convert property instance to dictionary."""
-        import json
+        """Convert feature instance to dictionary."""
         return {
             'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'property_type': self.property_type,
-            'location': self.location,
-            'address': self.address,
-            'price': float(self.price) if self.price else None,
-            'bedrooms': self.bedrooms,
-            'bathrooms': self.bathrooms,
-            'square_feet': self.square_feet,
-            'lot_size': self.lot_size,
-            'year_built': self.year_built,
-            'status': self.status,
-            'features': json.loads(self.features) if self.features and self.features != 'null' else [],
-            'images': json.loads(self.images) if self.images and self.images != 'null' else [],
-            'admin_id': self.admin_id,
-            'admin': {
-                'id': self.admin.id,
-                'username': self.admin.username,
-                'name': f"{self.admin.first_name} {self.admin.last_name}".strip()
-            } if self.admin else None,
-            'is_verified': self.is_verified,
-            'verification_notes': self.verification_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'name': self.name
         }
     
     def __repr__(self):
-        """String representation of Property."""
-        return f'<Property {self.title}>'
+        """String representation of Feature."""
+        return f'<Feature {self.name}>'
+
+
+class SavedSearch(db.Model):
+    """Search criteria a visitor wants to be notified about when new listings match."""
+    
+    __tablename__ = 'saved_searches'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=True)
+    email = db.Column(db.String(120), nullable=False, index=True)
+    criteria = db.Column(db.JSON, nullable=False)  # Search query parameters, as for /api/properties/search
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    user = db.relationship('User', backref=db.backref('saved_searches', lazy=True))
+    
+    def __repr__(self):
+        """String representation of SavedSearch."""
+        return f'<SavedSearch {self.id} for {self.email}>'
+
+
+class SavedSearchMatch(db.Model):
+    """A public listing that matched a saved search, queued for notification."""
+    
+    __tablename__ = 'saved_search_matches'
+    __table_args__ = (
+        # A listing is queued at most once per saved search
+        db.UniqueConstraint('saved_search_id', 'property_id', name='uq_saved_search_matches_search_property'),
+        # Notification queue: pending matches, oldest first
+        db.Index('ix_saved_search_matches_pending', 'notified_at', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_searches.id', ondelete='CASCADE'), nullable=False)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    notified_at = db.Column(db.DateTime, nullable=True)  # Null until the notification is sent
+    
+    # Relationships
+    saved_search = db.relationship('SavedSearch', backref=db.backref('matches', lazy=True, cascade='all, delete-orphan'))
+    property = db.relationship('Property', backref=db.backref('saved_search_matches', lazy=True, cascade='all, delete-orphan'))
+    
+    def __repr__(self):
+        """String representation of SavedSearchMatch."""
+        return f'<SavedSearchMatch {self.saved_search_id} -> {self.property_id}>'
 
 
 class ContactMessage(db.Model):
@@ -173,21 +266,8 @@ class ContactMessage(db.Model):
     user = db.relationship('User', backref=db.backref('contact_messages', lazy=True))
     
     def to_dict(self):
-        """Convert contact message instance to dictionary."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'phone': self.phone,
-            'subject': self.subject,
-            'message': self.message,
-            'property_id': self.property_id,
-            'property_title': self.property.title if self.property else None,
-            'user_id': self.user_id,
-            'user_name': f"{self.user.first_name} {self.user.last_name}" if self.user else None,
-            'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        """Convert contact message instance to dictionary, as the API serializes it."""
+        return serialize(contact_message_schema, self)
     
     def __repr__(self):
         """String representation of ContactMessage."""
@@ -0,0 +1,313 @@
+"""
+Saved-search matching for new and changed listings.
+
+Rather than re-running every saved search after each write, the criteria
+are compiled once into Python predicates and only the written property is
+tested against them (a percolator). Predicates are bucketed by
+property_type, so a write only tests searches for its own type or for any
+type. Matches are queued in saved_search_matches for notification.
+"""
+
+import math
+import re
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from app import db
+from app.cache import on_catalog_change, table_version
+from app.features import FEATURE_MATCH_MODES, feature_key, parse_feature_keys
+from app.fulltext import search_terms
+from app.geo import KM_PER_DEGREE
+from app.models import Property, SavedSearch, SavedSearchMatch
+from app.trigram import DEFAULT_THRESHOLD, fuzzy_matches
+from app.utils import InvalidQueryParameterError, is_fuzzy_search, parse_bbox, parse_radius
+
+# Search parameters a saved search may use; paging, sorting and fields do not apply
+CRITERIA_PARAMS = (
+    'q', 'location', 'property_type', 'min_price', 'max_price', 'bedrooms',
+    'min_square_feet', 'max_square_feet', 'features', 'features_match',
+    'bbox', 'lat', 'lng', 'radius_km', 'status', 'fuzzy'
+)
+
+
+def _number(criteria, name, parse):
+    """Parse one numeric criterion, or return None if it is not set."""
+    value = criteria.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return parse(str(value))
+    except (InvalidOperation, ValueError):
+        raise InvalidQueryParameterError(f'{name} must be a number')
+
+
+def _like_pattern(value):
+    """Translate an ILIKE '%value%' filter into a case-insensitive regex."""
+    pattern = ''.join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in value)
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
+def normalize_criteria(criteria):
+    """
+    Bring saved-search criteria to the string form of query parameters.
+    
+    Values must be strings, numbers or booleans, as they would appear in a
+    query string; features may also be given as a list of names. Empty
+    values are dropped.
+    
+    Args:
+        criteria (dict): Criteria as submitted
+    
+    Returns:
+        dict: Parameter name -> string value
+    
+    Raises:
+        InvalidQueryParameterError: If criteria is not an object or a value
+            has another shape
+    """
+    if not isinstance(criteria, dict):
+        raise InvalidQueryParameterError('criteria must be an object')
+    
+    normalized = {}
+    for name, value in criteria.items():
+        if name == 'features' and isinstance(value, list):
+            if not all(isinstance(item, str) for item in value):
+                raise InvalidQueryParameterError('features must be a comma-separated string or a list of strings')
+            value = ','.join(value)
+        elif isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, (int, float)):
+            value = str(value)
+        elif value is not None and not isinstance(value, str):
+            raise InvalidQueryParameterError(f'{name} must be a string or a number')
+        
+        if value not in (None, ''):
+            normalized[name] = value
+    return normalized
+
+
+def compile_criteria(criteria):
+    """
+    Compile saved-search criteria into a predicate over a Property.
+    
+    The predicate mirrors create_property_search_query() over verified
+    properties; q terms match word prefixes, as in the SQLite full-text
+    search, unless fuzzy is set.
+    
+    Args:
+        criteria (dict): Search parameters (see CRITERIA_PARAMS), as
+            returned by normalize_criteria()
+    
+    Returns:
+        function: Takes a Property and returns True if it matches
+    
+    Raises:
+        InvalidQueryParameterError: If a parameter is unknown or malformed
+    """
+    unknown = set(criteria) - set(CRITERIA_PARAMS)
+    if unknown:
+        raise InvalidQueryParameterError(f"Unsupported search criteria: {', '.join(sorted(unknown))}")
+    
+    checks = []
+    status = criteria.get('status') or 'available'
+    checks.append(lambda property: property.is_verified and property.status == status)
+    
+    if criteria.get('property_type'):
+        property_type = criteria['property_type']
+        checks.append(lambda property: property.property_type == property_type)
+    
+    for name, column, parse, compare in (
+        ('min_price', 'price', Decimal, lambda value, bound: value >= bound),
+        ('max_price', 'price', Decimal, lambda value, bound: value <= bound),
+        ('bedrooms', 'bedrooms', int, lambda value, bound: value >= bound),
+        ('min_square_feet', 'square_feet', int, lambda value, bound: value >= bound),
+        ('max_square_feet', 'square_feet', int, lambda value, bound: value <= bound),
+    ):
+        bound = _number(criteria, name, parse)
+        if bound is not None:
+            checks.append(lambda property, column=column, bound=bound, compare=compare: (
+                getattr(property, column) is not None and compare(getattr(property, column), bound)
+            ))
+    
+    if is_fuzzy_search(criteria):
+        # Trigram word similarity, as in the fuzzy SQL search
+        threshold = current_app.config.get('FUZZY_SIMILARITY_THRESHOLD', DEFAULT_THRESHOLD)
+        if criteria.get('location'):
+            location = str(criteria['location'])
+            checks.append(lambda property: fuzzy_matches(location, [property.location], threshold))
+        if criteria.get('q'):
+            search_text = str(criteria['q'])
+            checks.append(lambda property: fuzzy_matches(search_text, [property.title, property.location], threshold))
+    else:
+        if criteria.get('location'):
+            location = _like_pattern(str(criteria['location']))
+            checks.append(lambda property: bool(location.search(property.location or '')))
+        
+        terms = search_terms(criteria.get('q'))
+        if terms:
+            def text_matches(property):
+                tokens = set(search_terms(' '.join(
+                    value or '' for value in (property.title, property.description, property.location)
+                )))
+                return all(any(token.startswith(term) for token in tokens) for term in terms)
+            checks.append(text_matches)
+    
+    match = (criteria.get('features_match') or 'all').lower()
+    if match not in FEATURE_MATCH_MODES:
+        raise InvalidQueryParameterError(f"features_match must be one of: {', '.join(FEATURE_MATCH_MODES)}")
+    keys = set(parse_feature_keys(criteria.get('features')))
+    if keys:
+        def features_match(property):
+            present = {feature_key(name) for name in property.features or []}
+            return keys <= present if match == 'all' else bool(keys & present)
+        checks.append(features_match)
+    
+    if criteria.get('bbox'):
+        min_lat, min_lng, max_lat, max_lng = parse_bbox(criteria['bbox'])
+        checks.append(lambda property: (
+            property.latitude is not None and property.longitude is not None
+            and min_lat <= property.latitude <= max_lat and min_lng <= property.longitude <= max_lng
+        ))
+    
+    radius = parse_radius(criteria)
+    if radius:
+        latitude, longitude, radius_km = radius
+        # Same equirectangular approximation as the SQL radius filter
+        scale = math.cos(math.radians(latitude))
+        limit = (radius_km / KM_PER_DEGREE) ** 2
+        checks.append(lambda property: (
+            property.latitude is not None and property.longitude is not None
+            and (property.latitude - latitude) ** 2 + ((property.longitude - longitude) * scale) ** 2 <= limit
+        ))
+    
+    return lambda property: all(check(property) for check in checks)
+
+
+class SavedSearchPercolator:
+    """Per-worker set of compiled saved searches, tested against single listings."""
+    
+    def __init__(self, max_age=60):
+        """
+        Initialize an empty percolator.
+        
+        Args:
+            max_age (int): Seconds before saved searches are reloaded to pick
+                up ones created by other workers
+        """
+        self.max_age = max_age
+        self._predicates = None
+        self._version = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+    
+    def is_stale(self):
+        """Return True if the compiled searches may not reflect the database."""
+        return (
+            self._predicates is None
+            or self._version != table_version(SavedSearch.__tablename__)
+            or time.monotonic() - self._loaded_at > self.max_age
+        )
+    
+    def load(self):
+        """Compile every active saved search, bucketed by property_type."""
+        version = table_version(SavedSearch.__tablename__)
+        rows = db.session.execute(
+            db.select(SavedSearch.id, SavedSearch.criteria).where(SavedSearch.is_active.is_(True))
+        )
+        
+        predicates = {}
+        for saved_search_id, criteria in rows:
+            try:
+                # Searches saved before criteria were normalized may hold other shapes
+                criteria = normalize_criteria(criteria or {})
+                predicate = compile_criteria(criteria)
+            except InvalidQueryParameterError as e:
+                current_app.logger.warning(f'Skipping saved search {saved_search_id}: {e}')
+                continue
+            bucket = criteria.get('property_type') or None
+            predicates.setdefault(bucket, []).append((saved_search_id, predicate))
+        
+        with self._lock:
+            self._predicates = predicates
+            self._version = version
+            self._loaded_at = time.monotonic()
+    
+    def match(self, property):
+        """
+        Return the ids of the saved searches a property matches.
+        
+        Args:
+            property (Property): Listing to test
+        
+        Returns:
+            list: Matching saved search ids
+        """
+        if self.is_stale():
+            self.load()
+        
+        with self._lock:
+            candidates = self._predicates.get(None, []) + self._predicates.get(property.property_type, [])
+        return [saved_search_id for saved_search_id, predicate in candidates if predicate(property)]
+    
+    def percolate(self, property_id):
+        """
+        Queue matches for a property that was just written.
+        
+        Only public listings are tested; a listing already queued for a saved
+        search is not queued again when it changes.
+        
+        Args:
+            property_id (int): ID of the created or updated property
+        
+        Returns:
+            int: Number of new matches queued
+        """
+        property = db.session.get(Property, property_id)
+        if property is None or not property.is_verified:
+            return 0
+        
+        matched = self.match(property)
+        if not matched:
+            return 0
+        
+        queued = set(db.session.scalars(
+            db.select(SavedSearchMatch.saved_search_id).where(
+                SavedSearchMatch.property_id == property_id,
+                SavedSearchMatch.saved_search_id.in_(matched)
+            )
+        ))
+        new = [saved_search_id for saved_search_id in matched if saved_search_id not in queued]
+        if new:
+            db.session.add_all(
+                SavedSearchMatch(saved_search_id=saved_search_id, property_id=property_id)
+                for saved_search_id in new
+            )
+            db.session.commit()
+        return len(new)
+
+
+def init_percolator(app):
+    """
+    Create the application's saved-search percolator.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.extensions['percolator'] = SavedSearchPercolator(
+        max_age=app.config.get('SAVED_SEARCH_MAX_AGE', 60)
+    )
+
+
+@on_catalog_change
+def _percolate_catalog_change(property_id):
+    """Match the written property against saved searches."""
+    percolator = current_app.extensions.get('percolator')
+    if percolator is None or property_id is None:
+        return
+    try:
+        percolator.percolate(property_id)
+    except Exception as e:
+        # The listing write is already committed; a missed match must not fail it
+        db.session.rollback()
+        current_app.logger.error(f'Saved search matching failed for property {property_id}: {e}')
@@ -8,6 +8,7 @@ from .users import users_bp
 from .properties import properties_bp
 from .favorites import favorites_bp
 from .contact import contact_bp
+from .saved_searches import saved_searches_bp
 from .upload import upload_bp
 from .main import main_bp
 
@@ -28,4 +29,5 @@ def register_routes(app):
     app.register_blueprint(properties_bp, url_prefix='/api/properties')
     app.register_blueprint(favorites_bp, url_prefix='/api/favorites')
     app.register_blueprint(contact_bp, url_prefix='/api/contact')
+    app.register_blueprint(saved_searches_bp, url_prefix='/api/saved-searches')
     app.register_blueprint(upload_bp, url_prefix='/api/upload')
\ No newline at end of file
@@ -8,6 +8,7 @@ from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models import User
 from app.schemas import user_schema, user_login_schema, error_schema
+from app.serializers import serialize
 from app.utils import validate_json, success_response, handle_error, admin_required
 
 auth_bp = Blueprint('auth', __name__)
@@ -189,7 +190,7 @@ def get_admins():
         return success_response(
             message='Admin users retrieved successfully',
             data={
-                'admins': user_schema.dump(admins, many=True)
+                'admins': serialize(user_schema, admins, many=True)
             }
         )
         
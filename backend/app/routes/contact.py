@@ -4,10 +4,15 @@ Contact message routes for user inquiries and communication.
 
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy.orm import joinedload
 from app import db
 from app.models import ContactMessage, Property, User
 from app.schemas import contact_message_schema, contact_messages_schema
-from app.utils import validate_json, success_response, handle_error, paginate_query, admin_required
+from app.serializers import serialize
+from app.utils import (
+    InvalidQueryParameterError, validate_json, success_response, handle_error, paginate_query, admin_required,
+    apply_list_layout
+)
 
 contact_bp = Blueprint('contact', __name__)
 
@@ -94,8 +99,11 @@ def get_messages():
         status = request.args.get('status')
         property_id = request.args.get('property_id', type=int)
         
-        # Build query
-        query = ContactMessage.query
+        # Build query; property and sender are serialized, so join them in
+        query = ContactMessage.query.options(
+            joinedload(ContactMessage.property),
+            joinedload(ContactMessage.user)
+        )
         
         if status:
             query = query.filter_by(status=status)
@@ -111,11 +119,13 @@ def get_messages():
         return success_response(
             message='Contact messages retrieved successfully',
             data={
-                'messages': contact_messages_schema.dump(result['items']),
+                'messages': apply_list_layout(serialize(contact_messages_schema, result['items'])),
                 'pagination': result['pagination']
             }
         )
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Failed to retrieve contact messages', 500)
 
@@ -244,16 +254,21 @@ def get_user_messages():
         per_page = request.args.get('per_page', 20, type=int)
         
         # Query user's messages
-        query = ContactMessage.query.filter_by(user_id=current_user_id).order_by(ContactMessage.created_at.desc())
+        query = ContactMessage.query.options(
+            joinedload(ContactMessage.property),
+            joinedload(ContactMessage.user)
+        ).filter_by(user_id=current_user_id).order_by(ContactMessage.created_at.desc())
         result = paginate_query(query, page, per_page)
         
         return success_response(
             message='Your contact messages retrieved successfully',
             data={
-                'messages': contact_messages_schema.dump(result['items']),
+                'messages': apply_list_layout(serialize(contact_messages_schema, result['items'])),
                 'pagination': result['pagination']
             }
         )
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Failed to retrieve your contact messages', 500)
\ No newline at end of file
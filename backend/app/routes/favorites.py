@@ -4,6 +4,7 @@ Favorites routes for users to save and manage favorite properties.
 
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import joinedload
 from app import db
 from app.models import Property, User
 from app.schemas import properties_schema
@@ -39,7 +40,7 @@ def get_favorites():
         
         # Query user's favorite properties
         from app.models import user_favorites
-        query = Property.query.join(user_favorites).filter(
+        query = Property.query.options(joinedload(Property.admin)).join(user_favorites).filter(
             user_favorites.c.user_id == current_user_id
         ).order_by(Property.created_at.desc())
         
@@ -2,26 +2,125 @@
 Property management routes for real estate listings.
 """
 
-import json
+import csv
+import io
 import os
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, g, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import and_, or_
 from app import db
 from app.models import Property, User
+from app.cache import cached_response, catalog_changed
+from app.clusters import property_clusters
+from app.facets import property_facets
+from app.search_engine import get_search_engine
+from app.serializers import serialize
+from app.similarity import get_similarity_index
+from app.stats import property_stats
 from app.schemas import (
-    property_schema, properties_schema, property_create_schema, 
+    PropertySchema, property_schema, property_create_schema, 
     property_update_schema, property_search_schema
 )
 from app.utils import (
-    validate_json, success_response, handle_error, 
-    paginate_query, admin_required, create_property_search_query
+    validate_json, success_response, handle_error, apply_list_layout,
+    paginate_query, keyset_paginate_query, sort_ordering, InvalidQueryParameterError,
+    admin_required, create_property_search_query, is_fuzzy_search,
+    listing_validators, listing_etag, property_etag, not_modified_response, with_validators,
+    resolve_property_fields, apply_property_fields
 )
 
 properties_bp = Blueprint('properties', __name__)
 
+# Orders accepted by ?sort=, as (column, descending) keyset sort keys. Each
+# ends with id so cursors are stable and matches a composite index on
+# Property; properties without square_feet sort last in both directions.
+SORT_ORDERS = {
+    'newest': [(Property.created_at, True), (Property.id, True)],
+    'price_asc': [(Property.price, False), (Property.id, False)],
+    'price_desc': [(Property.price, True), (Property.id, True)],
+    'square_feet_asc': [(Property.square_feet_sort_asc, False), (Property.id, False)],
+    'square_feet_desc': [(Property.square_feet_sort_desc, True), (Property.id, True)]
+}
+DEFAULT_SORT = 'newest'
+
+# Columns each order needs loaded to build cursors under a fields projection
+SORT_COLUMNS = {
+    'newest': ('created_at',),
+    'price_asc': ('price',),
+    'price_desc': ('price',),
+    'square_feet_asc': ('square_feet',),
+    'square_feet_desc': ('square_feet',)
+}
+
+# Flat per-row representation used by the bulk export
+export_schema = PropertySchema(exclude=('admin', 'agent', 'agent_id'))
+EXPORT_FIELDS = sorted(export_schema.fields)
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+# Maximum number of ids accepted by the batch endpoint: GET ids must fit in
+# a URL, POST bodies take longer lists
+MAX_BATCH_IDS = 100
+MAX_BATCH_POST_IDS = 1000
+
+# Ids bound per IN (...) query, below SQLite's default parameter limit
+BATCH_QUERY_CHUNK = 500
+
+# Maximum number of location suggestions returned
+MAX_LOCATION_SUGGESTIONS = 50
+
+# Maximum number of similar properties returned
+MAX_SIMILAR_PROPERTIES = 50
+
+
+def _is_admin_request():
+    """Return True if the request carries a valid token for an admin user."""
+    try:
+        from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+        verify_jwt_in_request(optional=True)
+        current_user_id = get_jwt_identity()
+        if current_user_id:
+            current_user = User.query.get(current_user_id)
+            return bool(current_user and current_user.is_admin)
+    except:
+        pass
+    return False
+
+
+def _listing_sort():
+    """Return the requested ?sort= order name, defaulting to newest first."""
+    sort = request.args.get('sort') or DEFAULT_SORT
+    if sort not in SORT_ORDERS:
+        raise InvalidQueryParameterError(f"sort must be one of: {', '.join(SORT_ORDERS)}")
+    return sort
+
+
+def _listing_fields(sort):
+    """Resolve ?fields= and add the columns the sort order's cursors need."""
+    columns, schema = resolve_property_fields(request.args.get('fields'))
+    if columns:
+        columns = tuple(columns) + SORT_COLUMNS[sort]
+    return columns, schema
+
+
+def _paginate_listing(query, page, per_page, sort=DEFAULT_SORT):
+    """Paginate a property listing by cursor when ?cursor= is present, else by page."""
+    cursor = request.args.get('cursor')
+    count = request.args.get('count') or current_app.config.get('PROPERTY_LISTING_COUNT_STRATEGY')
+    if cursor is None:
+        return paginate_query(query, page, per_page, count=count)
+    
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    return keyset_paginate_query(
+        query, SORT_ORDERS[sort], cursor or None, per_page,
+        include_total=include_total, count=count
+    )
+
 
 @properties_bp.route('', methods=['GET'])
+@cached_response
 def get_properties():
     """
     Get all properties (public endpoint - shows verified properties to public).
@@ -29,8 +128,20 @@ def get_properties():
     Query Parameters:
     - page: Page number (default: 1)
     - per_page: Items per page (default: 20, max: 100)
+    - cursor: Opaque cursor for keyset pagination (empty for the first page);
+      replaces page and returns next_cursor/prev_cursor
+    - include_total: With cursor, also return the total count (default: false)
+    - count: How to compute the total: exact, cached, estimated or none
+      (default: PROPERTY_LISTING_COUNT_STRATEGY)
     - status: Filter by status (available, sold, pending)
     - show_all: If authenticated admin, can see all properties
+    - sort: newest (default), price_asc, price_desc, square_feet_asc or
+      square_feet_desc; works with both page and cursor pagination
+    - fields: Comma-separated fields to return, or "card" for the compact
+      grid projection (id, title, price, location, bedrooms, image)
+    
+    Responses carry a weak ETag and Last-Modified; conditional requests
+    that still match get 304 Not Modified.
     """
     try:
         # Get pagination parameters
@@ -38,84 +149,432 @@ def get_properties():
         per_page = request.args.get('per_page', 20, type=int)
         status = request.args.get('status', 'available')
         show_all = request.args.get('show_all', 'false').lower() == 'true'
+        sort = _listing_sort()
         
         # Build query - for public, only show verified properties
         query = Property.query.filter_by(status=status)
         
         # Check if this is an admin request for all properties
-        is_admin = False
-        try:
-            from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-            verify_jwt_in_request(optional=True)
-            current_user_id = get_jwt_identity()
-            if current_user_id:
-                current_user = User.query.get(current_user_id)
-                is_admin = current_user and current_user.is_admin
-        except:
-            pass
+        is_admin = _is_admin_request()
         
         # If not admin or not requesting all, only show verified properties
         if not (is_admin and show_all):
             query = query.filter_by(is_verified=True)
         
-        query = query.order_by(Property.created_at.desc())
+        query = query.order_by(*sort_ordering(SORT_ORDERS[sort]))
+        
+        # Skip the page query and serialization if the client copy is current
+        etag, last_modified = listing_validators(query, Property.updated_at, is_admin and show_all)
+        not_modified = not_modified_response(etag, last_modified, weak=True)
+        if not_modified:
+            return not_modified
+        
+        # Load only the columns the requested fields need
+        columns, schema = _listing_fields(sort)
+        query = apply_property_fields(query, columns, schema)
         
         # Execute paginated query
-        result = paginate_query(query, page, per_page)
+        result = _paginate_listing(query, page, per_page, sort)
         
-        return success_response(
+        return with_validators(success_response(
             message='Properties retrieved successfully',
             data={
-                'properties': properties_schema.dump(result['items']),
+                'properties': apply_list_layout(serialize(schema, result['items'])),
                 'pagination': result['pagination']
             }
-        )
+        ), etag, last_modified, weak=True)
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Failed to get properties', 500)
 
 
 @properties_bp.route('/search', methods=['GET'])
+@cached_response
 def search_properties():
     """
     Search properties with advanced filtering (public endpoint - only verified properties).
+    
+    q runs a full-text search over title, description and location and
+    orders results by relevance. bbox (min_lng,min_lat,max_lng,max_lat)
+    limits results to a map viewport; lat, lng and radius_km to a circle,
+    nearest first. fuzzy=true makes q and location tolerate typos, matching
+    titles and locations by trigram similarity and ranking by it. An
+    explicit sort replaces relevance and distance order; without one, q,
+    fuzzy and radius searches cannot be combined with cursor, since
+    relevance and distance are not stable keysets. On SQLite a fuzzy search
+    ranks at most 500 matches; pagination.total_is_lower_bound is set when
+    more matched.
+    
+    Accepts the same page/per_page or cursor/include_total pagination,
+    sort and fields parameters as the listing endpoint.
     """
     try:
         # Get search parameters from query string
         search_params = request.args.to_dict()
+        sort = _listing_sort()
+        ranked = search_params.get('q') or search_params.get('radius_km') or (
+            is_fuzzy_search(search_params) and search_params.get('location')
+        )
+        if ranked and 'cursor' in search_params and not search_params.get('sort'):
+            raise InvalidQueryParameterError('cursor pagination with q, fuzzy or radius_km requires sort')
         
         # Get pagination parameters
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         
+        # Answer from the in-memory index when it supports every parameter
+        engine = get_search_engine()
+        hit = engine.search(search_params, page, per_page) if engine else None
+        if hit is not None:
+            return _indexed_search_response(hit, search_params)
+        
         # Build search query
         query = create_property_search_query(search_params)
         
         # Only show verified properties to public
         query = query.filter_by(is_verified=True)
         
-        query = query.order_by(Property.created_at.desc())
+        # An explicit sort wins; otherwise it breaks relevance/distance ties
+        if search_params.get('sort'):
+            query = query.order_by(None)
+        query = query.order_by(*sort_ordering(SORT_ORDERS[sort]))
+        
+        # Skip the page query and serialization if the client copy is current
+        etag, last_modified = listing_validators(query, Property.updated_at)
+        not_modified = not_modified_response(etag, last_modified, weak=True)
+        if not_modified:
+            return not_modified
+        
+        # Load only the columns the requested fields need
+        columns, schema = _listing_fields(sort)
+        query = apply_property_fields(query, columns, schema)
         
         # Execute paginated query
-        result = paginate_query(query, page, per_page)
+        result = _paginate_listing(query, page, per_page, sort)
+        if g.get('fuzzy_matches_capped'):
+            # Only the best fuzzy matches were kept, so more rows may match
+            result['pagination']['total_is_lower_bound'] = True
         
-        return success_response(
+        return with_validators(success_response(
             message='Properties search completed',
             data={
-                'properties': properties_schema.dump(result['items']),
+                'properties': apply_list_layout(serialize(schema, result['items'])),
                 'pagination': result['pagination'],
                 'search_criteria': search_params
             }
-        )
+        ), etag, last_modified, weak=True)
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Property search failed', 500)
 
 
+def _indexed_search_response(hit, search_params):
+    """Build the search response for a page of ids found by the search engine."""
+    etag = listing_etag(hit['last_modified'], hit['pagination']['total'])
+    not_modified = not_modified_response(etag, hit['last_modified'], weak=True)
+    if not_modified:
+        return not_modified
+    
+    columns, schema = resolve_property_fields(request.args.get('fields'))
+    # Re-check visibility in case another worker changed a row since the index synced
+    query = Property.query.filter(Property.id.in_(hit['ids'])).filter_by(status='available', is_verified=True)
+    query = apply_property_fields(query, columns, schema)
+    properties = {property.id: property for property in query}
+    
+    return with_validators(success_response(
+        message='Properties search completed',
+        data={
+            'properties': apply_list_layout(
+                serialize(schema, [properties[id] for id in hit['ids'] if id in properties])
+            ),
+            'pagination': hit['pagination'],
+            'search_criteria': search_params
+        }
+    ), etag, hit['last_modified'], weak=True)
+
+
+def _export_rows(query):
+    """Yield serialized properties one at a time from a server-side cursor."""
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    for property in query.yield_per(batch_size):
+        yield export_schema.dump(property)
+
+
+def _generate_ndjson(query):
+    """Yield the export as newline-delimited JSON."""
+    for row in _export_rows(query):
+        yield current_app.json.dumps(row) + '\n'
+
+
+def _generate_csv(query):
+    """Yield the export as CSV, flushing the buffer every few hundred rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    
+    for index, row in enumerate(_export_rows(query), start=1):
+        for field in ('features', 'images'):
+            row[field] = current_app.json.dumps(row.get(field) or [])
+        writer.writerow(row)
+        
+        if index % 500 == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+@properties_bp.route('/facets', methods=['GET'])
+def get_property_facets():
+    """
+    Get facet counts for a search (public endpoint - only verified properties).
+    
+    Accepts the same filters as /search. Counts per property_type, bedrooms
+    and status ignore that facet's own filter, so each shows what selecting
+    another value would return; price bucket counts apply every filter.
+    """
+    try:
+        search_params = request.args.to_dict()
+        
+        return success_response(
+            message='Property facets retrieved successfully',
+            data={
+                **property_facets(search_params),
+                'search_criteria': search_params
+            }
+        )
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to retrieve property facets', 500)
+
+
+@properties_bp.route('/stats', methods=['GET'])
+def get_property_stats():
+    """
+    Get price statistics (public endpoint - only verified properties).
+    
+    Returns count, min, max, mean, median, percentiles and a histogram of
+    price and of price per square foot, overall and per property_type and
+    location (the 50 locations with most listings).
+    
+    Query Parameters:
+    - bins: Histogram bins (default: 10, max: 50)
+    - Any /search filter to narrow the properties
+    """
+    try:
+        return success_response(
+            message='Property statistics retrieved successfully',
+            data=property_stats(request.args.to_dict())
+        )
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to retrieve property statistics', 500)
+
+
+@properties_bp.route('/clusters', methods=['GET'])
+def get_property_clusters():
+    """
+    Get map marker clusters (public endpoint - only verified properties).
+    
+    Query Parameters:
+    - bbox: Viewport as min_lng,min_lat,max_lng,max_lat (required)
+    - zoom: Web map zoom level, 0-22 (required); higher zooms give smaller cells
+    - Any /search filter to narrow the clustered properties
+    """
+    try:
+        return success_response(
+            message='Property clusters retrieved successfully',
+            data=property_clusters(request.args.to_dict())
+        )
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to retrieve property clusters', 500)
+
+
+def _suggest_locations_sql(prefix, limit):
+    """Suggest locations with a GROUP BY when the search engine is unavailable."""
+    location = db.func.lower(Property.location)
+    pattern = prefix.lower().replace('%', r'\%').replace('_', r'\_')
+    rows = db.session.query(
+        db.func.min(Property.location), db.func.count()
+    ).filter(
+        Property.status == 'available',
+        Property.is_verified == True,
+        or_(location.like(f'{pattern}%', escape='\\'), location.like(f'% {pattern}%', escape='\\'))
+    ).group_by(location).order_by(db.func.count().desc(), location).limit(limit).all()
+    return [{'location': name, 'count': count} for name, count in rows]
+
+
+@properties_bp.route('/locations/suggest', methods=['GET'])
+def suggest_locations():
+    """
+    Autocomplete locations of public listings (public endpoint).
+    
+    Query Parameters:
+    - prefix: Start of any word in the location, e.g. "kar" or "nairo" (required)
+    - limit: Maximum number of suggestions (default: 10, max: 50)
+    """
+    try:
+        prefix = ' '.join(request.args.get('prefix', '').split())
+        if not prefix:
+            raise InvalidQueryParameterError('prefix is required')
+        limit = min(max(1, request.args.get('limit', 10, type=int)), MAX_LOCATION_SUGGESTIONS)
+        
+        engine = get_search_engine()
+        suggestions = engine.suggest_locations(prefix, limit) if engine else None
+        if suggestions is None:
+            suggestions = _suggest_locations_sql(prefix, limit)
+        
+        return success_response(
+            message='Location suggestions retrieved successfully',
+            data={'prefix': prefix, 'suggestions': suggestions}
+        )
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to suggest locations', 500)
+
+
+@properties_bp.route('/export', methods=['GET'])
+@admin_required
+def export_properties():
+    """
+    Stream every property, or a filtered subset, as NDJSON or CSV (admin only).
+    
+    Rows are read through a server-side cursor in EXPORT_BATCH_SIZE batches
+    and written as they arrive, so memory use stays flat for any catalog size.
+    
+    Query Parameters:
+    - format: ndjson (default) or csv
+    - location, property_type, min_price, max_price, bedrooms, status:
+      Same filters as search; all statuses are exported when status is omitted
+    - verified: true/false to export only verified/unverified properties
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return handle_error(
+                Exception('Bad Request'),
+                f"format must be one of: {', '.join(EXPORT_FORMATS)}",
+                400
+            )
+        
+        query = create_property_search_query(request.args.to_dict(), default_status=None)
+        
+        verified = request.args.get('verified')
+        if verified is not None:
+            query = query.filter(Property.is_verified == (verified.lower() == 'true'))
+        
+        query = query.order_by(None).order_by(Property.id)
+        generate = _generate_csv if export_format == 'csv' else _generate_ndjson
+        
+        response = Response(
+            stream_with_context(generate(query)),
+            mimetype=EXPORT_FORMATS[export_format]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename=properties.{export_format}'
+        return response
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to export properties', 500)
+
+
+@properties_bp.route('/batch', methods=['GET', 'POST'])
+def get_properties_batch():
+    """
+    Get several properties by ID in one request (public endpoint).
+    
+    Applies the same visibility rules as get_property: unverified properties
+    are only returned to admins. Results follow the requested order, and ids
+    that do not exist or are hidden are listed in missing_ids.
+    
+    Query Parameters:
+    - ids: Comma-separated property IDs (GET, at most MAX_BATCH_IDS)
+    - fields: Same as the listing endpoint
+    
+    Expected JSON (POST, for long lists of at most MAX_BATCH_POST_IDS):
+    {
+        "ids": [integer, ...]
+    }
+    """
+    try:
+        if request.method == 'POST':
+            json_data = request.get_json(silent=True)
+            if not isinstance(json_data, dict):
+                return handle_error(Exception('Bad Request'), 'Request body must be a JSON object', 400)
+            
+            raw_ids = json_data.get('ids', [])
+            # JSON ids must already be integers; bool is an int subclass
+            if not isinstance(raw_ids, list) or not all(
+                isinstance(value, int) and not isinstance(value, bool) for value in raw_ids
+            ):
+                return handle_error(Exception('Bad Request'), 'ids must be a list of integers', 400)
+        else:
+            raw_ids = [value for value in request.args.get('ids', '').split(',') if value.strip()]
+        
+        try:
+            # Deduplicate while keeping the requested order
+            ids = list(dict.fromkeys(int(value) for value in raw_ids))
+        except (TypeError, ValueError):
+            return handle_error(Exception('Bad Request'), 'ids must be integers', 400)
+        
+        if not ids:
+            return handle_error(Exception('Bad Request'), 'ids is required', 400)
+        
+        max_ids = MAX_BATCH_POST_IDS if request.method == 'POST' else MAX_BATCH_IDS
+        if len(ids) > max_ids:
+            return handle_error(
+                Exception('Bad Request'),
+                f'At most {max_ids} ids can be requested at once',
+                400
+            )
+        
+        columns, schema = resolve_property_fields(request.args.get('fields'))
+        is_admin = _is_admin_request()
+        
+        found = {}
+        for start in range(0, len(ids), BATCH_QUERY_CHUNK):
+            chunk = ids[start:start + BATCH_QUERY_CHUNK]
+            query = apply_property_fields(Property.query.filter(Property.id.in_(chunk)), columns, schema)
+            if not is_admin:
+                query = query.filter(Property.is_verified == True)
+            found.update((property.id, property) for property in query)
+        
+        return success_response(
+            message='Properties retrieved successfully',
+            data={
+                'properties': apply_list_layout(serialize(schema, [found[id] for id in ids if id in found])),
+                'missing_ids': [id for id in ids if id not in found]
+            }
+        )
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to get properties', 500)
+
+
 @properties_bp.route('/<int:property_id>', methods=['GET'])
 def get_property(property_id):
     """
     Get a specific property by ID (public endpoint).
+    
+    Accepts the same fields parameter as the listing endpoint and honors
+    If-None-Match/If-Modified-Since with 304 Not Modified.
     """
     try:
         property = Property.query.get(property_id)
@@ -128,16 +587,7 @@ def get_property(property_id):
             )
         
         # Check if admin is requesting or if property is verified
-        is_admin = False
-        try:
-            from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-            verify_jwt_in_request(optional=True)
-            current_user_id = get_jwt_identity()
-            if current_user_id:
-                current_user = User.query.get(current_user_id)
-                is_admin = current_user and current_user.is_admin
-        except:
-            pass
+        is_admin = _is_admin_request()
         
         # If not admin and property not verified, deny access
         if not is_admin and not property.is_verified:
@@ -147,15 +597,77 @@ def get_property(property_id):
                 404
             )
         
-        return success_response(
+        _, schema = resolve_property_fields(request.args.get('fields'), many=False)
+        
+        # Any change to the row bumps updated_at. Weak, like the listing
+        # validators, so 200 and 304 carry the same ETag whether or not the
+        # body is compressed
+        etag = property_etag(property, schema)
+        not_modified = not_modified_response(etag, property.updated_at, weak=True)
+        if not_modified:
+            return not_modified
+        
+        return with_validators(success_response(
             message='Property retrieved successfully',
-            data=property_schema.dump(property)
-        )
+            data=schema.dump(property)
+        ), etag, property.updated_at, weak=True)
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Failed to get property', 500)
 
 
+@properties_bp.route('/<int:property_id>/similar', methods=['GET'])
+@cached_response
+def get_similar_properties(property_id):
+    """
+    Get the public properties most similar to a property (public endpoint).
+    
+    Similarity compares price, bedrooms, bathrooms, square_feet, year_built,
+    property_type and location across the whole public catalog at once.
+    
+    Query Parameters:
+    - limit: Number of properties (default: 10, max: 50)
+    - fields: Same as the listing endpoint
+    """
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        if not 1 <= limit <= MAX_SIMILAR_PROPERTIES:
+            raise InvalidQueryParameterError(f'limit must be between 1 and {MAX_SIMILAR_PROPERTIES}')
+        
+        property = Property.query.get(property_id)
+        if not property or (not property.is_verified and not _is_admin_request()):
+            return handle_error(
+                Exception('Property not found'),
+                'Property not found',
+                404
+            )
+        
+        similar = get_similarity_index().similar(property, limit)
+        
+        columns, schema = resolve_property_fields(request.args.get('fields'))
+        # Re-check visibility in case another worker changed a row since the arrays synced
+        ids = [similar_id for similar_id, _ in similar]
+        query = Property.query.filter(Property.id.in_(ids)).filter_by(status='available', is_verified=True)
+        properties = {row.id: row for row in apply_property_fields(query, columns, schema)}
+        
+        visible = [(properties[similar_id], score) for similar_id, score in similar if similar_id in properties]
+        results = serialize(schema, [row for row, _ in visible])
+        for result, (_, score) in zip(results, visible):
+            result['similarity'] = score
+        
+        return success_response(
+            message='Similar properties retrieved successfully',
+            data={'property_id': property_id, 'properties': apply_list_layout(results)}
+        )
+        
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to get similar properties', 500)
+
+
 @properties_bp.route('', methods=['POST'])
 @validate_json(property_create_schema)
 def create_property(validated_data):
@@ -193,6 +705,8 @@ def create_property(validated_data):
             property_type=validated_data['property_type'],
             location=validated_data['location'],
             address=validated_data.get('address'),
+            latitude=validated_data.get('latitude'),
+            longitude=validated_data.get('longitude'),
             price=validated_data['price'],
             bedrooms=validated_data.get('bedrooms'),
             bathrooms=validated_data.get('bathrooms'),
@@ -200,14 +714,15 @@ def create_property(validated_data):
             lot_size=validated_data.get('lot_size'),
             year_built=validated_data.get('year_built'),
             status=validated_data.get('status', 'available'),
-            features=json.dumps(validated_data.get('features', [])),
-            images=json.dumps(validated_data.get('images', [])),
+            features=validated_data.get('features', []),
+            images=validated_data.get('images', []),
             admin_id=current_user.id,
             is_verified=True  # Auto-verify admin-created properties
         )
         
         db.session.add(property)
         db.session.commit()
+        catalog_changed(property.id)
         
         return success_response(
             message='Property created successfully',
@@ -222,7 +737,7 @@ def create_property(validated_data):
 
 @properties_bp.route('/<int:property_id>', methods=['PUT'])
 @validate_json(property_update_schema)
-def update_property(property_id, validated_data):
+def update_property(validated_data, property_id):
     """
     Update a property (admin only).
     """
@@ -261,9 +776,7 @@ def update_property(property_id, validated_data):
         
         # Update property fields
         for field, value in validated_data.items():
-            if field in ['features', 'images'] and value is not None:
-                setattr(property, field, json.dumps(value))
-            elif value is not None:
+            if value is not None:
                 setattr(property, field, value)
         
         # Mark as unverified if content changed (except for admin updating verification)
@@ -271,6 +784,7 @@ def update_property(property_id, validated_data):
             property.is_verified = False
         
         db.session.commit()
+        catalog_changed(property.id)
         
         return success_response(
             message='Property updated successfully',
@@ -283,6 +797,7 @@ def update_property(property_id, validated_data):
 
 
 @properties_bp.route('/<int:property_id>', methods=['DELETE'])
+@admin_required
 def delete_property(property_id):
     """
     Delete a property (admin only). This removes it from public view immediately.
@@ -309,16 +824,13 @@ def delete_property(property_id):
         
         # Delete associated images from filesystem if any
         if property.images:
-            try:
-                images = json.loads(property.images)
-                for image_url in images:
-                    # Clean up image files (implement based on your storage)
-                    pass
-            except:
+            for image_url in property.images:
+                # Clean up image files (implement based on your storage)
                 pass
         
         db.session.delete(property)
         db.session.commit()
+        catalog_changed(property_id)
         
         return success_response(
             message='Property deleted successfully'
@@ -363,6 +875,7 @@ def verify_property(property_id):
         property.verification_notes = verification_notes
         
         db.session.commit()
+        catalog_changed(property.id)
         
         return success_response(
             message=f'Property {"verified" if is_verified else "unverified"} successfully',
@@ -403,20 +916,14 @@ def add_property_images(property_id):
         data = request.get_json()
         new_image_urls = data.get('image_urls', [])
         
-        # Get existing images
-        try:
-            existing_images = json.loads(property.images) if property.images else []
-        except:
-            existing_images = []
-        
-        # Add new images
-        all_images = existing_images + new_image_urls
-        property.images = json.dumps(all_images)
+        # Add new images (assign a new list so the JSON column is marked dirty)
+        property.images = (property.images or []) + new_image_urls
         
         # Mark as unverified when images change
         property.is_verified = False
         
         db.session.commit()
+        catalog_changed(property.id)
         
         return success_response(
             message='Images added to property successfully',
@@ -0,0 +1,210 @@
+"""
+Saved search routes: visitors subscribe to search criteria, and matching
+new listings are queued for notification.
+"""
+
+from datetime import datetime
+from flask import Blueprint, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import SavedSearch, SavedSearchMatch
+from app.percolator import compile_criteria, normalize_criteria
+from app.schemas import (
+    saved_search_schema, saved_searches_schema, saved_search_matches_schema, match_notified_schema
+)
+from app.serializers import serialize
+from app.utils import (
+    InvalidQueryParameterError, validate_json, success_response, handle_error, paginate_query, admin_required,
+    apply_list_layout
+)
+
+saved_searches_bp = Blueprint('saved_searches', __name__)
+
+
+@saved_searches_bp.route('', methods=['POST'])
+@validate_json(saved_search_schema)
+def create_saved_search(validated_data):
+    """
+    Save search criteria to be notified about matching new listings.
+    Can be saved by authenticated users or anonymous visitors.
+    
+    Expected JSON:
+    {
+        "email": "string",
+        "name": "string" (optional),
+        "criteria": {"location": "Karen", "max_price": "20000000", ...}
+    }
+    
+    criteria takes the filters of /api/properties/search (not paging or sort),
+    as strings or numbers; features may also be a list of names.
+    """
+    try:
+        criteria = normalize_criteria(validated_data['criteria'])
+        # Reject criteria the percolator could not evaluate
+        compile_criteria(criteria)
+        
+        current_user_id = None
+        try:
+            if verify_jwt_in_request(optional=True):
+                current_user_id = get_jwt_identity()
+        except Exception:
+            # Invalid token - save anonymously
+            pass
+        
+        saved_search = SavedSearch(
+            name=validated_data.get('name'),
+            email=validated_data['email'],
+            criteria=criteria,
+            user_id=current_user_id
+        )
+        db.session.add(saved_search)
+        db.session.commit()
+        
+        return success_response(
+            message='Search saved successfully',
+            data=saved_search_schema.dump(saved_search),
+            status_code=201
+        )
+    
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        db.session.rollback()
+        return handle_error(e, 'Failed to save search', 500)
+
+
+@saved_searches_bp.route('', methods=['GET'])
+@admin_required
+def get_saved_searches():
+    """
+    Get all saved searches (admin only).
+    
+    Query Parameters:
+    - page: Page number (default: 1)
+    - per_page: Items per page (default: 20, max: 100)
+    - email: Filter by subscriber email
+    """
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        email = request.args.get('email')
+        
+        query = SavedSearch.query
+        if email:
+            query = query.filter_by(email=email)
+        query = query.order_by(SavedSearch.created_at.desc())
+        
+        result = paginate_query(query, page, per_page)
+        
+        return success_response(
+            message='Saved searches retrieved successfully',
+            data={
+                'saved_searches': apply_list_layout(serialize(saved_searches_schema, result['items'])),
+                'pagination': result['pagination']
+            }
+        )
+    
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to retrieve saved searches', 500)
+
+
+@saved_searches_bp.route('/<int:saved_search_id>', methods=['DELETE'])
+@admin_required
+def delete_saved_search(saved_search_id):
+    """
+    Delete a saved search and its queued matches (admin only).
+    """
+    try:
+        saved_search = SavedSearch.query.get(saved_search_id)
+        
+        if not saved_search:
+            return handle_error(
+                Exception('Saved search not found'),
+                f'Saved search with ID {saved_search_id} not found',
+                404
+            )
+        
+        db.session.delete(saved_search)
+        db.session.commit()
+        
+        return success_response(
+            message='Saved search deleted successfully',
+            status_code=204
+        )
+    
+    except Exception as e:
+        db.session.rollback()
+        return handle_error(e, 'Failed to delete saved search', 500)
+
+
+@saved_searches_bp.route('/matches', methods=['GET'])
+@admin_required
+def get_matches():
+    """
+    Get queued saved search matches, oldest first (admin only).
+    
+    Query Parameters:
+    - page: Page number (default: 1)
+    - per_page: Items per page (default: 20, max: 100)
+    - pending: Only matches not yet notified (default: true)
+    """
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        pending = request.args.get('pending', 'true').lower() == 'true'
+        
+        # Property and saved search are serialized, so join them in
+        query = SavedSearchMatch.query.options(
+            joinedload(SavedSearchMatch.property),
+            joinedload(SavedSearchMatch.saved_search)
+        )
+        if pending:
+            query = query.filter(SavedSearchMatch.notified_at.is_(None))
+        query = query.order_by(SavedSearchMatch.id)
+        
+        result = paginate_query(query, page, per_page)
+        
+        return success_response(
+            message='Saved search matches retrieved successfully',
+            data={
+                'matches': apply_list_layout(serialize(saved_search_matches_schema, result['items'])),
+                'pagination': result['pagination']
+            }
+        )
+    
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
+    except Exception as e:
+        return handle_error(e, 'Failed to retrieve saved search matches', 500)
+
+
+@saved_searches_bp.route('/matches/notified', methods=['PUT'])
+@admin_required
+@validate_json(match_notified_schema)
+def mark_matches_notified(validated_data):
+    """
+    Mark queued matches as notified (admin only).
+    
+    Expected JSON:
+    {
+        "ids": [1, 2, 3]
+    }
+    """
+    try:
+        updated = SavedSearchMatch.query.filter(
+            SavedSearchMatch.id.in_(validated_data['ids']),
+            SavedSearchMatch.notified_at.is_(None)
+        ).update({'notified_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+        
+        return success_response(
+            message='Matches marked as notified',
+            data={'updated': updated}
+        )
+    
+    except Exception as e:
+        db.session.rollback()
+        return handle_error(e, 'Failed to update saved search matches', 500)
@@ -8,7 +8,11 @@ from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models import User
 from app.schemas import user_schema, users_schema, error_schema
-from app.utils import validate_json, success_response, handle_error, admin_required, paginate_query
+from app.serializers import serialize
+from app.utils import (
+    InvalidQueryParameterError, validate_json, success_response, handle_error, admin_required, paginate_query,
+    apply_list_layout
+)
 
 users_bp = Blueprint('users', __name__)
 
@@ -35,11 +39,13 @@ def get_users():
         return success_response(
             message='Users retrieved successfully',
             data={
-                'users': users_schema.dump(result['items']),
+                'users': apply_list_layout(serialize(users_schema, result['items'])),
                 'pagination': result['pagination']
             }
         )
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Failed to retrieve users', 500)
 
@@ -219,11 +225,13 @@ def search_users():
         return success_response(
             message='Users found successfully',
             data={
-                'users': users_schema.dump(result['items']),
+                'users': apply_list_layout(serialize(users_schema, result['items'])),
                 'pagination': result['pagination'],
                 'query': search_query
             }
         )
         
+    except InvalidQueryParameterError as e:
+        return handle_error(e, str(e), 400)
     except Exception as e:
         return handle_error(e, 'Failed to search users', 500)
\ No newline at end of file
@@ -28,6 +28,18 @@ class UserLoginSchema(Schema):
     password = fields.String(required=True, load_only=True)
 
 
+class AdminSummarySchema(Schema):
+    """Schema for the admin who listed a property."""
+    
+    id = fields.Integer(dump_only=True)
+    username = fields.String(dump_only=True)
+    name = fields.Method('get_name', dump_only=True)
+    
+    def get_name(self, obj):
+        """Return the admin's full name."""
+        return f"{obj.first_name or ''} {obj.last_name or ''}".strip()
+
+
 class PropertySchema(Schema):
     """Schema for Property model serialization/deserialization."""
     
@@ -37,6 +49,8 @@ class PropertySchema(Schema):
     property_type = fields.String(required=True, validate=OneOf(['house', 'apartment', 'condo', 'townhouse', 'land', 'commercial']))
     location = fields.String(required=True, validate=Length(min=1, max=200))
     address = fields.String(allow_none=True, validate=Length(max=300))
+    latitude = fields.Float(allow_none=True, validate=validate.Range(min=-90, max=90))
+    longitude = fields.Float(allow_none=True, validate=validate.Range(min=-180, max=180))
     price = fields.Decimal(required=True, places=2)
     bedrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
     bathrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
@@ -48,10 +62,29 @@ class PropertySchema(Schema):
     images = fields.List(fields.String(), load_default=[])
     agent_id = fields.Integer(allow_none=True)
     agent = fields.String(dump_only=True)
+    admin_id = fields.Integer(dump_only=True)
+    admin = fields.Nested(AdminSummarySchema, dump_only=True, allow_none=True)
+    is_verified = fields.Boolean(dump_only=True)
+    verification_notes = fields.String(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
 
+class PropertyCardSchema(Schema):
+    """Compact Property projection for grid/card views."""
+    
+    id = fields.Integer(dump_only=True)
+    title = fields.String(dump_only=True)
+    price = fields.Decimal(dump_only=True, places=2)
+    location = fields.String(dump_only=True)
+    bedrooms = fields.Integer(dump_only=True)
+    image = fields.Method('get_first_image', dump_only=True)
+    
+    def get_first_image(self, obj):
+        """Return the first image URL of the property, if any."""
+        return obj.images[0] if obj.images else None
+
+
 class PropertyCreateSchema(Schema):
     """Schema for creating new properties."""
     
@@ -60,6 +93,8 @@ class PropertyCreateSchema(Schema):
     property_type = fields.String(required=True, validate=OneOf(['house', 'apartment', 'condo', 'townhouse', 'land', 'commercial']))
     location = fields.String(required=True, validate=Length(min=1, max=200))
     address = fields.String(allow_none=True, validate=Length(max=300))
+    latitude = fields.Float(allow_none=True, validate=validate.Range(min=-90, max=90))
+    longitude = fields.Float(allow_none=True, validate=validate.Range(min=-180, max=180))
     price = fields.Decimal(required=True, places=2)
     bedrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
     bathrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
@@ -77,6 +112,8 @@ class PropertyUpdateSchema(Schema):
     property_type = fields.String(validate=OneOf(['house', 'apartment', 'condo', 'townhouse', 'land', 'commercial']))
     location = fields.String(validate=Length(min=1, max=200))
     address = fields.String(allow_none=True, validate=Length(max=300))
+    latitude = fields.Float(allow_none=True, validate=validate.Range(min=-90, max=90))
+    longitude = fields.Float(allow_none=True, validate=validate.Range(min=-180, max=180))
     price = fields.Decimal(places=2)
     bedrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
     bathrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
@@ -90,12 +127,18 @@ class PropertyUpdateSchema(Schema):
 class PropertySearchSchema(Schema):
     """Schema for property search parameters."""
     
+    q = fields.String(allow_none=True)
     location = fields.String(allow_none=True)
     property_type = fields.String(allow_none=True, validate=OneOf(['house', 'apartment', 'condo', 'townhouse', 'land', 'commercial']))
     min_price = fields.Decimal(allow_none=True, places=2, validate=validate.Range(min=0))
     max_price = fields.Decimal(allow_none=True, places=2, validate=validate.Range(min=0))
     bedrooms = fields.Integer(allow_none=True, validate=validate.Range(min=0))
+    min_square_feet = fields.Integer(allow_none=True, validate=validate.Range(min=0))
+    max_square_feet = fields.Integer(allow_none=True, validate=validate.Range(min=0))
     status = fields.String(allow_none=True, validate=OneOf(['available', 'sold', 'pending']))
+    features = fields.String(allow_none=True)  # Comma-separated feature names
+    features_match = fields.String(allow_none=True, validate=OneOf(['all', 'any']))
+    fuzzy = fields.Boolean(allow_none=True)
     page = fields.Integer(load_default=1, validate=validate.Range(min=1))
     per_page = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
 
@@ -110,10 +153,59 @@ class ContactMessageSchema(Schema):
     subject = fields.String(allow_none=True, validate=Length(max=200))
     message = fields.String(required=True, validate=Length(min=1))
     property_id = fields.Integer(allow_none=True)
-    property_title = fields.String(dump_only=True)
+    property_title = fields.Method('get_property_title', dump_only=True)
     user_id = fields.Integer(dump_only=True)
+    user_name = fields.Method('get_user_name', dump_only=True)
     status = fields.String(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
+    
+    def get_property_title(self, obj):
+        """Return the title of the property the message is about."""
+        return obj.property.title if obj.property else None
+    
+    def get_user_name(self, obj):
+        """Return the full name of the user who sent the message."""
+        if not obj.user:
+            return None
+        return f"{obj.user.first_name or ''} {obj.user.last_name or ''}".strip()
+
+
+class SavedSearchSchema(Schema):
+    """Schema for SavedSearch model serialization/deserialization."""
+    
+    id = fields.Integer(dump_only=True)
+    name = fields.String(allow_none=True, validate=Length(max=100))
+    email = fields.Email(required=True, validate=Email())
+    criteria = fields.Dict(keys=fields.String(), values=fields.Raw(), required=True)
+    user_id = fields.Integer(dump_only=True)
+    is_active = fields.Boolean(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+
+
+class SavedSearchMatchSchema(Schema):
+    """Schema for queued saved search matches."""
+    
+    id = fields.Integer(dump_only=True)
+    saved_search_id = fields.Integer(dump_only=True)
+    property_id = fields.Integer(dump_only=True)
+    property_title = fields.Method('get_property_title', dump_only=True)
+    email = fields.Method('get_email', dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    notified_at = fields.DateTime(dump_only=True)
+    
+    def get_property_title(self, obj):
+        """Return the title of the matched property."""
+        return obj.property.title if obj.property else None
+    
+    def get_email(self, obj):
+        """Return the address to notify."""
+        return obj.saved_search.email if obj.saved_search else None
+
+
+class MatchNotifiedSchema(Schema):
+    """Schema for marking queued matches as notified."""
+    
+    ids = fields.List(fields.Integer(), required=True, validate=Length(min=1, max=500))
 
 
 class FileUploadSchema(Schema):
@@ -166,6 +258,10 @@ property_update_schema = PropertyUpdateSchema()
 property_search_schema = PropertySearchSchema()
 contact_message_schema = ContactMessageSchema()
 contact_messages_schema = ContactMessageSchema(many=True)
+saved_search_schema = SavedSearchSchema()
+saved_searches_schema = SavedSearchSchema(many=True)
+saved_search_matches_schema = SavedSearchMatchSchema(many=True)
+match_notified_schema = MatchNotifiedSchema()
 file_upload_schema = FileUploadSchema()
 error_schema = ErrorSchema()
 success_schema = SuccessSchema()
@@ -0,0 +1,478 @@
+"""
+In-process search engine over the public property catalog.
+
+Each worker keeps the verified, available properties in memory: a token
+inverted index over title, description and location for ranked q= search,
+sorted (value, id) arrays for the numeric range filters, and lookup tables
+for location, type and features. The index is built by the first search,
+not at startup. Writes made through the property routes are applied
+incrementally; anything else (another worker, a script, a bulk update) makes
+the index stale, and stale searches fall back to SQL until it is rebuilt.
+"""
+
+import math
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, namedtuple
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from app import db
+from app.features import FEATURE_MATCH_MODES, feature_key, parse_feature_keys
+from app.fulltext import SQLITE_BM25_WEIGHTS, search_terms
+from app.models import Property
+from app.worker_index import WorkerIndex
+
+# Query parameters the engine can answer; anything else goes to SQL
+SUPPORTED_PARAMS = {
+    'q', 'location', 'property_type', 'min_price', 'max_price', 'bedrooms',
+    'min_square_feet', 'max_square_feet', 'features', 'features_match', 'status', 'sort',
+    'page', 'per_page', 'fields'
+}
+
+# (key, descending) per ?sort= order, matching the SQL orders in routes/properties.py
+SORT_KEYS = {
+    'newest': (lambda document: (document.created_at, document.id), True),
+    'price_asc': (lambda document: (document.price, document.id), False),
+    'price_desc': (lambda document: (document.price, document.id), True),
+    'square_feet_asc': (
+        lambda document: (document.square_feet is None, document.square_feet or 0, document.id), False
+    ),
+    'square_feet_desc': (
+        lambda document: (document.square_feet is not None, document.square_feet or 0, document.id), True
+    )
+}
+
+# Same per-field weights as the SQL full-text ranking
+FIELD_WEIGHTS = dict(zip(('title', 'description', 'location'), SQLITE_BM25_WEIGHTS))
+
+# Numeric columns kept as sorted (value, id) arrays
+RANGE_COLUMNS = ('price', 'bedrooms', 'square_feet')
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+CatalogDocument = namedtuple('CatalogDocument', [
+    'id', 'location', 'location_name', 'property_type', 'price', 'bedrooms', 'square_feet',
+    'features', 'created_at', 'updated_at', 'terms', 'length'
+])
+
+
+def _document(row):
+    """Build the indexed form of a property row."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in search_terms(getattr(row, field)):
+            terms[token] += weight
+    
+    return CatalogDocument(
+        id=row.id,
+        location=' '.join((row.location or '').lower().split()),
+        location_name=(row.location or '').strip(),
+        property_type=row.property_type,
+        price=row.price,
+        bedrooms=row.bedrooms,
+        square_feet=row.square_feet,
+        features=frozenset(filter(None, (feature_key(name) for name in row.features or []))),
+        created_at=row.created_at or datetime.min,
+        updated_at=row.updated_at,
+        terms=dict(terms),
+        length=sum(terms.values())
+    )
+
+
+def _word_starts(text):
+    """Return the offsets at which words begin in text."""
+    return [match.start() for match in re.finditer(r'\w+', text)]
+
+
+class CatalogIndex:
+    """
+    Inverted index and sorted numeric arrays over catalog documents.
+    
+    add() and remove() modify the index in place and are only used while
+    building it; once an index is served, writes go through replaced().
+    """
+    
+    def __init__(self):
+        self.documents = {}
+        self.postings = {}
+        self.vocabulary = []
+        self.total_length = 0
+        self.ranges = {column: [] for column in RANGE_COLUMNS}
+        self.locations = {}
+        self.location_names = {}
+        self.location_prefixes = []
+        self.types = {}
+        self.features = {}
+    
+    def add(self, document):
+        """Add a document, replacing any previous version with the same id."""
+        self.remove(document.id)
+        self.documents[document.id] = document
+        self.total_length += document.length
+        
+        for token, frequency in document.terms.items():
+            if token not in self.postings:
+                self.postings[token] = {}
+                insort(self.vocabulary, token)
+            self.postings[token][document.id] = frequency
+        
+        for column in RANGE_COLUMNS:
+            value = getattr(document, column)
+            if value is not None:
+                insort(self.ranges[column], (value, document.id))
+        
+        if document.location not in self.locations:
+            self.location_names[document.location] = document.location_name
+            for start in _word_starts(document.location):
+                insort(self.location_prefixes, (document.location[start:], document.location))
+        self.locations.setdefault(document.location, set()).add(document.id)
+        self.types.setdefault(document.property_type, set()).add(document.id)
+        for key in document.features:
+            self.features.setdefault(key, set()).add(document.id)
+    
+    def remove(self, property_id):
+        """Remove a document if it is indexed."""
+        document = self.documents.pop(property_id, None)
+        if document is None:
+            return
+        self.total_length -= document.length
+        
+        for token in document.terms:
+            postings = self.postings[token]
+            del postings[property_id]
+            if not postings:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+        
+        for column in RANGE_COLUMNS:
+            value = getattr(document, column)
+            if value is not None:
+                values = self.ranges[column]
+                del values[bisect_left(values, (value, property_id))]
+        
+        self.types[document.property_type].discard(property_id)
+        if not self.types[document.property_type]:
+            del self.types[document.property_type]
+        
+        for key in document.features:
+            self.features[key].discard(property_id)
+            if not self.features[key]:
+                del self.features[key]
+        
+        self.locations[document.location].discard(property_id)
+        if not self.locations[document.location]:
+            del self.locations[document.location]
+            del self.location_names[document.location]
+            for start in _word_starts(document.location):
+                entry = (document.location[start:], document.location)
+                del self.location_prefixes[bisect_left(self.location_prefixes, entry)]
+    
+    def range_ids(self, column, low=None, high=None):
+        """Return ids whose column value lies within [low, high]."""
+        values = self.ranges[column]
+        start = 0 if low is None else bisect_left(values, (low,))
+        end = len(values) if high is None else bisect_right(values, (high, math.inf))
+        return {property_id for _, property_id in values[start:end]}
+    
+    def feature_ids(self, keys, match='all'):
+        """Return ids having every (match='all') or any (match='any') of the feature keys."""
+        sets = [self.features.get(key, set()) for key in keys]
+        if match == 'any':
+            return set().union(*sets)
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+    
+    def location_ids(self, needle):
+        """Return ids whose location contains needle (case-insensitive)."""
+        needle = needle.lower()
+        ids = set()
+        for location, location_ids in self.locations.items():
+            if needle in location:
+                ids |= location_ids
+        return ids
+    
+    def suggest_locations(self, prefix, limit):
+        """
+        Return locations with a word starting with prefix, most listings first.
+        
+        Args:
+            prefix (str): Lowercase text typed so far
+            limit (int): Maximum number of suggestions
+        
+        Returns:
+            list: Dicts with the location and its listing count
+        """
+        start = bisect_left(self.location_prefixes, (prefix,))
+        end = bisect_left(self.location_prefixes, (prefix + '\uffff',))
+        matches = {location for _, location in self.location_prefixes[start:end]}
+        
+        ranked = sorted(matches, key=lambda location: (-len(self.locations[location]), location))
+        return [
+            {'location': self.location_names[location], 'count': len(self.locations[location])}
+            for location in ranked[:limit]
+        ]
+    
+    def expand(self, term):
+        """Return the indexed tokens starting with term."""
+        start = bisect_left(self.vocabulary, term)
+        end = bisect_left(self.vocabulary, term + '\uffff')
+        return self.vocabulary[start:end]
+    
+    def score(self, terms, candidates):
+        """
+        Rank candidates that match every term (as a prefix) with BM25.
+        
+        Args:
+            terms (list): Lowercase query tokens
+            candidates (set): Ids allowed by the other filters
+        
+        Returns:
+            dict: Score per matching id
+        """
+        count = len(self.documents)
+        average_length = self.total_length / count if count else 0
+        scores = dict.fromkeys(candidates, 0.0)
+        
+        for term in terms:
+            matched = {}
+            for token in self.expand(term):
+                postings = self.postings[token]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for property_id, frequency in postings.items():
+                    if property_id not in scores:
+                        continue
+                    length = self.documents[property_id].length
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    matched[property_id] = matched.get(property_id, 0.0) + (
+                        idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    )
+            scores = {property_id: scores[property_id] + score for property_id, score in matched.items()}
+        
+        return scores
+    
+    def replaced(self, property_id, document=None):
+        """
+        Return a copy of the index with one document removed or replaced.
+        
+        The index itself is left untouched, so searches holding it keep a
+        consistent view. Top-level containers are copied shallowly, and only
+        the inner postings and id sets the change touches are copied before
+        being modified.
+        
+        Args:
+            property_id (int): ID of the document to remove
+            document (CatalogDocument): Document to add in its place, if any
+        
+        Returns:
+            CatalogIndex: The new index (self if nothing changes)
+        """
+        if property_id not in self.documents and document is None:
+            return self
+        
+        index = CatalogIndex.__new__(CatalogIndex)
+        index.documents = dict(self.documents)
+        index.postings = dict(self.postings)
+        index.vocabulary = list(self.vocabulary)
+        index.total_length = self.total_length
+        index.ranges = {column: list(values) for column, values in self.ranges.items()}
+        index.locations = dict(self.locations)
+        index.location_names = dict(self.location_names)
+        index.location_prefixes = list(self.location_prefixes)
+        index.types = dict(self.types)
+        index.features = dict(self.features)
+        
+        for changed in (self.documents.get(property_id), document):
+            if changed is None:
+                continue
+            for token in changed.terms:
+                if token in index.postings:
+                    index.postings[token] = dict(index.postings[token])
+            for ids, key in ((index.locations, changed.location), (index.types, changed.property_type)):
+                if key in ids:
+                    ids[key] = set(ids[key])
+            for key in changed.features:
+                if key in index.features:
+                    index.features[key] = set(index.features[key])
+        
+        index.remove(property_id)
+        if document is not None:
+            index.add(document)
+        return index
+
+
+class CatalogSearchEngine(WorkerIndex):
+    """Per-worker search engine answering public property searches from memory."""
+    
+    extension = 'search_engine'
+    max_age_setting = 'SEARCH_ENGINE_MAX_AGE'
+    
+    # Stale results could disagree with SQL; searches fall back to it instead
+    serve_stale = False
+    
+    def __init__(self, max_age=300):
+        super().__init__(max_age)
+        self._index = None
+    
+    def _build(self):
+        """Load the public catalog from the database into a fresh index."""
+        rows = db.session.execute(
+            db.select(
+                Property.id, Property.title, Property.description, Property.location,
+                Property.property_type, Property.price, Property.bedrooms,
+                Property.square_feet, Property.features, Property.created_at, Property.updated_at
+            ).where(Property.status == 'available', Property.is_verified.is_(True))
+        )
+        
+        index = CatalogIndex()
+        for row in rows:
+            index.add(_document(row))
+        return index
+    
+    def _install(self, data):
+        """Swap in the index built by _build() (caller holds the lock)."""
+        self._index = data
+    
+    def _apply(self, property_id, property):
+        """Reindex or remove one property (caller holds the lock)."""
+        document = None
+        if property is not None and property.status == 'available' and property.is_verified:
+            document = _document(property)
+        # Searches read self._index without the lock, so it is replaced, never modified
+        self._index = self._index.replaced(property_id, document)
+    
+    def suggest_locations(self, prefix, limit=10):
+        """
+        Suggest public catalog locations for autocomplete.
+        
+        Args:
+            prefix (str): Text typed so far
+            limit (int): Maximum number of suggestions
+        
+        Returns:
+            list or None: Suggestions, or None if the index cannot be used
+        """
+        if not self._ensure_fresh():
+            return None
+        
+        return self._index.suggest_locations(' '.join(prefix.lower().split()), limit)
+    
+    def search(self, params, page=1, per_page=20, max_per_page=100):
+        """
+        Answer a search from the index.
+        
+        Filters mirror create_property_search_query() over verified properties.
+        Results follow sort when given, else BM25 relevance when q is given,
+        else newest first.
+        
+        Args:
+            params (dict): Search query parameters
+            page (int): Page number (1-based)
+            per_page (int): Items per page
+            max_per_page (int): Maximum items per page
+        
+        Returns:
+            dict or None: ids, last_modified and pagination for the page, or
+                None if the search must run in SQL
+        """
+        if not set(params) <= SUPPORTED_PARAMS or params.get('status', 'available') != 'available':
+            return None
+        if params.get('sort') and params['sort'] not in SORT_KEYS:
+            return None
+        
+        try:
+            low_price = Decimal(params['min_price']) if params.get('min_price') else None
+            high_price = Decimal(params['max_price']) if params.get('max_price') else None
+            bedrooms = int(params['bedrooms']) if params.get('bedrooms') else None
+            low_area = int(params['min_square_feet']) if params.get('min_square_feet') else None
+            high_area = int(params['max_square_feet']) if params.get('max_square_feet') else None
+        except (InvalidOperation, ValueError):
+            return None
+        
+        feature_keys = parse_feature_keys(params.get('features'))
+        feature_match = (params.get('features_match') or 'all').lower()
+        if feature_match not in FEATURE_MATCH_MODES:
+            return None
+        
+        location = params.get('location')
+        if location and ('%' in location or '_' in location):
+            # LIKE wildcards; let SQL interpret them
+            return None
+        
+        if not self._ensure_fresh():
+            return None
+        
+        # Indexes are never modified once served, so no lock is needed to read one
+        index = self._index
+        filters = []
+        if location:
+            filters.append(index.location_ids(location))
+        if params.get('property_type'):
+            filters.append(index.types.get(params['property_type'], set()))
+        if low_price is not None or high_price is not None:
+            filters.append(index.range_ids('price', low_price, high_price))
+        if bedrooms is not None:
+            filters.append(index.range_ids('bedrooms', bedrooms))
+        if low_area is not None or high_area is not None:
+            filters.append(index.range_ids('square_feet', low_area, high_area))
+        if feature_keys:
+            filters.append(index.feature_ids(feature_keys, feature_match))
+        
+        if filters:
+            filters.sort(key=len)
+            candidates = filters[0].intersection(*filters[1:])
+        else:
+            candidates = index.documents.keys()
+        
+        terms = search_terms(params.get('q'))
+        documents = index.documents
+        if terms:
+            scores = index.score(terms, candidates)
+            candidates = scores
+        
+        if terms and not params.get('sort'):
+            ordered = sorted(scores, key=lambda i: (scores[i], documents[i].created_at, i), reverse=True)
+        else:
+            key, descending = SORT_KEYS[params.get('sort') or 'newest']
+            ordered = sorted(candidates, key=lambda i: key(documents[i]), reverse=descending)
+        
+        updated = [documents[i].updated_at for i in ordered if documents[i].updated_at]
+        last_modified = max(updated) if updated else None
+        
+        page = max(1, page)
+        per_page = min(max(1, per_page), max_per_page)
+        total = len(ordered)
+        start = (page - 1) * per_page
+        
+        return {
+            'ids': ordered[start:start + per_page],
+            'last_modified': last_modified,
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': math.ceil(total / per_page),
+                'has_prev': page > 1,
+                'has_next': start + per_page < total,
+                'total_estimated': False
+            }
+        }
+
+
+def init_search_engine(app):
+    """
+    Create the application's search engine; it loads on the first search.
+    
+    Args:
+        app: Flask application instance
+    """
+    if app.config.get('SEARCH_ENGINE_ENABLED', True):
+        CatalogSearchEngine.init_app(app)
+
+
+def get_search_engine():
+    """Return the current application's search engine, or None if disabled."""
+    return current_app.extensions.get(CatalogSearchEngine.extension)
+
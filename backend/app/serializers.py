@@ -0,0 +1,210 @@
+"""
+Fast-path serialization for list responses.
+
+marshmallow dumps each row field by field through several layers of
+reflective calls, which dominates the time spent on a page of listings.
+serialize() produces the same output as schema.dump(), but from a plan
+compiled once per schema and model class: plain columns are read with one
+attrgetter call per row, and only the fields that need converting
+(decimals, dates, nested objects, methods) take a per-field step. Field
+types the plan does not know are serialized by marshmallow itself, so the
+output never drifts from the schema.
+
+dumps() encodes response data to JSON bytes with orjson, matching what
+Flask's JSON provider would produce. encode() picks JSON or MessagePack
+from the request's Accept header.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+import msgpack
+import orjson
+from flask import current_app, request
+from marshmallow import fields, missing
+
+# Fields whose column values are already what marshmallow would dump
+_PLAIN_FIELDS = (fields.Integer, fields.String, fields.Boolean)
+
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+_DUMPS_OPTIONS = (
+    orjson.OPT_SORT_KEYS  # Flask's provider sorts keys too
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME  # Dates use Flask's HTTP date format
+)
+
+
+def _value_converter(field):
+    """
+    Return a function converting a non-None attribute value as field would.
+    
+    Args:
+        field: marshmallow field instance
+    
+    Returns:
+        function: Converter, or None if the field has no fast path
+    """
+    if isinstance(field, fields.Decimal):
+        if field.as_string or field.places is None:
+            return None
+        places, rounding = field.places, field.rounding
+        # Flask encodes Decimal values as str()
+        return lambda value: str(Decimal(str(value)).quantize(places, rounding=rounding))
+    if isinstance(field, fields.DateTime) and field.format in (None, 'iso'):
+        return lambda value: value.isoformat()
+    if isinstance(field, fields.Float) and not field.as_string:
+        return float
+    if isinstance(field, fields.List) and isinstance(field.inner, _PLAIN_FIELDS):
+        return list
+    if isinstance(field, fields.Nested):
+        nested_schema = field.schema
+        if field.many:
+            return lambda value: serialize(nested_schema, value, many=True)
+        return lambda value: serialize(nested_schema, value, many=False)
+    return None
+
+
+@lru_cache(maxsize=256)
+def _compile(schema, model_class):
+    """
+    Build the serializer function for instances of model_class.
+    
+    Args:
+        schema: marshmallow Schema instance (its only/exclude options apply)
+        model_class (type): Class of the objects to serialize
+    
+    Returns:
+        function: Takes one object and returns the serialized dict
+    """
+    plain = []
+    converted = []
+    methods = []
+    optional = []
+    generic = []
+    for name, field in schema.dump_fields.items():
+        key = field.data_key or name
+        attribute = field.attribute or name
+        
+        if field.dump_default is not missing or '.' in attribute:
+            generic.append((key, name, field))
+        elif isinstance(field, fields.Method):
+            if field.serialize_method_name:
+                methods.append((key, getattr(schema, field.serialize_method_name)))
+        elif not hasattr(model_class, attribute):
+            # Not a mapped attribute; marshmallow omits it when missing
+            optional.append((key, attribute, name, field))
+        elif isinstance(field, _PLAIN_FIELDS):
+            plain.append((key, attribute))
+        else:
+            convert = _value_converter(field)
+            if convert is None:
+                generic.append((key, name, field))
+            else:
+                converted.append((key, attribute, convert))
+    
+    plain_keys = tuple(key for key, _ in plain)
+    if len(plain) > 1:
+        read_plain = attrgetter(*[attribute for _, attribute in plain])
+    elif plain:
+        single = attrgetter(plain[0][1])
+        read_plain = lambda obj: (single(obj),)
+    else:
+        read_plain = lambda obj: ()
+    
+    def serialize_one(obj):
+        row = dict(zip(plain_keys, read_plain(obj)))
+        for key, attribute, convert in converted:
+            value = getattr(obj, attribute)
+            row[key] = None if value is None else convert(value)
+        for key, method in methods:
+            row[key] = method(obj)
+        for key, attribute, name, field in optional:
+            value = getattr(obj, attribute, missing)
+            if value is not missing:
+                row[key] = field._serialize(value, name, obj)
+        for key, name, field in generic:
+            value = field.serialize(name, obj, accessor=schema.get_attribute)
+            if value is not missing:
+                row[key] = value
+        return row
+    
+    return serialize_one
+
+
+def serialize(schema, data, many=None):
+    """
+    Serialize objects with a compiled plan; same output as schema.dump(data).
+    
+    Args:
+        schema: marshmallow Schema instance
+        data: Object, or iterable of objects when many
+        many (bool): Whether data is a list; defaults to schema.many
+    
+    Returns:
+        dict or list: Serialized data
+    """
+    if many is None:
+        many = schema.many
+    if not many:
+        return _compile(schema, type(data))(data)
+    
+    rows = []
+    serialize_one = model_class = None
+    for obj in data:
+        if type(obj) is not model_class:
+            model_class = type(obj)
+            serialize_one = _compile(schema, model_class)
+        rows.append(serialize_one(obj))
+    return rows
+
+
+def dumps(data):
+    """
+    Encode response data as JSON bytes.
+    
+    Args:
+        data: JSON-serializable data; values orjson cannot encode natively
+            (dates, Decimal) go through Flask's JSON provider
+    
+    Returns:
+        bytes: Compact JSON
+    """
+    return orjson.dumps(data, default=current_app.json.default, option=_DUMPS_OPTIONS)
+
+
+def to_columns(rows):
+    """
+    Turn serialized rows into one array per field.
+    
+    Args:
+        rows (list): Serialized rows (dicts)
+    
+    Returns:
+        dict: Field name -> list of values, aligned by row position; a row
+            without a field has None at its position
+    """
+    names = dict.fromkeys(name for row in rows for name in row)
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+def response_format():
+    """Return 'msgpack' if the request prefers MessagePack to JSON, else 'json'."""
+    best = request.accept_mimetypes.best_match(('application/json',) + MSGPACK_MIMETYPES)
+    return 'msgpack' if best in MSGPACK_MIMETYPES else 'json'
+
+
+def encode(data):
+    """
+    Encode response data in the format the request accepts.
+    
+    Args:
+        data: Serializable data; dates and Decimal values are encoded as
+            Flask's JSON provider encodes them in both formats
+    
+    Returns:
+        tuple: (body bytes, mimetype)
+    """
+    if response_format() == 'msgpack':
+        return msgpack.packb(data, default=current_app.json.default), MSGPACK_MIMETYPES[0]
+    return dumps(data), current_app.json.mimetype
@@ -0,0 +1,238 @@
+"""
+"Similar homes" recommendations over the public property catalog.
+
+Each worker keeps the verified, available properties as NumPy arrays: a
+matrix of z-scored numeric features (price, bedrooms, bathrooms,
+square_feet, year_built) plus category codes for property_type and
+location. Similarity is the cosine between feature vectors in which type
+and location are one-hot blocks; since the dot product of two one-hot
+blocks is an equality test, the blocks are stored as codes and scored with
+a vectorized comparison instead of wide sparse columns. Scoring the whole
+catalog against one property is a single matrix-vector product.
+
+Writes made through the property routes patch single rows; anything else
+makes the arrays stale, and they are rebuilt on the next request.
+"""
+
+import math
+import numpy as np
+from flask import current_app
+from app import db
+from app.models import Property
+from app.worker_index import WorkerIndex
+
+NUMERIC_FEATURES = ('price', 'bedrooms', 'bathrooms', 'square_feet', 'year_built')
+
+# Skewed features compared on a log scale
+LOG_FEATURES = ('price', 'square_feet')
+
+# Weight of the one-hot blocks relative to one numeric feature
+TYPE_WEIGHT = 1.5
+LOCATION_WEIGHT = 1.0
+
+# z-scores are clipped so one outlier value cannot dominate a vector
+MAX_Z_SCORE = 3.0
+
+INITIAL_CAPACITY = 256
+
+
+def _raw_features(property):
+    """Return the numeric features of a property, NaN where missing."""
+    values = []
+    for name in NUMERIC_FEATURES:
+        value = getattr(property, name)
+        if value is None:
+            values.append(math.nan)
+        elif name in LOG_FEATURES:
+            values.append(math.log1p(max(float(value), 0.0)))
+        else:
+            values.append(float(value))
+    return values
+
+
+def _location_key(location):
+    """Normalize a location for the one-hot comparison."""
+    return ' '.join((location or '').lower().split())
+
+
+class SimilarityIndex(WorkerIndex):
+    """Per-worker feature arrays answering top-k similar property queries."""
+    
+    extension = 'similarity_index'
+    max_age_setting = 'SIMILARITY_INDEX_MAX_AGE'
+    
+    def __init__(self, max_age=300):
+        super().__init__(max_age)
+        self._reset(INITIAL_CAPACITY)
+    
+    def _reset(self, capacity):
+        """Allocate empty arrays for capacity rows."""
+        self._features = np.zeros((capacity, len(NUMERIC_FEATURES)), dtype=np.float32)
+        self._types = np.full(capacity, -1, dtype=np.int32)
+        self._locations = np.full(capacity, -1, dtype=np.int32)
+        self._norms = np.ones(capacity, dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._rows = {}
+        self._free = []
+        self._size = 0
+        self._type_codes = {}
+        self._location_codes = {}
+        self._mean = np.zeros(len(NUMERIC_FEATURES), dtype=np.float32)
+        self._std = np.ones(len(NUMERIC_FEATURES), dtype=np.float32)
+    
+    def _grow(self):
+        """Double the row capacity, keeping existing rows."""
+        capacity = len(self._ids) * 2
+        for name, fill in (('_features', 0), ('_types', -1), ('_locations', -1),
+                           ('_norms', 1), ('_ids', 0), ('_active', False)):
+            array = getattr(self, name)
+            grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+    
+    def _code(self, codes, value):
+        """Return the category code for value, assigning a new one if unseen."""
+        if not value:
+            return -1
+        return codes.setdefault(value, len(codes))
+    
+    def _vector(self, property):
+        """Return (numeric features, type code, location code, norm) for a property."""
+        raw = np.array(_raw_features(property), dtype=np.float32)
+        features = np.clip(np.nan_to_num((raw - self._mean) / self._std), -MAX_Z_SCORE, MAX_Z_SCORE)
+        type_code = self._type_codes.get(property.property_type, -1)
+        location_code = self._location_codes.get(_location_key(property.location), -1)
+        norm = math.sqrt(
+            float(features @ features)
+            + (TYPE_WEIGHT ** 2 if type_code >= 0 else 0)
+            + (LOCATION_WEIGHT ** 2 if location_code >= 0 else 0)
+        )
+        return features, type_code, location_code, norm or 1.0
+    
+    def _put(self, property):
+        """Insert or replace the row for a property (caller holds the lock)."""
+        self._code(self._type_codes, property.property_type)
+        self._code(self._location_codes, _location_key(property.location))
+        
+        row = self._rows.get(property.id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == len(self._ids):
+                    self._grow()
+                row = self._size
+                self._size += 1
+            self._rows[property.id] = row
+        
+        self._features[row], self._types[row], self._locations[row], self._norms[row] = self._vector(property)
+        self._ids[row] = property.id
+        self._active[row] = True
+    
+    def _drop(self, property_id):
+        """Remove the row for a property if present (caller holds the lock)."""
+        row = self._rows.pop(property_id, None)
+        if row is not None:
+            self._active[row] = False
+            self._free.append(row)
+    
+    def _build(self):
+        """Load the public catalog and compute its normalized feature arrays."""
+        rows = db.session.execute(
+            db.select(
+                Property.id, Property.property_type, Property.location,
+                *[getattr(Property, name) for name in NUMERIC_FEATURES]
+            ).where(Property.status == 'available', Property.is_verified.is_(True))
+        ).all()
+        
+        # Shaped explicitly so an empty catalog is still a (0, features) matrix
+        raw = np.array([_raw_features(row) for row in rows], dtype=np.float32)
+        raw = raw.reshape(len(rows), len(NUMERIC_FEATURES))
+        counts = np.sum(~np.isnan(raw), axis=0)
+        mean = np.where(counts > 0, np.nansum(raw, axis=0) / np.maximum(counts, 1), 0)
+        std = np.sqrt(np.nansum((raw - mean) ** 2, axis=0) / np.maximum(counts, 1))
+        std = np.where(std > 0, std, 1)
+        features = np.clip(np.nan_to_num((raw - mean) / std), -MAX_Z_SCORE, MAX_Z_SCORE)
+        
+        type_codes = {}
+        location_codes = {}
+        types = np.array([self._code(type_codes, row.property_type) for row in rows], dtype=np.int32)
+        locations = np.array(
+            [self._code(location_codes, _location_key(row.location)) for row in rows], dtype=np.int32
+        )
+        norms = np.sqrt(
+            np.einsum('ij,ij->i', features, features)
+            + (types >= 0) * TYPE_WEIGHT ** 2
+            + (locations >= 0) * LOCATION_WEIGHT ** 2
+        )
+        
+        norms = np.where(norms > 0, norms, 1)
+        return rows, features, types, locations, norms, type_codes, location_codes, mean, std
+    
+    def _install(self, data):
+        """Replace the arrays with those from _build() (caller holds the lock)."""
+        rows, features, types, locations, norms, type_codes, location_codes, mean, std = data
+        size = len(rows)
+        self._reset(max(INITIAL_CAPACITY, size))
+        self._features[:size] = features
+        self._types[:size] = types
+        self._locations[:size] = locations
+        self._norms[:size] = norms
+        self._ids[:size] = [row.id for row in rows]
+        self._active[:size] = True
+        self._rows = {row.id: index for index, row in enumerate(rows)}
+        self._size = size
+        self._type_codes = type_codes
+        self._location_codes = location_codes
+        self._mean = mean.astype(np.float32)
+        self._std = std.astype(np.float32)
+    
+    def _apply(self, property_id, property):
+        """Insert, replace or drop one property's row (caller holds the lock)."""
+        if property is not None and property.status == 'available' and property.is_verified:
+            self._put(property)
+        else:
+            self._drop(property_id)
+    
+    def similar(self, property, limit=10):
+        """
+        Find the public properties most similar to a property.
+        
+        Args:
+            property (Property): Property to compare against (need not be public)
+            limit (int): Maximum number of results
+        
+        Returns:
+            list: (property_id, similarity) pairs, most similar first
+        """
+        self._ensure_fresh()
+        
+        with self._lock:
+            size = self._size
+            features, type_code, location_code, norm = self._vector(property)
+            
+            scores = self._features[:size] @ features
+            if type_code >= 0:
+                scores += (self._types[:size] == type_code) * np.float32(TYPE_WEIGHT ** 2)
+            if location_code >= 0:
+                scores += (self._locations[:size] == location_code) * np.float32(LOCATION_WEIGHT ** 2)
+            scores /= self._norms[:size] * norm
+            
+            scores[~self._active[:size]] = -np.inf
+            row = self._rows.get(property.id)
+            if row is not None:
+                scores[row] = -np.inf
+            
+            count = min(limit, int(np.isfinite(scores).sum()))
+            if count <= 0:
+                return []
+            
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [(int(self._ids[index]), round(float(scores[index]), 4)) for index in top]
+
+
+def get_similarity_index():
+    """Return the current application's similarity index."""
+    return current_app.extensions[SimilarityIndex.extension]
@@ -0,0 +1,192 @@
+"""
+Price statistics for the pricing page and admin reports.
+
+One query loads price, square_feet, property_type and location for the
+matching verified properties into NumPy arrays. Every aggregate is then
+computed in vectorized form: rows are sorted by (group, value) once, so
+per-group percentiles are interpolated from index arithmetic on the group
+boundaries, and per-group histograms come from one histogram2d call.
+"""
+
+import numpy as np
+from app.cache import stats_cache, table_version
+from app.facets import normalize_facet_filters
+from app.models import Property
+from app.utils import InvalidQueryParameterError, create_property_search_query
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+DEFAULT_BINS = 10
+MAX_BINS = 50
+
+# Locations reported individually, most listings first
+MAX_LOCATION_GROUPS = 50
+
+
+def _grouped_summary(values, groups, group_count, edges):
+    """
+    Summarize values per group.
+    
+    Args:
+        values (ndarray): Values (float)
+        groups (ndarray): Group code of each value, 0..group_count-1
+        group_count (int): Number of groups
+        edges (ndarray): Histogram bin edges shared by all groups
+    
+    Returns:
+        dict: Arrays of count, min, max, mean and percentiles (one row per
+            group), and a group x bin histogram
+    """
+    order = np.lexsort((values, groups))
+    values, groups = values[order], groups[order]
+    
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    
+    # Empty groups have no rows to index; they keep NaN and are reported as null
+    percentiles = np.full((group_count, len(PERCENTILES)), np.nan)
+    minimum = np.full(group_count, np.nan)
+    maximum = np.full(group_count, np.nan)
+    if present.any():
+        first, size = starts[present], counts[present]
+        last = first + size - 1
+        # Linear interpolation between closest ranks, as numpy.percentile does
+        positions = first[:, None] + (size[:, None] - 1) * (np.array(PERCENTILES) / 100.0)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, last[:, None])
+        fraction = positions - lower
+        percentiles[present] = values[lower] * (1 - fraction) + values[upper] * fraction
+        minimum[present] = values[first]
+        maximum[present] = values[last]
+    
+    sums = np.bincount(groups, weights=values, minlength=group_count)
+    histogram, _, _ = np.histogram2d(groups, values, bins=[np.arange(group_count + 1), edges])
+    
+    return {
+        'present': present,
+        'count': counts,
+        'min': minimum,
+        'max': maximum,
+        'mean': sums / np.maximum(counts, 1),
+        'percentiles': percentiles,
+        'histogram': histogram.astype(np.int64)
+    }
+
+
+def _edges(values, bins):
+    """Return bins + 1 evenly spaced edges spanning values."""
+    if not len(values):
+        return np.linspace(0, 1, bins + 1)
+    low, high = float(values.min()), float(values.max())
+    if low == high:
+        high = low + 1
+    return np.linspace(low, high, bins + 1)
+
+
+def _describe(summary, index, edges):
+    """Build the JSON block for one group of a summary."""
+    if not summary['present'][index]:
+        return None
+    return {
+        'count': int(summary['count'][index]),
+        'min': round(float(summary['min'][index]), 2),
+        'max': round(float(summary['max'][index]), 2),
+        'mean': round(float(summary['mean'][index]), 2),
+        'median': round(float(summary['percentiles'][index][PERCENTILES.index(50)]), 2),
+        'percentiles': {
+            f'p{percentile}': round(float(value), 2)
+            for percentile, value in zip(PERCENTILES, summary['percentiles'][index])
+        },
+        'histogram': [
+            {'min': round(float(low), 2), 'max': round(float(high), 2), 'count': int(count)}
+            for low, high, count in zip(edges[:-1], edges[1:], summary['histogram'][index])
+        ]
+    }
+
+
+def _section(prices, price_per_sqft, sqft_rows, codes, names, bins):
+    """Describe price and price per square foot for each group code in names."""
+    price_edges = _edges(prices, bins)
+    ppsf_edges = _edges(price_per_sqft, bins)
+    price_summary = _grouped_summary(prices, codes, len(names), price_edges)
+    ppsf_summary = _grouped_summary(price_per_sqft, codes[sqft_rows], len(names), ppsf_edges)
+    return [
+        {
+            'value': name,
+            'price': _describe(price_summary, index, price_edges),
+            'price_per_square_foot': _describe(ppsf_summary, index, ppsf_edges)
+        }
+        for index, name in enumerate(names)
+    ]
+
+
+def property_stats(params):
+    """
+    Compute price statistics for the verified properties matching a search.
+    
+    Args:
+        params (dict): Search query parameters, as for /api/properties/search,
+            plus bins (histogram bins, default 10)
+    
+    Returns:
+        dict: Overall, per property_type and per location statistics
+    
+    Raises:
+        InvalidQueryParameterError: If bins is not an integer from 1 to MAX_BINS
+    """
+    try:
+        bins = int(params.get('bins') or DEFAULT_BINS)
+    except ValueError:
+        raise InvalidQueryParameterError('bins must be an integer')
+    if not 1 <= bins <= MAX_BINS:
+        raise InvalidQueryParameterError(f'bins must be between 1 and {MAX_BINS}')
+    
+    filters = normalize_facet_filters(params)
+    key = (table_version(Property.__tablename__), filters, bins)
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    query = create_property_search_query(dict(filters)).filter_by(is_verified=True)
+    rows = query.order_by(None).with_entities(
+        Property.price, Property.square_feet, Property.property_type, Property.location
+    ).all()
+    
+    count = len(rows)
+    prices = np.fromiter((float(row[0]) for row in rows), dtype=np.float64, count=count)
+    square_feet = np.fromiter(
+        (row[1] if row[1] else np.nan for row in rows), dtype=np.float64, count=count
+    )
+    sqft_rows = ~np.isnan(square_feet) & (square_feet > 0)
+    price_per_sqft = prices[sqft_rows] / square_feet[sqft_rows]
+    
+    type_names, type_codes = np.unique(np.array([row[2] for row in rows], dtype=str), return_inverse=True)
+    location_names, location_codes = np.unique(
+        np.array([' '.join((row[3] or '').split()) for row in rows], dtype=str), return_inverse=True
+    )
+    type_codes, location_codes = type_codes.ravel(), location_codes.ravel()
+    
+    # Keep the busiest locations; the rest only count towards the totals
+    top_locations = np.argsort(-np.bincount(location_codes, minlength=len(location_names)),
+                               kind='stable')[:MAX_LOCATION_GROUPS]
+    remap = np.full(len(location_names), -1)
+    remap[top_locations] = np.arange(len(top_locations))
+    location_codes = remap[location_codes]
+    kept = location_codes >= 0
+    
+    overall = _section(prices, price_per_sqft, sqft_rows, np.zeros(count, dtype=np.int64), [None], bins)[0]
+    overall.pop('value')
+    
+    stats = {
+        'total': count,
+        'overall': overall,
+        'property_type': _section(prices, price_per_sqft, sqft_rows, type_codes, type_names.tolist(), bins),
+        'location': _section(
+            prices[kept], price_per_sqft[kept[sqft_rows]], sqft_rows[kept],
+            location_codes[kept], location_names[top_locations].tolist(), bins
+        )
+    }
+    
+    stats_cache.set(key, stats)
+    return stats
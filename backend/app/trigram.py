@@ -0,0 +1,274 @@
+"""
+Typo-tolerant (fuzzy) matching on property locations and titles.
+
+Text is compared word by word using trigram similarity: the share of
+three-letter sequences two words have in common, so "Kilimni" still
+matches "Kilimani". PostgreSQL answers this with pg_trgm and GIN indexes.
+On SQLite each worker keeps a trigram posting index over the distinct
+words of the location and title of every verified property (unverified
+listings are not fuzzy-searchable). A query looks up the vocabulary words
+sharing trigrams with each typed word, never every row, and then maps the
+close words to properties. Other databases fall back to ILIKE matching.
+"""
+
+import re
+from collections import Counter
+from flask import current_app, g
+from sqlalchemy import case, false, literal_column, or_, text
+from app import db
+from app.models import Property
+from app.worker_index import WorkerIndex
+
+# Fields a fuzzy match can search
+FUZZY_FIELDS = ('location', 'title')
+
+# Minimum word similarity (0-1) for a fuzzy match
+DEFAULT_THRESHOLD = 0.4
+
+# Most matches ranked per fuzzy search on SQLite
+MAX_FUZZY_MATCHES = 500
+
+POSTGRES_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_properties_location_trgm ON properties "
+    "USING GIN (lower(location) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_properties_title_trgm ON properties "
+    "USING GIN (lower(title) gin_trgm_ops)"
+]
+
+
+def words(value):
+    """Split text into lowercase alphanumeric words."""
+    return re.findall(r'[^\W_]+', (value or '').lower())
+
+
+def trigrams(word):
+    """Return the trigrams of a word, padded like pg_trgm (two spaces before, one after)."""
+    padded = f'  {word} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def word_similarity(left, right):
+    """Return the trigram similarity (Jaccard index) of two words."""
+    left, right = trigrams(left), trigrams(right)
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def fuzzy_matches(search_text, values, threshold=DEFAULT_THRESHOLD):
+    """
+    Check one property's field values against fuzzy search text.
+    
+    Args:
+        search_text (str): Text typed by the user
+        values (list): Field values of the property
+        threshold (float): Minimum word similarity
+    
+    Returns:
+        bool: True if every word of search_text is close to some word in values
+    """
+    candidates = {word for value in values for word in words(value)}
+    return all(
+        any(word_similarity(query_word, word) >= threshold for word in candidates)
+        for query_word in words(search_text)
+    )
+
+
+class TrigramIndex(WorkerIndex):
+    """Trigram postings over the words of each fuzzy field, for verified properties."""
+    
+    extension = 'trigram_index'
+    max_age_setting = 'TRIGRAM_INDEX_MAX_AGE'
+    
+    def __init__(self, max_age=300):
+        super().__init__(max_age)
+        self._fields = None
+        self._statuses = None
+    
+    @staticmethod
+    def _empty_fields():
+        """Return per-field (word -> ids, trigram -> words, id -> words) maps."""
+        return {field: ({}, {}, {}) for field in FUZZY_FIELDS}
+    
+    @staticmethod
+    def _add(fields, property_id, values):
+        """Index a property's field values (caller holds the lock)."""
+        for field in FUZZY_FIELDS:
+            word_ids, gram_words, property_words = fields[field]
+            property_words[property_id] = set(words(values[field]))
+            for word in property_words[property_id]:
+                if word not in word_ids:
+                    word_ids[word] = set()
+                    for gram in trigrams(word):
+                        gram_words.setdefault(gram, set()).add(word)
+                word_ids[word].add(property_id)
+    
+    @staticmethod
+    def _remove(fields, property_id):
+        """Remove a property from the index (caller holds the lock)."""
+        for field in FUZZY_FIELDS:
+            word_ids, gram_words, property_words = fields[field]
+            for word in property_words.pop(property_id, ()):
+                word_ids[word].discard(property_id)
+                if not word_ids[word]:
+                    del word_ids[word]
+                    for gram in trigrams(word):
+                        gram_words[gram].discard(word)
+                        if not gram_words[gram]:
+                            del gram_words[gram]
+    
+    def _build(self):
+        """Index the locations and titles of every verified property."""
+        fields = self._empty_fields()
+        statuses = {}
+        rows = db.session.execute(
+            db.select(Property.id, Property.location, Property.title, Property.status)
+            .where(Property.is_verified.is_(True))
+        )
+        for property_id, location, title, status in rows:
+            self._add(fields, property_id, {'location': location, 'title': title})
+            statuses[property_id] = status
+        return fields, statuses
+    
+    def _install(self, data):
+        """Replace the postings with those from _build() (caller holds the lock)."""
+        self._fields, self._statuses = data
+    
+    def _apply(self, property_id, property):
+        """Reindex or remove one property (caller holds the lock)."""
+        self._remove(self._fields, property_id)
+        self._statuses.pop(property_id, None)
+        if property is not None and property.is_verified:
+            self._add(self._fields, property_id, {'location': property.location, 'title': property.title})
+            self._statuses[property_id] = property.status
+    
+    def match(self, search_text, fields=FUZZY_FIELDS, threshold=DEFAULT_THRESHOLD, limit=MAX_FUZZY_MATCHES,
+              status=None):
+        """
+        Score verified properties whose words are close to every word of search_text.
+        
+        Args:
+            search_text (str): Text typed by the user
+            fields (tuple): Fields to search
+            threshold (float): Minimum word similarity
+            limit (int): Maximum number of properties returned
+            status (str): Only properties with this status, or None for any
+        
+        Returns:
+            tuple: (score (mean best word similarity) per property id, best
+                first; True if more than limit properties matched)
+        """
+        query_words = words(search_text)
+        if not query_words:
+            return {}, False
+        
+        self._ensure_fresh()
+        
+        scores = None
+        with self._lock:
+            for query_word in query_words:
+                query_grams = trigrams(query_word)
+                best = {}
+                for field in fields:
+                    word_ids, gram_words, _ = self._fields[field]
+                    # Only vocabulary words sharing a trigram are considered
+                    shared = Counter()
+                    for gram in query_grams:
+                        shared.update(gram_words.get(gram, ()))
+                    for word, count in shared.items():
+                        score = count / (len(query_grams) + len(trigrams(word)) - count)
+                        if score < threshold:
+                            continue
+                        for property_id in word_ids[word]:
+                            if score > best.get(property_id, 0.0):
+                                best[property_id] = score
+                
+                # Every typed word must match
+                if scores is None:
+                    scores = best
+                else:
+                    scores = {property_id: scores[property_id] + score
+                              for property_id, score in best.items() if property_id in scores}
+                if not scores:
+                    return {}, False
+            
+            # Visibility is applied before the cap, so hidden rows cannot crowd out visible ones
+            if status:
+                scores = {property_id: score for property_id, score in scores.items()
+                          if self._statuses.get(property_id) == status}
+        
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        scores_by_id = {property_id: round(score / len(query_words), 4) for property_id, score in ranked}
+        return scores_by_id, len(scores) > limit
+
+
+def ensure_trigram_index():
+    """Create the PostgreSQL trigram indexes if they are missing."""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    try:
+        db.session.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        for ddl in POSTGRES_INDEXES:
+            db.session.execute(text(ddl))
+        db.session.commit()
+    except Exception as e:
+        # Creating the extension needs privileges the app user may not have
+        db.session.rollback()
+        current_app.logger.warning(f'Trigram indexes not created: {e}')
+
+
+def apply_fuzzy_search(query, search_text, fields=FUZZY_FIELDS, status=None):
+    """
+    Filter a Property query to fuzzy matches and order by similarity.
+    
+    Every word of search_text must be similar to a word in one of the fields.
+    On SQLite only the MAX_FUZZY_MATCHES best verified matches are kept; when
+    more matched, g.fuzzy_matches_capped is set so the total can be reported
+    as a lower bound.
+    
+    Args:
+        query: Property query object
+        search_text (str): Text typed by the user
+        fields (tuple): Fields to search, from FUZZY_FIELDS
+        status (str): Status the query filters on, or None for any
+    
+    Returns:
+        SQLAlchemy query object ordered best match first
+    """
+    query_words = words(search_text)
+    if not query_words:
+        return query
+    
+    threshold = current_app.config.get('FUZZY_SIMILARITY_THRESHOLD', DEFAULT_THRESHOLD)
+    dialect = db.engine.dialect.name
+    
+    if dialect == 'sqlite':
+        scores, capped = current_app.extensions[TrigramIndex.extension].match(
+            search_text, fields, threshold, status=status
+        )
+        if capped:
+            g.fuzzy_matches_capped = True
+        if not scores:
+            return query.filter(false())
+        return query.filter(Property.id.in_(scores)).order_by(
+            case(scores, value=Property.id, else_=0).desc()
+        )
+    
+    if dialect == 'postgresql':
+        # The <% operator uses the GIN indexes; it compares against this setting
+        db.session.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {'threshold': str(threshold)}
+        )
+        columns = [literal_column(f'lower(properties.{field})') for field in fields]
+        rank = None
+        for word in query_words:
+            query = query.filter(or_(*[db.literal(word).op('<%')(column) for column in columns]))
+            word_rank = db.func.greatest(*[db.func.word_similarity(word, column) for column in columns])
+            rank = word_rank if rank is None else rank + word_rank
+        return query.order_by(rank.desc())
+    
+    return query.filter(*[
+        or_(*[getattr(Property, field).ilike(f'%{word}%') for field in fields])
+        for word in query_words
+    ])
+
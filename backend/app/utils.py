@@ -2,21 +2,60 @@
 Utility functions for the Flask application.
 """
 
+import base64
+import hashlib
+import json
+import math
 import os
 import secrets
 import string
-from functools import wraps
+from datetime import datetime, timezone
+from decimal import Decimal
+from functools import lru_cache, wraps
 from flask import jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload, load_only
+from werkzeug.http import is_resource_modified
 from werkzeug.utils import secure_filename
-from app.models import User
-from app.schemas import error_schema
+from app import db
+from app.cache import count_cache, data_version, table_version, validator_cache
+from app.features import FEATURE_MATCH_MODES, parse_feature_keys
+from app.fulltext import apply_fulltext_search
+from app.geo import KM_PER_DEGREE, cover_bbox, radius_bbox
+from app.trigram import apply_fuzzy_search
+from app.models import Feature, Property, User, property_features
+from app.serializers import encode, response_format, to_columns
+from app.schemas import (
+    error_schema, PropertySchema, PropertyCardSchema, property_schema, properties_schema
+)
 
 # Allowed file extensions for uploads
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 
+# ?layout= values for list endpoints
+LIST_LAYOUTS = ('rows', 'columns')
+
+
+class InvalidQueryParameterError(ValueError):
+    """Raised when a query string parameter has an invalid value."""
+
+
+class InvalidCursorError(InvalidQueryParameterError):
+    """Raised when a keyset pagination cursor cannot be decoded."""
+
+
+# Columns behind the named "card" projection (PropertyCardSchema)
+PROPERTY_CARD_COLUMNS = ('id', 'title', 'price', 'location', 'bedrooms', 'images')
+
+# Ways paginated endpoints can compute the total row count
+COUNT_STRATEGIES = ('exact', 'cached', 'estimated', 'none')
+
+# Columns always loaded so keyset cursors can be built without lazy loads
+PROPERTY_KEY_COLUMNS = ('id', 'created_at')
+
 
 def validate_json(schema):
     """
@@ -202,7 +241,78 @@ def safe_filename(filename):
     return filename
 
 
-def paginate_query(query, page=1, per_page=20, max_per_page=100):
+def _count_strategy(count):
+    """Resolve a count strategy name, defaulting to PAGINATION_COUNT_STRATEGY."""
+    strategy = count or current_app.config.get('PAGINATION_COUNT_STRATEGY', 'exact')
+    if strategy not in COUNT_STRATEGIES:
+        raise InvalidQueryParameterError(
+            f"count must be one of: {', '.join(COUNT_STRATEGIES)}"
+        )
+    return strategy
+
+
+def _cached_count(query):
+    """COUNT(*) a query, reusing the result until any table is written or the TTL expires."""
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())), data_version())
+    
+    total = count_cache.get(key)
+    if total is None:
+        total = query.count()
+        count_cache.set(key, total)
+    return total
+
+
+def _estimated_count(query):
+    """Read the planner's row estimate for a query (PostgreSQL), else use a cached count."""
+    if db.engine.dialect.name != 'postgresql':
+        return _cached_count(query)
+    
+    try:
+        compiled = query.statement.compile(dialect=db.engine.dialect)
+        plan = db.session.connection().exec_driver_sql(
+            f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception:
+        return _cached_count(query)
+
+
+def count_rows(query, count=None):
+    """
+    Count the rows a query matches using a count strategy.
+    
+    Strategies:
+    - exact: run COUNT(*) every time
+    - cached: run COUNT(*) once per distinct query until a write commits or the TTL expires
+    - estimated: use the PostgreSQL planner estimate (cached count on other databases)
+    - none: skip counting
+    
+    Args:
+        query: SQLAlchemy query object
+        count (str): Strategy name; defaults to PAGINATION_COUNT_STRATEGY
+    
+    Returns:
+        int: Row count, or None for the 'none' strategy
+    
+    Raises:
+        InvalidQueryParameterError: If the strategy is unknown
+    """
+    strategy = _count_strategy(count)
+    query = query.order_by(None)
+    
+    if strategy == 'none':
+        return None
+    if strategy == 'cached':
+        return _cached_count(query)
+    if strategy == 'estimated':
+        return _estimated_count(query)
+    return query.count()
+
+
+def paginate_query(query, page=1, per_page=20, max_per_page=100, count=None):
     """
     Paginate a SQLAlchemy query.
     
@@ -211,34 +321,269 @@ def paginate_query(query, page=1, per_page=20, max_per_page=100):
         page (int): Page number (1-based)
         per_page (int): Items per page
         max_per_page (int): Maximum items per page
+        count (str): Count strategy for the total (see count_rows)
     
     Returns:
         dict: Pagination data with items and metadata
+    
+    Raises:
+        InvalidQueryParameterError: If the count strategy is unknown
     """
     # Validate parameters
     page = max(1, page)
     per_page = min(max(1, per_page), max_per_page)
+    strategy = _count_strategy(count)
     
-    # Execute paginated query
-    paginated = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    # Fetch one extra row so has_next does not depend on the total
+    items = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
+    
+    total = count_rows(query, strategy)
     
     return {
-        'items': paginated.items,
+        'items': items,
         'pagination': {
-            'page': paginated.page,
-            'per_page': paginated.per_page,
-            'total': paginated.total,
-            'pages': paginated.pages,
-            'has_prev': paginated.has_prev,
-            'has_next': paginated.has_next
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'pages': math.ceil(total / per_page) if total is not None else None,
+            'has_prev': page > 1,
+            'has_next': has_next,
+            'total_estimated': strategy == 'estimated'
         }
     }
 
 
+def encode_cursor(values, direction='next'):
+    """
+    Encode keyset values into an opaque, URL-safe pagination cursor.
+    
+    Args:
+        values (list): Sort key values of the boundary row
+        direction (str): 'next' to read past the row, 'prev' to read before it
+    
+    Returns:
+        str: Opaque cursor string
+    """
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        encoded.append(value)
+    
+    payload = json.dumps({'v': encoded, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor (str): Opaque cursor string
+        columns (list): Model columns the cursor values belong to
+    
+    Returns:
+        tuple: (values, direction)
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        raw_values = payload['v']
+        direction = payload.get('d', 'next')
+        
+        if direction not in ('next', 'prev') or len(raw_values) != len(columns):
+            raise ValueError('cursor does not match sort keys')
+        
+        values = []
+        for column, value in zip(columns, raw_values):
+            if value is not None:
+                python_type = column.type.python_type
+                if python_type is datetime:
+                    value = datetime.fromisoformat(value)
+                elif python_type is Decimal:
+                    value = Decimal(value)
+                else:
+                    value = python_type(value)
+            values.append(value)
+        
+        return values, direction
+        
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise InvalidCursorError('Invalid pagination cursor')
+
+
+def _keyset_condition(sort_keys, values):
+    """Build the WHERE clause selecting rows strictly after values in sort order."""
+    clauses = []
+    for index, (column, descending) in enumerate(sort_keys):
+        equal_prefix = [sort_keys[i][0] == values[i] for i in range(index)]
+        beyond = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def sort_ordering(sort_keys, reverse=False):
+    """
+    Turn (column, descending) sort keys into ORDER BY clauses.
+    
+    Args:
+        sort_keys (list): (column, descending) pairs
+        reverse (bool): Flip every direction (for reading backwards)
+    
+    Returns:
+        list: Ordering clauses for query.order_by()
+    """
+    return [
+        column.desc() if descending != reverse else column.asc()
+        for column, descending in sort_keys
+    ]
+
+
+def keyset_paginate_query(query, sort_keys, cursor=None, per_page=20, max_per_page=100,
+                          include_total=False, count=None):
+    """
+    Paginate a SQLAlchemy query with keyset (cursor) pagination.
+    
+    Every page is a bounded index range scan, so deep pages cost the same as
+    the first one and no COUNT(*) is run unless include_total is set.
+    
+    Args:
+        query: SQLAlchemy query object
+        sort_keys (list): (column, descending) pairs; the last one must be unique
+        cursor (str): Cursor returned by a previous page, or None for the first page
+        per_page (int): Items per page
+        max_per_page (int): Maximum items per page
+        include_total (bool): Also count all rows matching the query
+        count (str): Count strategy for the total (see count_rows)
+    
+    Returns:
+        dict: Pagination data with items and cursor metadata
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    per_page = min(max(1, per_page), max_per_page)
+    columns = [column for column, _ in sort_keys]
+    base_query = query.order_by(None)
+    
+    direction = 'next'
+    page_query = base_query
+    if cursor:
+        values, direction = decode_cursor(cursor, columns)
+        reverse = direction == 'prev'
+        page_query = page_query.filter(_keyset_condition(
+            [(column, descending != reverse) for column, descending in sort_keys],
+            values
+        ))
+    
+    reverse = direction == 'prev'
+    ordering = sort_ordering(sort_keys, reverse)
+    
+    # Fetch one extra row to learn whether another page exists
+    items = page_query.order_by(*ordering).limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    
+    if reverse:
+        items.reverse()
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = bool(cursor), has_more
+    
+    def row_values(item):
+        return [getattr(item, column.key) for column in columns]
+    
+    pagination = {
+        'per_page': per_page,
+        'has_prev': has_prev and bool(items),
+        'has_next': has_next and bool(items),
+        'prev_cursor': encode_cursor(row_values(items[0]), 'prev') if has_prev and items else None,
+        'next_cursor': encode_cursor(row_values(items[-1]), 'next') if has_next and items else None
+    }
+    
+    if include_total:
+        strategy = _count_strategy(count)
+        pagination['total'] = count_rows(base_query, 'exact' if strategy == 'none' else strategy)
+    
+    return {
+        'items': items,
+        'pagination': pagination
+    }
+
+
+@lru_cache(maxsize=128)
+def _property_projection(field_names, many):
+    """Build (columns, schema) for a sorted tuple of Property field names."""
+    if field_names == ('card',):
+        return PROPERTY_CARD_COLUMNS + PROPERTY_KEY_COLUMNS, PropertyCardSchema(many=many)
+    
+    if 'card' in field_names:
+        raise InvalidQueryParameterError('The card projection cannot be combined with other fields')
+    
+    unknown = set(field_names) - set(PropertySchema._declared_fields)
+    if unknown:
+        raise InvalidQueryParameterError(f"Unknown property fields: {', '.join(sorted(unknown))}")
+    
+    table_columns = set(Property.__table__.columns.keys())
+    columns = set(field_names) & table_columns
+    if 'admin' in field_names:
+        columns.add('admin_id')
+    return tuple(sorted(columns)) + PROPERTY_KEY_COLUMNS, PropertySchema(many=many, only=field_names)
+
+
+def resolve_property_fields(fields_param, many=True):
+    """
+    Resolve a ?fields= parameter into columns to load and a schema to dump with.
+    
+    Accepts a comma-separated list of PropertySchema field names, or the
+    named "card" projection (id, title, price, location, bedrooms, first image).
+    
+    Args:
+        fields_param (str): Raw ?fields= value, or None for the full representation
+        many (bool): Whether the schema will dump a list
+    
+    Returns:
+        tuple: (column names to load or None, schema instance)
+    
+    Raises:
+        InvalidQueryParameterError: If a requested field does not exist
+    """
+    names = tuple(sorted({name.strip() for name in (fields_param or '').split(',') if name.strip()}))
+    if not names:
+        return None, properties_schema if many else property_schema
+    return _property_projection(names, many)
+
+
+def apply_property_fields(query, columns, schema):
+    """
+    Restrict a Property query to the columns a projection needs.
+    
+    Columns are limited at the SQL level with load_only, and the listing
+    admin is joined in the same query when the schema serializes it, so a
+    page never lazy-loads one admin per row.
+    
+    Args:
+        query: SQLAlchemy query object
+        columns (tuple): Column names from resolve_property_fields, or None for all
+        schema: Schema instance from resolve_property_fields
+    
+    Returns:
+        SQLAlchemy query object
+    """
+    if columns:
+        query = query.options(load_only(*[getattr(Property, name) for name in dict.fromkeys(columns)]))
+    if 'admin' in schema.fields:
+        query = query.options(joinedload(Property.admin))
+    return query
+
+
 def handle_error(error, message=None, status_code=500):
     """
     Handle and format error responses.
@@ -268,6 +613,10 @@ def success_response(message, data=None, status_code=200):
     """
     Create a standardized success response.
     
+    The body is JSON (encoded with orjson), or MessagePack when the
+    request's Accept header prefers application/msgpack; list views pass rows
+    already converted with serialize() as data.
+    
     Args:
         message (str): Success message
         data: Response data
@@ -280,7 +629,147 @@ def success_response(message, data=None, status_code=200):
     if data is not None:
         response_data['data'] = data
     
-    return jsonify(response_data), status_code
+    body, mimetype = encode(response_data)
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response, status_code
+
+
+def apply_list_layout(rows):
+    """
+    Arrange a page of serialized rows as the request's ?layout= asks.
+    
+    layout=rows (default) keeps one object per item; layout=columns returns
+    one array per field, which drops the repeated keys on large pages.
+    
+    Args:
+        rows (list): Serialized rows from serialize()
+    
+    Returns:
+        list or dict: rows, or a dict of field name -> values
+    
+    Raises:
+        InvalidQueryParameterError: If layout is not one of LIST_LAYOUTS
+    """
+    layout = request.args.get('layout') or 'rows'
+    if layout not in LIST_LAYOUTS:
+        raise InvalidQueryParameterError(f"layout must be one of: {', '.join(LIST_LAYOUTS)}")
+    return to_columns(rows) if layout == 'columns' else rows
+
+
+def listing_validators(query, updated_column, *scope):
+    """
+    Compute a weak ETag and Last-Modified date for a listing query.
+    
+    Both come from a single MAX(updated_at)/COUNT(*) aggregate over the
+    filtered rows, so they change whenever a matching row is added, edited
+    or removed, without loading or serializing any row. The aggregate is
+    cached per query until the column's table is written, so repeated polls
+    do not scan the filtered rows again.
+    
+    Args:
+        query: SQLAlchemy query object with the listing filters applied
+        updated_column: Column holding each row's last modification time
+        *scope: Extra values the representation depends on (e.g. admin view)
+    
+    Returns:
+        tuple: (etag, last_modified)
+    """
+    aggregate = query.order_by(None).with_entities(func.max(updated_column), func.count())
+    compiled = aggregate.statement.compile(dialect=db.engine.dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())), table_version(updated_column.table.name))
+    
+    cached = validator_cache.get(key)
+    if cached is None:
+        cached = tuple(aggregate.one())
+        validator_cache.set(key, cached)
+    last_modified, count = cached
+    
+    return listing_etag(last_modified, count, *scope), last_modified
+
+
+def listing_etag(last_modified, count, *scope):
+    """
+    Build the weak ETag for a listing from its aggregate validators.
+    
+    Args:
+        last_modified (datetime): Latest modification time among the rows
+        count (int): Number of matching rows
+        *scope: Extra values the representation depends on
+    
+    Returns:
+        str: Entity tag (unquoted)
+    """
+    fingerprint = repr((
+        sorted(request.args.items(multi=True)),
+        response_format(),
+        last_modified.isoformat() if last_modified else None,
+        count,
+        scope
+    ))
+    return hashlib.sha1(fingerprint.encode()).hexdigest()
+
+
+def property_etag(property, schema):
+    """
+    Build the ETag of one property's representation, sent as a weak tag.
+    
+    Args:
+        property (Property): Property being returned
+        schema: Schema instance the property is dumped with
+    
+    Returns:
+        str: Entity tag (unquoted); changes with the row's updated_at, the
+            response format and the fields projection
+    """
+    projection = hashlib.sha1(','.join(schema.dump_fields).encode()).hexdigest()[:12]
+    return f'property-{property.id}-{property.updated_at.timestamp():.6f}-{response_format()}-{projection}'
+
+
+def not_modified_response(etag, last_modified=None, weak=False):
+    """
+    Return a 304 response if the request's conditional headers match.
+    
+    Args:
+        etag (str): Current entity tag (unquoted)
+        last_modified (datetime): Naive UTC modification time
+        weak (bool): Whether the entity tag is weak
+    
+    Returns:
+        Response or None: 304 response, or None if the client copy is stale
+    """
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    
+    response = current_app.response_class(status=304)
+    response.vary.add('Accept')
+    response.set_etag(etag, weak=weak)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def with_validators(result, etag, last_modified=None, weak=False):
+    """
+    Attach ETag and Last-Modified headers to a success_response result.
+    
+    Args:
+        result (tuple): (response, status_code) from success_response
+        etag (str): Entity tag (unquoted)
+        last_modified (datetime): Naive UTC modification time
+        weak (bool): Whether the entity tag is weak
+    
+    Returns:
+        tuple: Response and status code
+    """
+    response, status_code = result
+    response.set_etag(etag, weak=weak)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return response, status_code
 
 
 def allowed_file(filename):
@@ -334,22 +823,184 @@ def save_uploaded_file(file, upload_folder='uploads'):
         return None
 
 
-def create_property_search_query(query_params):
+def _parse_floats(value, name, count):
+    """Parse a comma-separated list of exactly count numbers."""
+    try:
+        numbers = [float(part) for part in str(value).split(',')]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count or not all(math.isfinite(number) for number in numbers):
+        raise InvalidQueryParameterError(f'{name} must be {count} comma-separated numbers')
+    return numbers
+
+
+def parse_bbox(value):
     """
-    Build SQLAlchemy query for property search with filters.
+    Parse a "min_lng,min_lat,max_lng,max_lat" bounding box parameter.
     
     Args:
+        value (str): Raw query parameter
+    
+    Returns:
+        tuple: (min_lat, min_lng, max_lat, max_lng)
+    
+    Raises:
+        InvalidQueryParameterError: If the box is malformed or out of bounds
+    """
+    min_lng, min_lat, max_lng, max_lat = _parse_floats(value, 'bbox', 4)
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+        raise InvalidQueryParameterError('bbox must be min_lng,min_lat,max_lng,max_lat within world bounds')
+    return min_lat, min_lng, max_lat, max_lng
+
+
+def parse_radius(query_params):
+    """
+    Parse the lat, lng and radius_km parameters of a radius search.
+    
+    Args:
+        query_params (dict): Search parameters
+    
+    Returns:
+        tuple or None: (latitude, longitude, radius_km), or None if not given
+    
+    Raises:
+        InvalidQueryParameterError: If only some are given, or one is malformed
+    """
+    radius_params = [query_params.get(name) for name in ('lat', 'lng', 'radius_km')]
+    if not any(radius_params):
+        return None
+    if not all(radius_params):
+        raise InvalidQueryParameterError('lat, lng and radius_km must be given together')
+    
+    latitude, longitude, radius_km = _parse_floats(','.join(map(str, radius_params)), 'lat, lng and radius_km', 3)
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and radius_km > 0):
+        raise InvalidQueryParameterError('lat, lng or radius_km is out of range')
+    return latitude, longitude, radius_km
+
+
+def _within_bbox(min_lat, min_lng, max_lat, max_lng):
+    """Build a filter for coordinates inside a box, led by geohash index ranges."""
+    # Each prefix is a range scan on ix_properties_geohash; '{' sorts after 'z'
+    cells = [
+        and_(Property.geohash >= prefix, Property.geohash < prefix + '{')
+        for prefix in cover_bbox(min_lat, min_lng, max_lat, max_lng)
+    ]
+    return and_(
+        or_(*cells) if cells else Property.geohash.isnot(None),
+        Property.latitude.between(min_lat, max_lat),
+        Property.longitude.between(min_lng, max_lng)
+    )
+
+
+def apply_geo_filters(query, query_params):
+    """
+    Apply bbox or radius filters to a Property query.
+    
+    bbox is "min_lng,min_lat,max_lng,max_lat". lat, lng and radius_km select
+    properties within radius_km of a point, nearest first.
+    
+    Args:
+        query: Property query object
+        query_params (dict): Search parameters
+    
+    Returns:
+        SQLAlchemy query object
+    
+    Raises:
+        InvalidQueryParameterError: If a coordinate parameter is malformed
+    """
+    if query_params.get('bbox'):
+        query = query.filter(_within_bbox(*parse_bbox(query_params['bbox'])))
+    
+    radius = parse_radius(query_params)
+    if radius:
+        latitude, longitude, radius_km = radius
+        
+        # Squared equirectangular distance in degrees; needs no SQL trig functions
+        scale = math.cos(math.radians(latitude))
+        distance = (
+            (Property.latitude - latitude) * (Property.latitude - latitude)
+            + (Property.longitude - longitude) * (Property.longitude - longitude) * (scale * scale)
+        )
+        query = query.filter(
+            _within_bbox(*radius_bbox(latitude, longitude, radius_km)),
+            distance <= (radius_km / KM_PER_DEGREE) ** 2
+        ).order_by(distance.asc())
+    
+    return query
+
+
+def apply_feature_filters(query, query_params):
+    """
+    Limit a Property query to properties with the requested features.
+    
+    features is a comma-separated list of feature names (case-insensitive);
+    features_match=all (default) requires every one, any at least one.
+    
+    Args:
+        query: Property query object
         query_params (dict): Search parameters
     
     Returns:
         SQLAlchemy query object
+    
+    Raises:
+        InvalidQueryParameterError: If features_match is not all or any
+    """
+    match = (query_params.get('features_match') or 'all').lower()
+    if match not in FEATURE_MATCH_MODES:
+        raise InvalidQueryParameterError(f"features_match must be one of: {', '.join(FEATURE_MATCH_MODES)}")
+    
+    keys = parse_feature_keys(query_params.get('features'))
+    if not keys:
+        return query
+    
+    # Index range scans on ix_property_features_feature, one per feature
+    linked = db.select(property_features.c.property_id).where(
+        property_features.c.feature_id.in_(db.select(Feature.id).where(Feature.key.in_(keys)))
+    )
+    if match == 'all':
+        linked = linked.group_by(property_features.c.property_id).having(func.count() == len(keys))
+    
+    return query.filter(Property.id.in_(linked))
+
+
+def is_fuzzy_search(query_params):
+    """Return True if the search asks for typo-tolerant (fuzzy) matching."""
+    return str(query_params.get('fuzzy') or '').lower() in ('1', 'true', 'yes')
+
+
+def create_property_search_query(query_params, default_status='available'):
     """
-    from app.models import Property
+    Build SQLAlchemy query for property search with filters.
     
-    query = Property.query
+    Args:
+        query_params (dict): Search parameters
+        default_status (str): Status to filter on when none is given, or None for any
+    
+    Returns:
+        SQLAlchemy query object, ordered by distance when a radius is given,
+        then by relevance when q is given (or similarity for a fuzzy
+        location), and otherwise unordered
+    """
+    query = apply_geo_filters(Property.query, query_params)
+    
+    # fuzzy=true tolerates typos: q matches titles and locations, location
+    # matches locations, both by trigram similarity
+    fuzzy = is_fuzzy_search(query_params)
+    status = query_params.get('status') or default_status
+    
+    if query_params.get('q'):
+        if fuzzy:
+            query = apply_fuzzy_search(query, query_params['q'], ('title', 'location'), status)
+        else:
+            query = apply_fulltext_search(query, query_params['q'])
     
     if query_params.get('location'):
-        query = query.filter(Property.location.ilike(f"%{query_params['location']}%"))
+        if fuzzy:
+            query = apply_fuzzy_search(query, query_params['location'], ('location',), status)
+        else:
+            query = query.filter(Property.location.ilike(f"%{query_params['location']}%"))
     
     if query_params.get('property_type'):
         query = query.filter(Property.property_type == query_params['property_type'])
@@ -363,10 +1014,16 @@ def create_property_search_query(query_params):
     if query_params.get('bedrooms'):
         query = query.filter(Property.bedrooms >= query_params['bedrooms'])
     
-    if query_params.get('status'):
-        query = query.filter(Property.status == query_params['status'])
-    else:
-        # Default to only available properties
-        query = query.filter(Property.status == 'available')
+    if query_params.get('min_square_feet'):
+        query = query.filter(Property.square_feet >= query_params['min_square_feet'])
+    
+    if query_params.get('max_square_feet'):
+        query = query.filter(Property.square_feet <= query_params['max_square_feet'])
+    
+    query = apply_feature_filters(query, query_params)
+    
+    if status:
+        # Only available properties unless another status is asked for
+        query = query.filter(Property.status == status)
     
-    return query.order_by(Property.created_at.desc())
\ No newline at end of file
+    return query
\ No newline at end of file
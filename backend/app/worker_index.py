@@ -0,0 +1,158 @@
+"""
+Lifecycle shared by the per-worker in-memory property indexes.
+
+The search engine, the similarity index and the trigram index each keep
+part of the catalog in process memory. A WorkerIndex subclass says how to
+load its data and how to apply a write to one property; this class decides
+when the data is stale (the properties table changed, or max_age seconds
+passed, which picks up writes made by other workers), rebuilds it while
+other requests keep reading the old copy, and applies writes made through
+the property routes incrementally.
+"""
+
+import threading
+import time
+from flask import current_app
+from app import db
+from app.cache import on_catalog_change, table_version
+from app.models import Property
+
+
+class WorkerIndex:
+    """Base class of per-worker indexes over the properties table."""
+    
+    # Key of the index in app.extensions and config setting for its max_age
+    extension = None
+    max_age_setting = None
+    
+    # Whether queries may use the old data while another request rebuilds it;
+    # if not, _ensure_fresh() returns False and the caller falls back to SQL
+    serve_stale = True
+    
+    def __init__(self, max_age=300):
+        """
+        Initialize an empty index.
+        
+        Args:
+            max_age (int): Seconds before the index is rebuilt to pick up
+                writes made outside this worker
+        """
+        self.max_age = max_age
+        self._loaded = False
+        self._version = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+    
+    @classmethod
+    def init_app(cls, app):
+        """
+        Create the application's index; it loads on first use.
+        
+        Args:
+            app: Flask application instance
+        
+        Returns:
+            WorkerIndex: The new index
+        """
+        index = cls(max_age=app.config.get(cls.max_age_setting, 300))
+        app.extensions[cls.extension] = index
+        return index
+    
+    def _build(self):
+        """Load the index data from the database; runs without the lock."""
+        raise NotImplementedError
+    
+    def _install(self, data):
+        """Replace the index data with the result of _build() (caller holds the lock)."""
+        raise NotImplementedError
+    
+    def _apply(self, property_id, property):
+        """
+        Apply a committed write to one property (caller holds the lock).
+        
+        Args:
+            property_id (int): ID of the created, updated or deleted property
+            property (Property): Its current row, or None if deleted
+        """
+        raise NotImplementedError
+    
+    def is_stale(self):
+        """Return True if the index is missing or may not reflect the database."""
+        return (
+            not self._loaded
+            or self._version != table_version(Property.__tablename__)
+            or time.monotonic() - self._loaded_at > self.max_age
+        )
+    
+    def rebuild(self):
+        """Reload the index from the database."""
+        version = table_version(Property.__tablename__)
+        data = self._build()
+        
+        with self._lock:
+            self._install(data)
+            self._version = version
+            self._loaded_at = time.monotonic()
+            self._loaded = True
+    
+    def invalidate(self):
+        """Mark the index stale so the next query rebuilds it."""
+        with self._lock:
+            self._version = None
+    
+    def refresh_property(self, property_id):
+        """
+        Apply a committed write to one property.
+        
+        If other property writes were committed since the index was last
+        synced, the index is left stale instead so the next query rebuilds.
+        
+        Args:
+            property_id (int): ID of the created, updated or deleted property
+        """
+        version = table_version(Property.__tablename__)
+        if not self._loaded or self._version is None or property_id is None:
+            return
+        if version - self._version > 1:
+            return
+        
+        property = db.session.get(Property, property_id)
+        with self._lock:
+            self._apply(property_id, property)
+            self._version = version
+    
+    def _ensure_fresh(self):
+        """
+        Rebuild a stale index unless another request is already doing so.
+        
+        The first load is waited for when serve_stale is set; later rebuilds
+        never block a query.
+        
+        Returns:
+            bool: True if the index may be queried
+        """
+        if not self.is_stale():
+            return True
+        if not self._rebuild_lock.acquire(blocking=self.serve_stale and not self._loaded):
+            return self.serve_stale and self._loaded
+        try:
+            if self.is_stale():
+                self.rebuild()
+            return True
+        finally:
+            self._rebuild_lock.release()
+
+
+@on_catalog_change
+def _apply_catalog_change(property_id):
+    """Keep the current application's indexes in step with property writes."""
+    for index in list(current_app.extensions.values()):
+        if not isinstance(index, WorkerIndex):
+            continue
+        try:
+            index.refresh_property(property_id)
+        except Exception as e:
+            # The write is already committed; rebuild on the next query instead
+            current_app.logger.error(f'{type(index).__name__} refresh failed for property {property_id}: {e}')
+            index.invalidate()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the property listing indexes.
+
+Seeds a throwaway database with 500k properties, then prints the query plan
+and timing of the hot listing/search queries without and with the indexes
+declared on Property (the same ones the a1f3c9d2e4b7 migration creates).
+
+Usage:
+    python benchmark_property_indexes.py [row_count]
+
+Set DATABASE_URL to benchmark against PostgreSQL instead of a temporary
+SQLite file. The properties table in that database is dropped and recreated.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROW_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+BATCH_SIZE = 10_000
+
+if not os.getenv('DATABASE_URL'):
+    _db_file = os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+
+from app import create_app, db
+from app.models import Property
+from app.utils import create_property_search_query
+
+
+def seed_properties(count):
+    """Bulk insert count synthetic properties."""
+    random.seed(42)
+    locations = ['Karen, Nairobi', 'Westlands, Nairobi', 'Kilimani, Nairobi',
+                 'Lavington, Nairobi', 'Runda, Nairobi', 'Nyali, Mombasa']
+    types = ['house', 'apartment', 'condo', 'townhouse', 'land', 'commercial']
+    statuses = ['available'] * 8 + ['sold', 'pending']
+    start = datetime(2020, 1, 1)
+    
+    table = Property.__table__
+    for offset in range(0, count, BATCH_SIZE):
+        rows = []
+        for i in range(offset, min(offset + BATCH_SIZE, count)):
+            created = start + timedelta(minutes=i * 3)
+            rows.append({
+                'title': f'Property {i}',
+                'description': 'Benchmark listing',
+                'property_type': random.choice(types),
+                'location': random.choice(locations),
+                'price': random.randint(1_000_000, 150_000_000),
+                'bedrooms': random.randint(0, 6),
+                'status': random.choice(statuses),
+                'is_verified': random.random() < 0.9,
+                'created_at': created,
+                'updated_at': created
+            })
+        db.session.execute(table.insert(), rows)
+        db.session.commit()
+
+
+def benchmark_queries():
+    """The listing and search query shapes used by routes/properties.py."""
+    listing = Property.query.filter_by(status='available').filter_by(is_verified=True)
+    
+    type_search = create_property_search_query({'property_type': 'apartment'})
+    type_search = type_search.filter_by(is_verified=True)
+    
+    price_search = create_property_search_query({'min_price': 140_000_000})
+    price_search = price_search.filter_by(is_verified=True)
+    
+    return [
+        ('listing page 1', listing.order_by(Property.created_at.desc()).limit(20)),
+        ('listing page 500', listing.order_by(Property.created_at.desc()).limit(20).offset(20 * 499)),
+        ('search by type', type_search.order_by(Property.created_at.desc()).limit(20)),
+        ('search by price range', price_search.limit(20)),
+        ('listing count', listing.with_entities(db.func.count(Property.id))),
+    ]
+
+
+def explain(query):
+    """Return the database's query plan for a SQLAlchemy query."""
+    sql = str(query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}
+    ))
+    if db.engine.dialect.name == 'sqlite':
+        rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+        return [row[-1] for row in rows]
+    rows = db.session.execute(db.text(f'EXPLAIN {sql}')).fetchall()
+    return [row[0] for row in rows]
+
+
+def run_round(label):
+    """Print the plan and best-of-5 timing for every benchmark query."""
+    print(f'\n=== {label} ===')
+    for name, query in benchmark_queries():
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            query.all()
+            timings.append(time.perf_counter() - started)
+        print(f'\n{name}: {min(timings) * 1000:.2f} ms')
+        for line in explain(query):
+            print(f'    {line}')
+
+
+def main():
+    app = create_app()
+    
+    with app.app_context():
+        Property.__table__.drop(db.engine, checkfirst=True)
+        Property.__table__.create(db.engine)
+        
+        print(f'Seeding {ROW_COUNT} properties into {db.engine.url} ...')
+        seed_properties(ROW_COUNT)
+        
+        for index in Property.__table__.indexes:
+            index.drop(db.engine)
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        run_round('Without indexes')
+        
+        for index in Property.__table__.indexes:
+            index.create(db.engine)
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        run_round('With indexes')
+
+
+if __name__ == '__main__':
+    main()
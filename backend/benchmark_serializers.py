@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark list serialization: marshmallow + Flask JSON vs the compiled path.
+
+Seeds a throwaway SQLite database, loads 20, 100 and 1000 rows of each
+serialized model and times turning them into response bytes both ways:
+schema.dump() followed by Flask's JSON provider (the old success_response
+path), and app.serializers.serialize() followed by orjson. Both outputs are
+checked to decode to the same data before timing.
+
+Usage:
+    python benchmark_serializers.py [repeats]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+ROW_COUNTS = (20, 100, 1000)
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+
+from sqlalchemy.orm import joinedload
+from app import create_app, db
+from app.models import ContactMessage, Property, User
+from app.schemas import contact_messages_schema, properties_schema, users_schema
+from app.serializers import dumps, serialize
+from app.utils import resolve_property_fields
+
+
+def seed(count):
+    """Bulk insert count users, properties and contact messages."""
+    random.seed(42)
+    start = datetime(2020, 1, 1)
+    
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'admin{i}', 'email': f'admin{i}@example.com', 'password_hash': 'benchmark',
+         'first_name': 'Admin', 'last_name': str(i), 'role': 'admin', 'is_main_admin': False,
+         'is_active': True, 'created_at': start, 'updated_at': start}
+        for i in range(count)
+    ])
+    db.session.execute(Property.__table__.insert(), [
+        {'title': f'Property {i}', 'description': 'Benchmark listing', 'property_type': 'house',
+         'location': 'Karen, Nairobi', 'address': f'{i} Karen Road', 'latitude': -1.3 + i * 1e-4,
+         'longitude': 36.7 + i * 1e-4, 'price': random.randint(1_000_000, 150_000_000),
+         'bedrooms': random.randint(0, 6), 'bathrooms': random.randint(1, 4),
+         'square_feet': random.randint(500, 6000), 'year_built': 2000 + i % 20, 'status': 'available',
+         'features': ['Swimming Pool', 'Garden'], 'images': [f'/uploads/{i}.jpg'], 'admin_id': i + 1,
+         'is_verified': True, 'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(count)
+    ])
+    db.session.execute(ContactMessage.__table__.insert(), [
+        {'name': f'Visitor {i}', 'email': f'visitor{i}@example.com', 'message': 'Is it available?',
+         'property_id': i + 1, 'user_id': i + 1, 'status': 'unread', 'created_at': start + timedelta(minutes=i)}
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def cases(limit):
+    """(name, schema, rows) for each list endpoint representation."""
+    properties = Property.query.options(joinedload(Property.admin)).order_by(Property.id).limit(limit).all()
+    _, card_schema = resolve_property_fields('card')
+    messages = ContactMessage.query.options(
+        joinedload(ContactMessage.property), joinedload(ContactMessage.user)
+    ).order_by(ContactMessage.id).limit(limit).all()
+    return [
+        ('properties', properties_schema, properties),
+        ('properties?fields=card', card_schema, properties),
+        ('users', users_schema, User.query.order_by(User.id).limit(limit).all()),
+        ('contact messages', contact_messages_schema, messages),
+    ]
+
+
+def best_time(function):
+    """Return the best of REPEATS timings of function() in milliseconds."""
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    app = create_app()
+    
+    with app.test_request_context():
+        db.create_all()
+        seed(max(ROW_COUNTS))
+        
+        print(f'{"representation":<24}{"rows":>6}{"marshmallow":>14}{"compiled":>12}{"speedup":>10}')
+        for count in ROW_COUNTS:
+            for name, schema, rows in cases(count):
+                def marshmallow_path():
+                    return app.json.dumps({'data': schema.dump(rows)}).encode()
+                
+                def compiled_path():
+                    return dumps({'data': serialize(schema, rows)})
+                
+                assert json.loads(marshmallow_path()) == json.loads(compiled_path()), name
+                
+                before, after = best_time(marshmallow_path), best_time(compiled_path)
+                print(f'{name:<24}{count:>6}{before:>12.2f}ms{after:>10.2f}ms{before / after:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,60 @@ class Config:
     
     # Rate limiting
     RATELIMIT_STORAGE_URL = os.getenv('REDIS_URL', 'memory://')
+    
+    # Response cache for anonymous property listing/search pages (per worker)
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 60))  # seconds
+    
+    # gzip/Brotli response compression for bodies of at least COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))  # 1-9
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))  # 0-11
+    
+    # How paginated endpoints compute totals: exact, cached, estimated or none.
+    # The public property listing and search opt into cached totals (up to
+    # PAGINATION_COUNT_CACHE_TTL seconds stale, per worker); the rest stay exact
+    PAGINATION_COUNT_STRATEGY = os.getenv('PAGINATION_COUNT_STRATEGY', 'exact')
+    PROPERTY_LISTING_COUNT_STRATEGY = os.getenv('PROPERTY_LISTING_COUNT_STRATEGY', 'cached')
+    PAGINATION_COUNT_CACHE_MAX_ENTRIES = int(os.getenv('PAGINATION_COUNT_CACHE_MAX_ENTRIES', 1024))
+    PAGINATION_COUNT_CACHE_TTL = int(os.getenv('PAGINATION_COUNT_CACHE_TTL', 60))  # seconds
+    
+    # Rows fetched per round trip by the streaming property export
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    
+    # Facet count cache, keyed by normalized search filters
+    FACET_CACHE_MAX_ENTRIES = int(os.getenv('FACET_CACHE_MAX_ENTRIES', 256))
+    FACET_CACHE_TTL = int(os.getenv('FACET_CACHE_TTL', 60))  # seconds
+    
+    # Map cluster cache, keyed by zoom precision, snapped viewport and filters
+    CLUSTER_CACHE_MAX_ENTRIES = int(os.getenv('CLUSTER_CACHE_MAX_ENTRIES', 512))
+    CLUSTER_CACHE_TTL = int(os.getenv('CLUSTER_CACHE_TTL', 300))  # seconds
+    
+    # Listing ETag/Last-Modified aggregates, reused until the properties table
+    # is written in this worker or the TTL expires (writes by other workers)
+    VALIDATOR_CACHE_MAX_ENTRIES = int(os.getenv('VALIDATOR_CACHE_MAX_ENTRIES', 1024))
+    VALIDATOR_CACHE_TTL = int(os.getenv('VALIDATOR_CACHE_TTL', 60))  # seconds
+    
+    # Price statistics cache, keyed by normalized search filters and bins
+    STATS_CACHE_MAX_ENTRIES = int(os.getenv('STATS_CACHE_MAX_ENTRIES', 128))
+    STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', 300))  # seconds
+    
+    # In-memory search index over the public catalog (per worker)
+    SEARCH_ENGINE_ENABLED = os.getenv('SEARCH_ENGINE_ENABLED', 'true').lower() == 'true'
+    SEARCH_ENGINE_MAX_AGE = int(os.getenv('SEARCH_ENGINE_MAX_AGE', 300))  # seconds
+    
+    # Typo-tolerant search: minimum trigram word similarity, and the
+    # in-process trigram index used on SQLite (per worker)
+    FUZZY_SIMILARITY_THRESHOLD = float(os.getenv('FUZZY_SIMILARITY_THRESHOLD', 0.4))
+    TRIGRAM_INDEX_MAX_AGE = int(os.getenv('TRIGRAM_INDEX_MAX_AGE', 300))  # seconds
+    
+    # NumPy feature arrays for similar-property recommendations (per worker)
+    SIMILARITY_INDEX_MAX_AGE = int(os.getenv('SIMILARITY_INDEX_MAX_AGE', 300))  # seconds
+    
+    # Compiled saved searches matched against new public listings (per worker)
+    SAVED_SEARCH_MAX_AGE = int(os.getenv('SAVED_SEARCH_MAX_AGE', 60))  # seconds
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,45 @@
+"""add property listing indexes
+
+Revision ID: a1f3c9d2e4b7
+Revises: 
+Create Date: 2026-10-17 00:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c9d2e4b7'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (name, columns) - must stay in sync with Property.__table_args__
+INDEXES = [
+    ('ix_properties_public_created', ['status', 'is_verified', 'created_at', 'id']),
+    ('ix_properties_public_type_created', ['status', 'is_verified', 'property_type', 'created_at', 'id']),
+    ('ix_properties_public_price', ['status', 'is_verified', 'price']),
+    ('ix_properties_admin_id', ['admin_id']),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for index in inspector.get_indexes('properties')}
+
+
+def upgrade():
+    # create_app() runs db.create_all(), so fresh databases already have these
+    existing = _existing_indexes()
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'properties', columns)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, _ in reversed(INDEXES):
+        if name in existing:
+            op.drop_index(name, table_name='properties')
@@ -0,0 +1,68 @@
+"""add saved searches and match queue
+
+Revision ID: a6d4e2b9f1c3
+Revises: f3b8d1c6a2e4
+Create Date: 2026-10-17 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d4e2b9f1c3'
+down_revision = 'f3b8d1c6a2e4'
+branch_labels = None
+depends_on = None
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = _existing_tables()
+    
+    if 'saved_searches' not in tables:
+        op.create_table(
+            'saved_searches',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=True),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('criteria', sa.JSON(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_saved_searches_email', 'saved_searches', ['email'])
+    
+    if 'saved_search_matches' not in tables:
+        op.create_table(
+            'saved_search_matches',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('saved_search_id', sa.Integer(), nullable=False),
+            sa.Column('property_id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('notified_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('saved_search_id', 'property_id', name='uq_saved_search_matches_search_property'),
+        )
+        op.create_index('ix_saved_search_matches_pending', 'saved_search_matches', ['notified_at', 'id'])
+        op.create_index('ix_saved_search_matches_property_id', 'saved_search_matches', ['property_id'])
+
+
+def downgrade():
+    tables = _existing_tables()
+    
+    if 'saved_search_matches' in tables:
+        op.drop_index('ix_saved_search_matches_property_id', table_name='saved_search_matches')
+        op.drop_index('ix_saved_search_matches_pending', table_name='saved_search_matches')
+        op.drop_table('saved_search_matches')
+    
+    if 'saved_searches' in tables:
+        op.drop_index('ix_saved_searches_email', table_name='saved_searches')
+        op.drop_table('saved_searches')
@@ -0,0 +1,77 @@
+"""store property features and images as json
+
+Revision ID: b7e2d4f1c8a3
+Revises: a1f3c9d2e4b7
+Create Date: 2026-10-17 01:10:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4f1c8a3'
+down_revision = 'a1f3c9d2e4b7'
+branch_labels = None
+depends_on = None
+
+
+JSON_COLUMNS = ('features', 'images')
+
+
+def _normalize_rows():
+    """Rewrite legacy text values so every row holds a valid JSON list or NULL."""
+    bind = op.get_bind()
+    properties = sa.table('properties', sa.column('id', sa.Integer),
+                          *[sa.column(name, sa.Text) for name in JSON_COLUMNS])
+    
+    rows = bind.execute(sa.select(properties)).fetchall()
+    for row in rows:
+        updates = {}
+        for name in JSON_COLUMNS:
+            raw = getattr(row, name)
+            if raw is None or isinstance(raw, (list, dict)):
+                continue
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                # Keep non-JSON text as a single entry rather than dropping it
+                value = [raw] if raw.strip() else None
+            
+            if value is not None and not isinstance(value, list):
+                value = [value]
+            
+            normalized = json.dumps(value) if value is not None else None
+            if normalized != raw:
+                updates[name] = normalized
+        
+        if updates:
+            bind.execute(properties.update().where(properties.c.id == row.id).values(**updates))
+
+
+def upgrade():
+    _normalize_rows()
+    
+    with op.batch_alter_table('properties') as batch_op:
+        for name in JSON_COLUMNS:
+            batch_op.alter_column(
+                name,
+                existing_type=sa.Text(),
+                type_=sa.JSON(),
+                existing_nullable=True,
+                postgresql_using=f'{name}::json'
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('properties') as batch_op:
+        for name in JSON_COLUMNS:
+            batch_op.alter_column(
+                name,
+                existing_type=sa.JSON(),
+                type_=sa.Text(),
+                existing_nullable=True,
+                postgresql_using=f'{name}::text'
+            )
@@ -0,0 +1,43 @@
+"""add trigram indexes for fuzzy search
+
+Revision ID: b8f5c3a1d7e6
+Revises: a6d4e2b9f1c3
+Create Date: 2026-10-17 07:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8f5c3a1d7e6'
+down_revision = 'a6d4e2b9f1c3'
+branch_labels = None
+depends_on = None
+
+
+# SQLite keeps its trigram index in process memory; nothing to create there
+POSTGRES_UPGRADE = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS ix_properties_location_trgm ON properties "
+    "USING GIN (lower(location) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_properties_title_trgm ON properties "
+    "USING GIN (lower(title) gin_trgm_ops)"
+]
+
+POSTGRES_DOWNGRADE = [
+    'DROP INDEX IF EXISTS ix_properties_title_trgm',
+    'DROP INDEX IF EXISTS ix_properties_location_trgm'
+]
+
+
+def _run(statements_by_dialect):
+    for statement in statements_by_dialect.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'postgresql': POSTGRES_UPGRADE})
+
+
+def downgrade():
+    _run({'postgresql': POSTGRES_DOWNGRADE})
@@ -0,0 +1,75 @@
+"""add property full-text index
+
+Revision ID: c4a9e1f7d2b6
+Revises: b7e2d4f1c8a3
+Create Date: 2026-10-17 02:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e1f7d2b6'
+down_revision = 'b7e2d4f1c8a3'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5(
+        title, description, location,
+        content='properties', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+        INSERT INTO properties_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+        INSERT INTO properties_fts(properties_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF title, description, location ON properties BEGIN
+        INSERT INTO properties_fts(properties_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO properties_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    "INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')"
+]
+
+SQLITE_DOWNGRADE = [
+    'DROP TRIGGER IF EXISTS properties_fts_au',
+    'DROP TRIGGER IF EXISTS properties_fts_ad',
+    'DROP TRIGGER IF EXISTS properties_fts_ai',
+    'DROP TABLE IF EXISTS properties_fts'
+]
+
+POSTGRES_UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_properties_fulltext ON properties USING GIN ("
+    "to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(location, '')))"
+]
+
+POSTGRES_DOWNGRADE = ['DROP INDEX IF EXISTS ix_properties_fulltext']
+
+
+def _run(statements_by_dialect):
+    for statement in statements_by_dialect.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRES_UPGRADE})
+
+
+def downgrade():
+    _run({'sqlite': SQLITE_DOWNGRADE, 'postgresql': POSTGRES_DOWNGRADE})
@@ -0,0 +1,54 @@
+"""add property coordinates and geohash
+
+Revision ID: d2f6b8a4c1e9
+Revises: c4a9e1f7d2b6
+Create Date: 2026-10-17 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b8a4c1e9'
+down_revision = 'c4a9e1f7d2b6'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ('latitude', sa.Float()),
+    ('longitude', sa.Float()),
+    ('geohash', sa.String(length=12)),
+]
+
+
+def _existing_columns():
+    inspector = sa.inspect(op.get_bind())
+    return {column['name'] for column in inspector.get_columns('properties')}
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for index in inspector.get_indexes('properties')}
+
+
+def upgrade():
+    # Plain ADD COLUMN (no batch rebuild) keeps the SQLite full-text triggers
+    existing = _existing_columns()
+    for name, column_type in COLUMNS:
+        if name not in existing:
+            op.add_column('properties', sa.Column(name, column_type, nullable=True))
+    
+    if 'ix_properties_geohash' not in _existing_indexes():
+        op.create_index('ix_properties_geohash', 'properties', ['geohash'])
+
+
+def downgrade():
+    if 'ix_properties_geohash' in _existing_indexes():
+        op.drop_index('ix_properties_geohash', table_name='properties')
+    
+    existing = _existing_columns()
+    for name, _ in reversed(COLUMNS):
+        if name in existing:
+            op.drop_column('properties', name)
@@ -0,0 +1,55 @@
+"""add property sort indexes
+
+Revision ID: e5c1a7d3b9f2
+Revises: d2f6b8a4c1e9
+Create Date: 2026-10-17 04:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c1a7d3b9f2'
+down_revision = 'd2f6b8a4c1e9'
+branch_labels = None
+depends_on = None
+
+
+# (name, columns) - must stay in sync with the indexes declared on Property
+SORT_INDEXES = [
+    ('ix_properties_public_square_feet_asc',
+     ['status', 'is_verified', sa.text('coalesce(square_feet, 2147483647)'), 'id']),
+    ('ix_properties_public_square_feet_desc',
+     ['status', 'is_verified', sa.text('coalesce(square_feet, -1)'), 'id']),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    return {index['name']: index['column_names'] for index in inspector.get_indexes('properties')}
+
+
+def upgrade():
+    existing = _existing_indexes()
+    
+    # id makes the price index usable for sort=price_asc/price_desc keyset pages
+    price_columns = existing.get('ix_properties_public_price')
+    if price_columns is not None and 'id' not in price_columns:
+        op.drop_index('ix_properties_public_price', table_name='properties')
+        price_columns = None
+    if price_columns is None:
+        op.create_index('ix_properties_public_price', 'properties', ['status', 'is_verified', 'price', 'id'])
+    
+    # Expression indexes are not reflected on SQLite, so rely on IF NOT EXISTS
+    for name, columns in SORT_INDEXES:
+        op.create_index(name, 'properties', columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, _ in reversed(SORT_INDEXES):
+        op.drop_index(name, table_name='properties', if_exists=True)
+    
+    if 'ix_properties_public_price' in _existing_indexes():
+        op.drop_index('ix_properties_public_price', table_name='properties')
+    op.create_index('ix_properties_public_price', 'properties', ['status', 'is_verified', 'price'])
@@ -0,0 +1,119 @@
+"""add feature dictionary and property_features links
+
+Revision ID: f3b8d1c6a2e4
+Revises: e5c1a7d3b9f2
+Create Date: 2026-10-17 05:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1c6a2e4'
+down_revision = 'e5c1a7d3b9f2'
+branch_labels = None
+depends_on = None
+
+
+properties = sa.table(
+    'properties',
+    sa.column('id', sa.Integer),
+    # Read as text, skipping values that are not JSON lists, so legacy rows cannot abort the upgrade
+    sa.column('features', sa.Text),
+)
+
+features = sa.table(
+    'features',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('key', sa.String),
+)
+
+property_features = sa.table(
+    'property_features',
+    sa.column('property_id', sa.Integer),
+    sa.column('feature_id', sa.Integer),
+)
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _backfill():
+    """Link every property to dictionary entries for its JSON feature names."""
+    bind = op.get_bind()
+    if bind.execute(sa.select(property_features.c.property_id).limit(1)).first() is not None:
+        return
+    
+    links = []
+    names = {}
+    for property_id, value in bind.execute(sa.select(properties.c.id, properties.c.features)):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                continue
+        if not isinstance(value, list):
+            continue
+        keys = set()
+        for name in value:
+            key = ' '.join(str(name).lower().split())
+            if key:
+                names.setdefault(key, ' '.join(str(name).split()))
+                keys.add(key)
+        links.extend((property_id, key) for key in keys)
+    
+    if not links:
+        return
+    
+    existing = dict(bind.execute(sa.select(features.c.key, features.c.id)).all())
+    missing = [{'key': key, 'name': name} for key, name in names.items() if key not in existing]
+    if missing:
+        op.bulk_insert(features, missing)
+        existing = dict(bind.execute(sa.select(features.c.key, features.c.id)).all())
+    
+    op.bulk_insert(property_features, [
+        {'property_id': property_id, 'feature_id': existing[key]} for property_id, key in links
+    ])
+
+
+def upgrade():
+    tables = _existing_tables()
+    
+    if 'features' not in tables:
+        op.create_table(
+            'features',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('key', sa.String(length=100), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('key'),
+        )
+    
+    if 'property_features' not in tables:
+        op.create_table(
+            'property_features',
+            sa.Column('property_id', sa.Integer(), nullable=False),
+            sa.Column('feature_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['feature_id'], ['features.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('property_id', 'feature_id'),
+        )
+        op.create_index('ix_property_features_feature', 'property_features', ['feature_id', 'property_id'])
+    
+    _backfill()
+
+
+def downgrade():
+    tables = _existing_tables()
+    
+    if 'property_features' in tables:
+        op.drop_index('ix_property_features_feature', table_name='property_features')
+        op.drop_table('property_features')
+    
+    if 'features' in tables:
+        op.drop_table('features')
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Behavior tests for the catalog features: pagination, caching, search,
+facets, maps and saved searches.
+
+Each test builds its own in-memory app with the helpers of
+test_regressions.py, seeds only the rows it needs and calls the API through
+the test client; no server needed.
+
+    python test_features.py
+    python -m pytest test_features.py
+"""
+
+from sqlalchemy import event
+from app import db
+from app.models import SavedSearch
+from test_regressions import add_properties, make_app
+
+SORTS = ('newest', 'price_asc', 'price_desc', 'square_feet_asc', 'square_feet_desc')
+
+
+def listing_ids(client, url):
+    """Return the property ids of one page of a listing response."""
+    return [property['id'] for property in client.get(url).get_json()['data']['properties']]
+
+
+def walk_cursor(client, url, per_page):
+    """Follow next_cursor to the end, then prev_cursor back; returns (pages forward, pages back)."""
+    forward = []
+    response = client.get(f'{url}&per_page={per_page}&cursor=').get_json()['data']
+    while True:
+        forward.append([property['id'] for property in response['properties']])
+        if not response['pagination']['next_cursor']:
+            break
+        response = client.get(f"{url}&per_page={per_page}&cursor={response['pagination']['next_cursor']}").get_json()['data']
+    
+    backward = []
+    while response['pagination']['prev_cursor']:
+        response = client.get(f"{url}&per_page={per_page}&cursor={response['pagination']['prev_cursor']}").get_json()['data']
+        backward.append([property['id'] for property in response['properties']])
+    
+    return forward, backward
+
+
+def test_keyset_pagination_walks_every_sort_both_ways():
+    app, client, _ = make_app()
+    # Repeated prices and missing sizes make the id tie-breaker and null ordering matter
+    add_properties(app, [
+        {'price': 1_000_000 + (i % 4) * 100_000, 'square_feet': None if i % 5 == 0 else 500 + (i % 3) * 100}
+        for i in range(23)
+    ])
+    
+    for sort in SORTS:
+        expected = listing_ids(client, f'/api/properties?sort={sort}&per_page=100')
+        assert len(expected) == 23
+        
+        forward, backward = walk_cursor(client, f'/api/properties?sort={sort}', 5)
+        assert [len(page) for page in forward] == [5, 5, 5, 5, 3], sort
+        assert sum(forward, []) == expected, sort
+        assert backward == forward[-2::-1], sort
+    
+    prices = listing_ids(client, '/api/properties?sort=price_asc&per_page=100')
+    assert prices[:6] == [1, 5, 9, 13, 17, 21]
+    
+    # Missing sizes sort last in both directions
+    missing = [1, 6, 11, 16, 21]
+    assert listing_ids(client, '/api/properties?sort=square_feet_asc&per_page=100')[-5:] == missing
+    assert listing_ids(client, '/api/properties?sort=square_feet_desc&per_page=100')[-5:] == missing[::-1]
+
+
+def test_keyset_pagination_on_search_and_total():
+    app, client, _ = make_app()
+    add_properties(app, [{'price': 1_000_000 + i, 'bedrooms': i % 3} for i in range(12)])
+    
+    expected = listing_ids(client, '/api/properties/search?bedrooms=2&sort=price_desc&per_page=100')
+    forward, backward = walk_cursor(client, '/api/properties/search?bedrooms=2&sort=price_desc', 3)
+    assert sum(forward, []) == expected == [12, 9, 6, 3]
+    assert backward == forward[-2::-1]
+    
+    pagination = client.get('/api/properties?cursor=&per_page=5').get_json()['data']['pagination']
+    assert 'total' not in pagination
+    pagination = client.get('/api/properties?cursor=&per_page=5&include_total=true').get_json()['data']['pagination']
+    assert pagination['total'] == 12
+    
+    assert client.get('/api/properties?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/properties/search?q=house&cursor=').status_code == 400
+
+
+def test_response_cache_and_etag_follow_writes():
+    app, client, headers = make_app()
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    add_properties(app, [{'price': 1_000_000 + i} for i in range(3)])
+    url = '/api/properties?sort=price_asc&per_page=20'
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    
+    first = client.get(url)
+    queried = len(statements)
+    # Same parameters in another order: served from the cache without SQL
+    second = client.get('/api/properties?per_page=20&sort=price_asc')
+    assert len(statements) == queried
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert client.get(url, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+    
+    # Editing a listing takes it out of public view until it is verified again
+    response = client.put('/api/properties/1', json={'title': 'Renovated home'}, headers=headers)
+    assert response.status_code == 200
+    edited = client.get(url)
+    assert len(statements) > queried
+    assert listing_ids(client, url) == [2, 3]
+    assert edited.headers['ETag'] != first.headers['ETag']
+    assert client.get(url, headers={'If-None-Match': first.headers['ETag']}).status_code == 200
+    
+    assert client.put('/api/properties/1/verify', json={'is_verified': True}, headers=headers).status_code == 200
+    verified = client.get(url)
+    assert verified.get_json()['data']['properties'][0]['title'] == 'Renovated home'
+    assert verified.headers['ETag'] not in (first.headers['ETag'], edited.headers['ETag'])
+    
+    assert client.delete('/api/properties/2', headers=headers).status_code == 200
+    assert listing_ids(client, url) == [1, 3]
+    assert listing_ids(client, '/api/properties/search?sort=price_asc') == [1, 3]
+
+
+def test_count_strategies():
+    app, client, headers = make_app()
+    add_properties(app, [{'price': 1_000_000 + i} for i in range(5)])
+    
+    counts = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SELECT count(*)'):
+            counts.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    
+    def pagination(count):
+        response = client.get(f'/api/properties?per_page=2&page=2&count={count}')
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()['data']['pagination']
+    
+    exact = pagination('exact')
+    assert (exact['total'], exact['pages'], exact['has_next'], exact['total_estimated']) == (5, 3, True, False)
+    assert len(counts) == 1
+    pagination('exact')
+    assert len(counts) == 2
+    
+    # Counted once, then reused until a write commits
+    cached = pagination('cached')
+    assert (cached['total'], cached['pages'], cached['total_estimated']) == (5, 3, False)
+    assert len(counts) == 3
+    assert pagination('cached')['total'] == 5
+    assert len(counts) == 3
+    
+    # Planner estimates need PostgreSQL; SQLite falls back to the cached count
+    estimated = pagination('estimated')
+    assert (estimated['total'], estimated['total_estimated']) == (5, True)
+    assert len(counts) == 3
+    
+    none = pagination('none')
+    assert (none['total'], none['pages'], none['has_prev'], none['has_next']) == (None, None, True, True)
+    assert len(counts) == 3
+    
+    client.post('/api/properties', json={
+        'title': 'New listing', 'property_type': 'house', 'location': 'Karen, Nairobi', 'price': 9_000_000
+    }, headers=headers)
+    assert pagination('cached')['total'] == 6
+    assert len(counts) == 4
+    
+    # The public listing opts into cached totals; other endpoints stay exact
+    assert app.config['PAGINATION_COUNT_STRATEGY'] == 'exact'
+    assert app.config['PROPERTY_LISTING_COUNT_STRATEGY'] == 'cached'
+    assert client.get('/api/properties?per_page=2').get_json()['data']['pagination']['total'] == 6
+    assert len(counts) == 4
+    client.get('/api/saved-searches', headers=headers)
+    client.get('/api/saved-searches', headers=headers)
+    assert len(counts) == 6
+    
+    assert client.get('/api/properties?count=approximate').status_code == 400
+    assert client.get('/api/properties?cursor=&count=approximate&include_total=true').status_code == 400
+
+
+def test_fulltext_search_ranks_by_relevance():
+    app, client, headers = make_app()
+    add_properties(app, [
+        {'title': 'Family home', 'description': 'Quiet street near a public swimming pool'},
+        {'title': 'Pool villa', 'description': 'Large garden and terrace'},
+        {'title': 'Garden apartment', 'description': 'Second floor flat'},
+        {'title': 'Pool house', 'description': 'Heated pool and pool bar'},
+        {'title': 'Cottage', 'description': 'Garden cottage', 'location': 'Pool Road, Nairobi'}
+    ])
+    
+    # The in-memory engine answers first; without it the search runs in SQL (FTS5)
+    for engine in (True, False):
+        if not engine:
+            app.extensions.pop('search_engine')
+        
+        # Title matches outrank location matches, which outrank description matches
+        assert listing_ids(client, '/api/properties/search?q=pool') == [4, 2, 5, 1], engine
+        # The last term is matched as a prefix while the user types
+        assert listing_ids(client, '/api/properties/search?q=poo') == [4, 2, 5, 1], engine
+        # Every term must match
+        assert sorted(listing_ids(client, '/api/properties/search?q=pool garden')) == [2, 5], engine
+        assert listing_ids(client, '/api/properties/search?q=penthouse') == [], engine
+        # An explicit sort replaces relevance order
+        assert listing_ids(client, '/api/properties/search?q=pool&sort=newest') == [5, 4, 2, 1], engine
+    
+    # Writes through the routes reach the index (FTS triggers in SQL)
+    client.put('/api/properties/3', json={'title': 'Pool apartment'}, headers=headers)
+    client.put('/api/properties/3/verify', json={'is_verified': True}, headers=headers)
+    client.delete('/api/properties/4', headers=headers)
+    assert listing_ids(client, '/api/properties/search?q=pool') == [3, 2, 5, 1]
+
+
+def test_facet_counts_ignore_their_own_filter():
+    app, client, headers = make_app()
+    add_properties(app, [
+        {'property_type': 'house', 'bedrooms': 2, 'price': 4_000_000},
+        {'property_type': 'house', 'bedrooms': 3, 'price': 12_000_000},
+        {'property_type': 'house', 'bedrooms': 4, 'price': 35_000_000, 'status': 'sold'},
+        {'property_type': 'house', 'bedrooms': 1, 'price': 6_000_000},
+        {'property_type': 'apartment', 'bedrooms': 2, 'price': 8_000_000},
+        {'property_type': 'apartment', 'bedrooms': 3, 'price': 25_000_000, 'status': 'pending'},
+        {'property_type': 'land', 'bedrooms': None, 'price': 3_000_000},
+        {'property_type': 'house', 'bedrooms': 3, 'price': 9_000_000, 'is_verified': False}
+    ])
+    
+    def facets(query):
+        response = client.get(f'/api/properties/facets?{query}')
+        assert response.status_code == 200, response.get_json()
+        data = response.get_json()['data']
+        return data['total'], {
+            name: {str(entry.get('value', entry.get('min'))): entry['count'] for entry in entries}
+            for name, entries in data['facets'].items()
+        }
+    
+    total, counts = facets('property_type=house&bedrooms=2')
+    assert total == 2
+    # Each disjunctive facet applies every filter but its own
+    assert counts['property_type'] == {'house': 2, 'apartment': 1}
+    assert counts['bedrooms'] == {'1': 1, '2': 1, '3': 1}
+    assert counts['status'] == {'available': 2, 'sold': 1}
+    # Price buckets apply every filter
+    assert counts['price'] == {'0': 1, '5000000': 0, '10000000': 1, '20000000': 0, '30000000': 0}
+    
+    total, counts = facets('status=sold')
+    assert total == 1
+    assert counts['status'] == {'available': 5, 'sold': 1, 'pending': 1}
+    assert counts['property_type'] == {'house': 1}
+    
+    assert client.get('/api/properties/facets?bedrooms=two').status_code == 400
+    
+    # Cached per filter set until a property is written
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    
+    facets('bedrooms=2&property_type=house&page=3')
+    assert statements == []
+    
+    client.put('/api/properties/8/verify', json={'is_verified': True}, headers=headers)
+    total, counts = facets('property_type=house&bedrooms=2')
+    assert total == 3
+    assert counts['bedrooms'] == {'1': 1, '2': 1, '3': 2}
+
+
+def test_bbox_and_radius_filters():
+    app, client, headers = make_app()
+    add_properties(app, [
+        {'location': 'Westlands, Nairobi', 'latitude': -1.2676, 'longitude': 36.8108},
+        {'location': 'CBD, Nairobi', 'latitude': -1.2864, 'longitude': 36.8172},
+        {'location': 'Karen, Nairobi', 'latitude': -1.3190, 'longitude': 36.7073, 'property_type': 'apartment'},
+        {'location': 'Kilimani, Nairobi', 'latitude': -1.2921, 'longitude': 36.7856},
+        {'location': 'Nyali, Mombasa', 'latitude': -4.0435, 'longitude': 39.6682},
+        {'location': 'Runda, Nairobi'}
+    ])
+    
+    nairobi = '36.6,-1.4,37.0,-1.2'
+    assert sorted(listing_ids(client, f'/api/properties/search?bbox={nairobi}')) == [1, 2, 3, 4]
+    assert listing_ids(client, f'/api/properties/search?bbox={nairobi}&property_type=apartment') == [3]
+    assert listing_ids(client, '/api/properties/search?bbox=36.80,-1.27,36.82,-1.26') == [1]
+    # A box across the equator and several geohash cells
+    assert sorted(listing_ids(client, '/api/properties/search?bbox=30,-5,40,5')) == [1, 2, 3, 4, 5]
+    
+    # Within 5 km of Westlands, nearest first; Karen is about 13 km away
+    westlands = 'lat=-1.2676&lng=36.8108'
+    assert listing_ids(client, f'/api/properties/search?{westlands}&radius_km=5') == [1, 2, 4]
+    assert listing_ids(client, f'/api/properties/search?{westlands}&radius_km=15') == [1, 2, 4, 3]
+    assert listing_ids(client, f'/api/properties/search?{westlands}&radius_km=15&sort=price_desc&cursor=') == [4, 3, 2, 1]
+    assert listing_ids(client, f'/api/properties/search?{westlands}&radius_km=5&bbox=36.81,-1.3,36.9,-1.2') == [1, 2]
+    
+    for query in ('bbox=36.6,-1.4,37.0', 'bbox=37.0,-1.4,36.6,-1.2', 'bbox=a,b,c,d',
+                  'lat=-1.2676&lng=36.8108', f'{westlands}&radius_km=0', 'lat=-91&lng=36.8&radius_km=5'):
+        assert client.get(f'/api/properties/search?{query}').status_code == 400, query
+    
+    # Moving a listing moves it between results
+    client.put('/api/properties/3', json={'latitude': -1.2700, 'longitude': 36.8100}, headers=headers)
+    client.put('/api/properties/3/verify', json={'is_verified': True}, headers=headers)
+    assert listing_ids(client, f'/api/properties/search?{westlands}&radius_km=5') == [1, 3, 2, 4]
+
+
+def test_clusters_follow_writes():
+    app, client, headers = make_app()
+    add_properties(app, [
+        {'location': 'Westlands, Nairobi', 'latitude': -1.2676, 'longitude': 36.8108, 'price': 10_000_000},
+        {'location': 'CBD, Nairobi', 'latitude': -1.2864, 'longitude': 36.8172, 'price': 8_000_000},
+        {'location': 'Karen, Nairobi', 'latitude': -1.3190, 'longitude': 36.7073, 'price': 30_000_000},
+        {'location': 'Nyali, Mombasa', 'latitude': -4.0435, 'longitude': 39.6682},
+        {'location': 'Lavington, Nairobi', 'latitude': -1.2800, 'longitude': 36.7700, 'is_verified': False}
+    ])
+    
+    def clusters(zoom, bbox='36.6,-1.4,37.0,-1.2'):
+        response = client.get(f'/api/properties/clusters?bbox={bbox}&zoom={zoom}')
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()['data']['clusters']
+    
+    cluster, = clusters(8)
+    assert (cluster['count'], cluster['min_price'], cluster['max_price'], cluster['property_id']) == (
+        3, '8000000.00', '30000000.00', None
+    )
+    assert round(cluster['latitude'], 4) == -1.291
+    # Higher zooms split the area into smaller cells; single listings carry their id
+    assert sorted(cluster['property_id'] for cluster in clusters(12)) == [1, 2, 3]
+    
+    # Cached per zoom precision and snapped viewport until a property is written
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    
+    clusters(8, bbox='36.61,-1.39,36.99,-1.21')
+    assert statements == []
+    
+    client.post('/api/properties', json={
+        'title': 'New listing', 'property_type': 'house', 'location': 'Kilimani, Nairobi', 'price': 12_000_000,
+        'latitude': -1.2921, 'longitude': 36.7856
+    }, headers=headers)
+    cluster, = clusters(8)
+    assert cluster['count'] == 4
+    assert len(clusters(12)) == 4
+    
+    client.put('/api/properties/5/verify', json={'is_verified': True}, headers=headers)
+    client.delete('/api/properties/3', headers=headers)
+    cluster, = clusters(8)
+    assert (cluster['count'], cluster['max_price']) == (4, '12000000.00')
+    
+    for query in ('zoom=8', 'bbox=36.6,-1.4,37.0,-1.2', 'bbox=36.6,-1.4,37.0,-1.2&zoom=23', 'bbox=x&zoom=8'):
+        assert client.get(f'/api/properties/clusters?{query}').status_code == 400, query
+
+
+def test_percolator_queues_each_match_once():
+    app, client, headers = make_app()
+    add_properties(app, [{'property_type': 'apartment', 'location': 'Kilimani, Nairobi', 'is_verified': False}])
+    
+    for criteria in ({'location': 'Karen', 'max_price': 20_000_000}, {'property_type': 'apartment'},
+                     {'bedrooms': 3}, {'q': 'garden', 'features': ['Swimming Pool']}):
+        response = client.post('/api/saved-searches', json={'email': 'buyer@example.com', 'criteria': criteria})
+        assert response.status_code == 201
+    with app.app_context():
+        db.session.add(SavedSearch(email='gone@example.com', criteria={}, is_active=False))
+        db.session.commit()
+    
+    def queued():
+        matches = client.get('/api/saved-searches/matches?pending=false', headers=headers).get_json()['data']['matches']
+        return sorted((match['property_id'], match['saved_search_id']) for match in matches)
+    
+    response = client.post('/api/properties', json={
+        'title': 'Garden home', 'property_type': 'house', 'location': 'Karen, Nairobi', 'price': 9_000_000,
+        'bedrooms': 3, 'features': ['swimming pool']
+    }, headers=headers)
+    assert response.status_code == 201
+    assert queued() == [(2, 1), (2, 3), (2, 4)]
+    
+    # Edits unpublish the listing; publishing it again matches the same searches
+    client.put('/api/properties/2', json={'description': 'Now with a pool house'}, headers=headers)
+    client.put('/api/properties/2/verify', json={'is_verified': True}, headers=headers)
+    assert queued() == [(2, 1), (2, 3), (2, 4)]
+    
+    # Notified matches are not queued again either
+    pending = client.get('/api/saved-searches/matches', headers=headers).get_json()['data']['matches']
+    response = client.put('/api/saved-searches/matches/notified', json={'ids': [match['id'] for match in pending]},
+                          headers=headers)
+    assert response.status_code == 200
+    client.put('/api/properties/2/verify', json={'is_verified': True}, headers=headers)
+    assert client.get('/api/saved-searches/matches', headers=headers).get_json()['data']['matches'] == []
+    
+    # Only the listing that changed is tested, once it is public
+    client.put('/api/properties/1/verify', json={'is_verified': False}, headers=headers)
+    assert queued() == [(2, 1), (2, 3), (2, 4)]
+    client.put('/api/properties/1/verify', json={'is_verified': True}, headers=headers)
+    assert queued() == [(1, 2), (2, 1), (2, 3), (2, 4)]
+    
+    client.post('/api/properties', json={
+        'title': 'Garden villa', 'property_type': 'house', 'location': 'Karen, Nairobi', 'price': 45_000_000,
+        'bedrooms': 2
+    }, headers=headers)
+    assert len(queued()) == 4
+
+
+if __name__ == '__main__':
+    tests = [(name, test) for name, test in sorted(globals().items()) if name.startswith('test_')]
+    failures = 0
+    
+    for name, test in tests:
+        try:
+            test()
+            print(f'✅ {name}')
+        except AssertionError as e:
+            failures += 1
+            print(f'❌ {name}: {e}')
+    
+    print(f'\n{len(tests) - failures}/{len(tests)} feature tests passed')
+    exit(1 if failures else 0)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Query count regression tests for list endpoints.
+
+Each endpoint must issue the same number of SQL statements no matter how
+many rows a page holds, so a lazy-loaded relationship (N+1) shows up as a
+failure. Runs against an in-memory database; no server needed.
+
+    python test_query_counts.py
+    python -m pytest test_query_counts.py
+"""
+
+from contextlib import contextmanager
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.cache import validator_cache
+from app.models import User, Property, ContactMessage, user_favorites
+
+SMALL_PAGE = 2
+LARGE_PAGE = 40
+
+
+def make_app():
+    """Create a testing app seeded with admins, properties, messages and favorites."""
+    app = create_app('testing')
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    app.config['PAGINATION_COUNT_STRATEGY'] = 'exact'
+    app.config['PROPERTY_LISTING_COUNT_STRATEGY'] = 'exact'
+    
+    with app.app_context():
+        admins = [
+            User(f'admin{i}', f'admin{i}@example.com', 'password', first_name='Admin', last_name=str(i))
+            for i in range(3)
+        ]
+        db.session.add_all(admins)
+        db.session.commit()
+        
+        properties = []
+        for i in range(LARGE_PAGE):
+            properties.append(Property(
+                title=f'Property {i}',
+                property_type='house',
+                location='Karen, Nairobi',
+                price=1_000_000 + i,
+                features=['Swimming Pool'],
+                images=[f'/uploads/images/{i}.jpg'],
+                is_verified=True,
+                admin_id=admins[i % len(admins)].id
+            ))
+        db.session.add_all(properties)
+        db.session.commit()
+        
+        for i, property in enumerate(properties):
+            db.session.add(ContactMessage(
+                name=f'Buyer {i}',
+                email=f'buyer{i}@example.com',
+                message='Is this still available?',
+                property_id=property.id,
+                user_id=admins[i % len(admins)].id
+            ))
+            db.session.execute(user_favorites.insert().values(
+                user_id=admins[0].id, property_id=property.id
+            ))
+        db.session.commit()
+        
+        app.config['TEST_TOKEN'] = create_access_token(identity=str(admins[0].id))
+        
+        # Load the seeded catalog as startup would, so no request pays for it
+        app.extensions['search_engine'].rebuild()
+    
+    return app
+
+
+@contextmanager
+def count_queries(app):
+    """Collect the SQL statements executed inside the block."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def queries_for(app, path, per_page):
+    """Return the number of statements a GET to path runs for a page size."""
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {app.config['TEST_TOKEN']}"}
+    separator = '&' if '?' in path else '?'
+    
+    # Measure every page size with cold listing validators
+    validator_cache.clear()
+    
+    with count_queries(app) as statements:
+        response = client.get(f'{path}{separator}per_page={per_page}', headers=headers)
+    
+    assert response.status_code == 200, f'{path}: {response.status_code} {response.get_data(as_text=True)}'
+    return len(statements)
+
+
+def assert_constant_queries(path):
+    """Assert path runs the same number of queries for small and large pages."""
+    app = make_app()
+    small = queries_for(app, path, SMALL_PAGE)
+    large = queries_for(app, path, LARGE_PAGE)
+    assert small == large, f'{path}: {small} queries for {SMALL_PAGE} rows, {large} for {LARGE_PAGE} rows'
+    return small
+
+
+def test_property_listing_query_count():
+    assert_constant_queries('/api/properties')
+
+
+def test_property_search_query_count():
+    assert_constant_queries('/api/properties/search?location=Karen')
+
+
+def test_property_search_sql_query_count():
+    # count= is not answered by the in-memory search engine, so this runs in SQL
+    assert_constant_queries('/api/properties/search?location=Karen&count=exact')
+
+
+def test_property_cursor_listing_query_count():
+    assert_constant_queries('/api/properties?cursor=')
+
+
+def test_contact_messages_query_count():
+    assert_constant_queries('/api/contact')
+
+
+def test_my_contact_messages_query_count():
+    assert_constant_queries('/api/contact/my-messages')
+
+
+def test_favorites_query_count():
+    assert_constant_queries('/api/favorites')
+
+
+if __name__ == '__main__':
+    tests = [(name, test) for name, test in sorted(globals().items()) if name.startswith('test_')]
+    failures = 0
+    
+    for name, test in tests:
+        try:
+            test()
+            print(f'✅ {name}')
+        except AssertionError as e:
+            failures += 1
+            print(f'❌ {name}: {e}')
+    
+    print(f'\n{len(tests) - failures}/{len(tests)} query count tests passed')
+    exit(1 if failures else 0)
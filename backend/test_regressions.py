@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Regression tests for API edge cases found in review.
+
+Each test builds its own in-memory app, seeds only the rows it needs and
+calls the API through the test client; no server needed.
+
+    python test_regressions.py
+    python -m pytest test_regressions.py
+"""
+
+import copy
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.cache import cluster_cache, count_cache, facet_cache, response_cache, stats_cache, validator_cache
+from app.models import Property, SavedSearch, User
+
+
+def make_app():
+    """Create a testing app with one admin; returns (app, client, auth headers)."""
+    app = create_app('testing')
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    
+    # Module-level caches outlive each app; start every test empty
+    for cache in (cluster_cache, count_cache, facet_cache, response_cache, stats_cache, validator_cache):
+        cache.clear()
+    
+    with app.app_context():
+        admin = User('admin', 'admin@example.com', 'password', first_name='Admin', last_name='User')
+        db.session.add(admin)
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+    
+    return app, app.test_client(), headers
+
+
+def add_properties(app, rows):
+    """Insert properties from dicts of column values (verified and available by default)."""
+    with app.app_context():
+        for row in rows:
+            values = {'property_type': 'house', 'location': 'Karen, Nairobi', 'price': 1_000_000,
+                      'is_verified': True, 'status': 'available'}
+            values.update(row)
+            values.setdefault('title', f"Property {values['price']}")
+            db.session.add(Property(**values))
+        db.session.commit()
+
+
+def test_stats_group_without_square_feet():
+    app, client, _ = make_app()
+    add_properties(app, [
+        {'property_type': 'apartment', 'price': 2_000_000 + i, 'square_feet': 800 + i} for i in range(3)
+    ] + [
+        # Sorts last among the types and has no sizes: an empty price per sq ft group
+        {'property_type': 'townhouse', 'price': 5_000_000 + i, 'square_feet': None} for i in range(2)
+    ])
+    
+    response = client.get('/api/properties/stats')
+    assert response.status_code == 200, response.get_json()
+    
+    groups = {group['value']: group for group in response.get_json()['data']['property_type']}
+    assert groups['townhouse']['price']['count'] == 2
+    assert groups['townhouse']['price_per_square_foot'] is None
+    assert groups['apartment']['price_per_square_foot']['count'] == 3
+
+
+def test_fuzzy_search_ignores_unverified_matches():
+    app, client, _ = make_app()
+    # Unverified rows get the lowest ids, so they would win ties under the match cap
+    add_properties(app, [
+        {'location': 'Nairobi West', 'price': 1_000_000 + i, 'is_verified': False} for i in range(600)
+    ] + [
+        {'location': 'Nairobi West', 'price': 2_000_000 + i} for i in range(100)
+    ])
+    
+    exact = client.get('/api/properties/search?location=Nairobi West').get_json()['data']['pagination']
+    fuzzy = client.get('/api/properties/search?location=Nairobi Westt&fuzzy=true').get_json()['data']['pagination']
+    assert exact['total'] == 100
+    assert fuzzy['total'] == 100, fuzzy
+    assert 'total_is_lower_bound' not in fuzzy
+
+
+def test_fuzzy_search_total_is_lower_bound_when_capped():
+    app, client, _ = make_app()
+    add_properties(app, [{'location': 'Nairobi West', 'price': 1_000_000 + i} for i in range(600)])
+    
+    pagination = client.get('/api/properties/search?location=Nairobi Westt&fuzzy=true').get_json()['data']['pagination']
+    assert pagination['total'] == 500, pagination
+    assert pagination['total_is_lower_bound'] is True
+
+
+def test_listing_validators_do_not_rescan_unchanged_catalog():
+    app, client, headers = make_app()
+    add_properties(app, [{'price': 1_000_000 + i} for i in range(5)])
+    
+    aggregates = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if 'max(properties.updated_at)' in statement:
+            aggregates.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    
+    first = client.get('/api/properties?cursor=&count=none')
+    second = client.get('/api/properties?cursor=&count=none')
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert len(aggregates) == 1, aggregates
+    
+    client.post('/api/properties', json={
+        'title': 'New listing', 'property_type': 'house', 'location': 'Karen, Nairobi', 'price': 9_000_000
+    }, headers=headers)
+    third = client.get('/api/properties?cursor=&count=none&show_all=true', headers=headers)
+    fourth = client.get('/api/properties?cursor=&count=none')
+    assert third.status_code == fourth.status_code == 200
+    assert len(aggregates) == 3, aggregates
+
+
+
+def test_property_etag_depends_on_format_and_fields():
+    app, client, _ = make_app()
+    add_properties(app, [{'price': 1_000_000}])
+    
+    full = client.get('/api/properties/1')
+    card = client.get('/api/properties/1?fields=card')
+    packed = client.get('/api/properties/1', headers={'Accept': 'application/msgpack'})
+    assert len({full.headers['ETag'], card.headers['ETag'], packed.headers['ETag']}) == 3
+    assert 'Accept' in full.headers['Vary']
+    
+    # A cached JSON copy must not validate the MessagePack or card representation
+    revalidated = client.get('/api/properties/1', headers={
+        'Accept': 'application/msgpack', 'If-None-Match': full.headers['ETag']
+    })
+    assert revalidated.status_code == 200
+    assert revalidated.mimetype == 'application/msgpack'
+    assert client.get('/api/properties/1?fields=card', headers={'If-None-Match': full.headers['ETag']}).status_code == 200
+    assert client.get('/api/properties/1', headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+
+
+
+def test_batch_post_rejects_malformed_bodies():
+    app, client, _ = make_app()
+    add_properties(app, [{'price': 1_000_000 + i} for i in range(3)])
+    
+    for body in ({'ids': '123'}, [1, 2], {'ids': [1, '2']}, {'ids': [1.5]}, {'ids': [True]}, 'ids'):
+        response = client.post('/api/properties/batch', json=body)
+        assert response.status_code == 400, (body, response.status_code)
+    
+    response = client.post('/api/properties/batch', json={'ids': [3, 1, 9]})
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert [property['id'] for property in data['properties']] == [3, 1]
+    assert data['missing_ids'] == [9]
+
+
+
+def test_similar_properties_without_public_catalog():
+    app, client, _ = make_app()
+    # Visible to the public but not available, so the similarity index is empty
+    add_properties(app, [{'status': 'sold'}])
+    
+    response = client.get('/api/properties/1/similar')
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['data']['properties'] == []
+
+
+
+def test_compressed_and_not_modified_responses_share_etag():
+    app, client, _ = make_app()
+    # Long enough to be compressed
+    add_properties(app, [{'description': 'Spacious family home with a garden. ' * 60}])
+    
+    for path in ('/api/properties/1', '/api/properties?cursor='):
+        full = client.get(path, headers={'Accept-Encoding': 'gzip'})
+        assert full.headers['Content-Encoding'] == 'gzip'
+        
+        revalidated = client.get(path, headers={'Accept-Encoding': 'gzip', 'If-None-Match': full.headers['ETag']})
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == full.headers['ETag']
+
+
+
+def test_saved_search_criteria_are_validated_and_normalized():
+    app, client, headers = make_app()
+    
+    for criteria in ({'features': ['Garden', 3]}, {'property_type': ['house']}, {'q': {'text': 'pool'}}, ['Karen']):
+        response = client.post('/api/saved-searches', json={'email': 'a@example.com', 'criteria': criteria})
+        assert response.status_code == 400, (criteria, response.status_code)
+    
+    response = client.post('/api/saved-searches', json={
+        'email': 'a@example.com', 'criteria': {'features': ['Garden'], 'bedrooms': 2, 'fuzzy': False}
+    })
+    assert response.status_code == 201
+    assert response.get_json()['data']['criteria'] == {'features': 'Garden', 'bedrooms': '2', 'fuzzy': 'false'}
+    
+    # Saved before criteria were validated; skipped instead of failing the write
+    with app.app_context():
+        db.session.add(SavedSearch(email='b@example.com', criteria={'property_type': ['house']}))
+        db.session.commit()
+    
+    response = client.post('/api/properties', json={
+        'title': 'Garden home', 'property_type': 'house', 'location': 'Karen, Nairobi', 'price': 9_000_000,
+        'bedrooms': 3, 'features': ['Garden']
+    }, headers=headers)
+    assert response.status_code == 201
+    
+    matches = client.get('/api/saved-searches/matches', headers=headers).get_json()['data']['matches']
+    assert [match['saved_search_id'] for match in matches] == [1]
+
+
+
+def test_export_rejects_bad_filters():
+    app, client, headers = make_app()
+    add_properties(app, [{'price': 1_000_000}])
+    
+    for query in ('bbox=bad', 'lat=1&lng=2', 'lat=1&lng=2&radius_km=x'):
+        response = client.get(f'/api/properties/export?{query}', headers=headers)
+        assert response.status_code == 400, (query, response.status_code)
+    
+    assert client.get('/api/properties/export', headers=headers).status_code == 200
+
+
+
+def test_search_engine_writes_replace_the_index_snapshot():
+    app, client, headers = make_app()
+    add_properties(app, [{'title': f'Garden villa {i}', 'price': 1_000_000 + i} for i in range(3)])
+    
+    assert client.get('/api/properties/search?q=garden').get_json()['data']['pagination']['total'] == 3
+    with app.app_context():
+        engine = app.extensions['search_engine']
+        before = engine._index
+        served = copy.deepcopy(vars(before))
+    
+    response = client.delete('/api/properties/2', headers=headers)
+    assert response.status_code in (200, 204)
+    response = client.post('/api/properties', json={
+        'title': 'Garden cottage', 'property_type': 'house', 'location': 'Runda', 'price': 4_000_000
+    }, headers=headers)
+    assert response.status_code == 201
+    
+    # The snapshot a running search holds is untouched; the new one matches a full rebuild
+    assert vars(before) == served
+    with app.app_context():
+        updated = engine._index
+        assert updated is not before
+        rebuilt = engine._build()
+        assert vars(updated) == vars(rebuilt)
+    assert client.get('/api/properties/search?q=garden').get_json()['data']['pagination']['total'] == 3
+
+
+
+def test_batch_post_accepts_longer_lists_than_get():
+    app, client, _ = make_app()
+    add_properties(app, [{'price': 1_000_000 + i} for i in range(3)])
+    
+    ids = list(range(1, 1001))
+    assert client.get('/api/properties/batch?ids=' + ','.join(map(str, ids[:101]))).status_code == 400
+    
+    response = client.post('/api/properties/batch', json={'ids': ids})
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert [property['id'] for property in data['properties']] == [1, 2, 3]
+    assert len(data['missing_ids']) == 997
+    
+    assert client.post('/api/properties/batch', json={'ids': list(range(1, 1002))}).status_code == 400
+
+
+if __name__ == '__main__':
+    tests = [(name, test) for name, test in sorted(globals().items()) if name.startswith('test_')]
+    failures = 0
+    
+    for name, test in tests:
+        try:
+            test()
+            print(f'✅ {name}')
+        except AssertionError as e:
+            failures += 1
+            print(f'❌ {name}: {e}')
+    
+    print(f'\n{len(tests) - failures}/{len(tests)} regression tests passed')
+    exit(1 if failures else 0)